@@ -11,12 +11,36 @@ class BaseConfig(object):
     SEND_FILE_MAX_AGE_DEFAULT = timedelta(days=7)
     ASSETS_DEBUG = True
     
-    COMPRESS_ALGORITHM = "gzip"
+    # Static files with an up to date sibling (flask server compress-static) are served
+    # precompressed and skipped, the others are compressed per request
+    COMPRESS_ALGORITHM = ["br", "gzip"]
+    COMPRESS_MIMETYPES = [
+        "text/html",
+        "text/css",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "image/svg+xml",
+        "text/plain",
+        "text/xml",
+        "application/xml",
+    ]
+    COMPRESS_BR_LEVEL = 4
     COMPRESS_LEVEL = 6
     COMPRESS_MIN_SIZE = 500
     MAX_CONTENT_LENGTH = 8 * 1024 * 1024
     DEFAULT_LIMITS = SERVER.DEFAULT_LIMITS
 
+    # auto | like | memory | pg_trgm | fts5
+    BAKERY_SEARCH_BACKEND = "auto"
+
+    NEWS_PAGE_SIZE = 10
+
+    # Write-behind of last_seen_at and news reads, see ActivityBuffer
+    ACTIVITY_FLUSH_INTERVAL = 10
+    ACTIVITY_MAX_ENTRIES = 200
+    LAST_SEEN_GRANULARITY = 60
+
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL")
     
@@ -102,10 +102,12 @@ class Directory:
     SRC: os.path = os.path.join(SERVER, "src")
     CONFIG: os.path = os.path.join(SERVER, "config")
     DB: os.path = os.path.join(SERVER, "db")
-    WEBASSETS: os.path = os.path.join(SRC, "static", ".webassets-cache")
+    SEARCH_CACHE: os.path = os.path.join(DB, "search_cache")
+    STATIC: os.path = os.path.join(SRC, "static")
+    WEBASSETS: os.path = os.path.join(STATIC, ".webassets-cache")
     LOGS: os.path = os.path.join(SERVER, "logs")
     # Images
-    IMAGES: os.path = os.path.join(SRC, "static", "images")
+    IMAGES: os.path = os.path.join(STATIC, "images")
     UPLOAD: os.path = os.path.join(SRC, "uploads")
     PROFILE_PICS: os.path = os.path.join(UPLOAD, "profile_pictures")
     PROFILE_ICONS: os.path = os.path.join(UPLOAD, "profile_icons")
@@ -121,8 +123,10 @@ class Directory:
     PASTRY = "images/bakery/pastry"
     SWEETS = "images/bakery/sweets"
     BAKERY_HEALTH: os.path = os.path.join(BAKERY, "health")
+    BAKERY_DERIVED: os.path = os.path.join(IMAGES, "bakery_derived")
     # Schedule
     SCHEDULE: os.path = os.path.join(ROUTES, "schedule")
+    SCHEDULE_WEEKS: os.path = os.path.join(SCHEDULE, "weeks")
     # Admin
     ADMIN: os.path = os.path.join(ROUTES, "admin")
 
@@ -133,6 +137,7 @@ class Path:
     LOGS: os.path = os.path.join(Directory.LOGS, "logs.ansi")
     CLIENTS_SECRETS: os.path = os.path.join(Directory.CONFIG, "client_secret.json")
     EMPLOYEES: os.path = os.path.join(Directory.SCHEDULE, "employees.json")
+    BAKERY_IMAGE_MANIFEST: os.path = os.path.join(Directory.BAKERY_DERIVED, "manifest.json")
 
 
 @dataclass
@@ -161,6 +166,21 @@ class Server:
         default_factory=lambda: ["jpg", "jpeg", "png", "gif", "bmp", "tiff", "webp"]
     )
     TOKEN_EXPIRATION: int = 3600
+    SEARCH_CACHE_TIMEOUT: int = 30 * 60
+    SEARCH_CACHE_THRESHOLD: int = 500
+    # Older versions are never requested again and expire
+    NEWS_FRAGMENT_TIMEOUT: int = 24 * 60 * 60
+    # Fingerprinted static files never change under the same URL
+    STATIC_IMMUTABLE_MAX_AGE: int = 365 * 24 * 3600
+    # Weekly hours before schedule stats count overtime
+    WEEKLY_CONTRACT_HOURS: float = 38.0
+    # Concurrent PMT sessions, attempts per date and backoff in seconds
+    SCRAPER_POOL_SIZE: int = 3
+    SCRAPER_RETRIES: int = 2
+    SCRAPER_RETRY_DELAY: float = 5
+    # "http" (requests + lxml) or "selenium" (headless Firefox)
+    SCRAPER_BACKEND: str = "http"
+    SCRAPER_HTTP_TIMEOUT: float = 30
 
     CET = pytz.timezone("Europe/Amsterdam")
 
@@ -215,6 +235,8 @@ class Template:
     # News
     ALL_NEWS: str = "/news/all.html"
     NEWS: str = "/news/news.html"
+    NEWS_ARTICLE: str = "/news/news_article.html"
+    NEWS_COMMENT: str = "/news/news_comment.html"
     # Bakery
     BAKERY: str = "/bakery/bakery.html"
     PROGRAMS: str = "/bakery/programs.html"
@@ -225,6 +247,7 @@ class Template:
     # Schedule
     PERSONAL: str = "/schedule/personal.html"
     CALENDAR: str = "/schedule/calendar.html"
+    COVERAGE: str = "/schedule/coverage.html"
     # User admin
     USER_ADMIN: str = "/admin/user_admin.html"
     VERIFY_EMAIL: str = "/admin/verify_email.html"
@@ -274,6 +297,7 @@ class Redirect:
     # Schedule
     PERSONAL: str = "schedule.personal"
     CALENDAR: str = "schedule.calendar"
+    COVERAGE: str = "schedule.coverage"
     VERIFY_EMPLOYEE: str = "schedule.verify_employee"
     # User admin
     USER_ADMIN: str = "admin.user_admin"
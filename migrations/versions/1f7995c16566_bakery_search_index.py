@@ -0,0 +1,70 @@
+"""Bakery search index
+
+Revision ID: 1f7995c16566
+Revises: 8c1f450777fa
+Create Date: 2026-10-18 10:12:40.218311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1f7995c16566'
+down_revision = '8c1f450777fa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        # Trigram GIN index serves LIKE '%term%' on search_field
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_bakery_items_search_field_trgm "
+            "ON bakery_items USING gin (search_field gin_trgm_ops)"
+        )
+
+    elif dialect == "sqlite":
+        # External content FTS5 table kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS bakery_items_fts USING fts5("
+            "search_field, content='bakery_items', content_rowid='id', "
+            "tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS bakery_items_fts_ai AFTER INSERT ON bakery_items BEGIN "
+            "INSERT INTO bakery_items_fts(rowid, search_field) "
+            "VALUES (new.id, new.search_field); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS bakery_items_fts_ad AFTER DELETE ON bakery_items BEGIN "
+            "INSERT INTO bakery_items_fts(bakery_items_fts, rowid, search_field) "
+            "VALUES ('delete', old.id, old.search_field); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS bakery_items_fts_au AFTER UPDATE ON bakery_items BEGIN "
+            "INSERT INTO bakery_items_fts(bakery_items_fts, rowid, search_field) "
+            "VALUES ('delete', old.id, old.search_field); "
+            "INSERT INTO bakery_items_fts(rowid, search_field) "
+            "VALUES (new.id, new.search_field); "
+            "END"
+        )
+        op.execute("INSERT INTO bakery_items_fts(bakery_items_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_bakery_items_search_field_trgm")
+
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS bakery_items_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS bakery_items_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS bakery_items_fts_ai")
+        op.execute("DROP TABLE IF EXISTS bakery_items_fts")
@@ -0,0 +1,26 @@
+"""News content version
+
+Revision ID: 3a774132d8ea
+Revises: 944237607685
+Create Date: 2026-10-18 15:02:44.170392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a774132d8ea'
+down_revision = '944237607685'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,187 @@
+"""Schedule shifts table
+
+Revision ID: 4b3cb70c311a
+Revises: a1b816f3fcf0
+Create Date: 2026-10-18 16:12:37.480951
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b3cb70c311a'
+down_revision = 'a1b816f3fcf0'
+branch_labels = None
+depends_on = None
+
+
+DAY_START = 6 * 60
+
+schedule_table = sa.table('schedule',
+    sa.column('id', sa.Integer()),
+    sa.column('date', sa.Date()),
+    sa.column('names', sa.Text()),
+    sa.column('start_hours', sa.Text()),
+    sa.column('end_hours', sa.Text()),
+    sa.column('starts', sa.Text()),
+    sa.column('ends', sa.Text()),
+    sa.column('break_times', sa.Text()),
+    sa.column('work_times', sa.Text()),
+)
+employees_table = sa.table('employees',
+    sa.column('id', sa.Integer()),
+    sa.column('name', sa.String()),
+    sa.column('is_activated', sa.Boolean()),
+)
+
+
+def _split(value) -> list[str]:
+    return value.split("|") if value else []
+
+
+def _to_quarter(time_str: str) -> int:
+    hours, minutes = map(int, time_str.split(":"))
+    return (hours * 60 + minutes - DAY_START) // 15
+
+
+def _to_time(quarter: int) -> str:
+    hours, minutes = divmod(DAY_START + quarter * 15, 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def _to_minutes(duration: str) -> int:
+    hours, minutes = map(int, duration.split(":"))
+    return hours * 60 + minutes
+
+
+def _to_duration(minutes: int) -> str:
+    return f"{minutes // 60}:{minutes % 60:02d}"
+
+
+def upgrade():
+    shifts_table = op.create_table('shifts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('position', sa.SmallInteger(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('start_q', sa.Integer(), nullable=False),
+    sa.Column('end_q', sa.Integer(), nullable=False),
+    sa.Column('break_min', sa.Integer(), nullable=True),
+    sa.Column('work_min', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['date'], ['schedule.date'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('shifts', schema=None) as batch_op:
+        batch_op.create_index('ix_shifts_date', ['date'], unique=False)
+        batch_op.create_index('ix_shifts_employee_id_date', ['employee_id', 'date'], unique=False)
+
+    connection = op.get_bind()
+    schedules = connection.execute(sa.select(schedule_table).order_by(schedule_table.c.date)).all()
+    employee_ids = dict(connection.execute(sa.select(employees_table.c.name, employees_table.c.id)).all())
+
+    # Names that never made it into employees
+    missing = sorted({name for row in schedules for name in _split(row.names)} - set(employee_ids))
+    for name in missing:
+        connection.execute(employees_table.insert().values(name=name, is_activated=False))
+    if missing:
+        employee_ids = dict(connection.execute(sa.select(employees_table.c.name, employees_table.c.id)).all())
+
+    rows = []
+    for schedule in schedules:
+        names = _split(schedule.names)
+        start_hours = _split(schedule.start_hours)
+        end_hours = _split(schedule.end_hours)
+        break_times = _split(schedule.break_times)
+        work_times = _split(schedule.work_times)
+        # Second shift blocks repeat the name without a break/work time of their own
+        extra_blocks = len(names) - len(break_times)
+        row = 0
+        for position, name in enumerate(names):
+            if extra_blocks > 0 and position > 0 and name == names[position - 1]:
+                extra_blocks -= 1
+                break_min = work_min = None
+            else:
+                break_min = _to_minutes(break_times[row]) if row < len(break_times) else None
+                work_min = _to_minutes(work_times[row]) if row < len(work_times) else None
+                row += 1
+            rows.append({
+                'date': schedule.date,
+                'position': position,
+                'employee_id': employee_ids[name],
+                'start_q': _to_quarter(start_hours[position]),
+                'end_q': _to_quarter(end_hours[position]),
+                'break_min': break_min,
+                'work_min': work_min,
+            })
+    if rows:
+        op.bulk_insert(shifts_table, rows)
+
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.drop_column('work_times')
+        batch_op.drop_column('break_times')
+        batch_op.drop_column('ends')
+        batch_op.drop_column('starts')
+        batch_op.drop_column('end_hours')
+        batch_op.drop_column('start_hours')
+        batch_op.drop_column('names')
+
+
+def downgrade():
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('names', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('start_hours', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('end_hours', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('starts', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('ends', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('break_times', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('work_times', sa.Text(), nullable=True))
+
+    shifts_table = sa.table('shifts',
+        sa.column('date', sa.Date()),
+        sa.column('position', sa.SmallInteger()),
+        sa.column('employee_id', sa.Integer()),
+        sa.column('start_q', sa.Integer()),
+        sa.column('end_q', sa.Integer()),
+        sa.column('break_min', sa.Integer()),
+        sa.column('work_min', sa.Integer()),
+    )
+    connection = op.get_bind()
+    names = dict(connection.execute(sa.select(employees_table.c.id, employees_table.c.name)).all())
+    days: dict = {}
+    for shift in connection.execute(
+            sa.select(shifts_table).order_by(shifts_table.c.date, shifts_table.c.position)):
+        days.setdefault(shift.date, []).append(shift)
+    for date, shifts in days.items():
+        connection.execute(
+            schedule_table.update()
+            .where(schedule_table.c.date == date)
+            .values(
+                names="|".join(names[shift.employee_id] for shift in shifts),
+                start_hours="|".join(_to_time(shift.start_q) for shift in shifts),
+                end_hours="|".join(_to_time(shift.end_q) for shift in shifts),
+                starts="|".join(str(shift.start_q) for shift in shifts),
+                ends="|".join(str(shift.end_q) for shift in shifts),
+                break_times="|".join(_to_duration(shift.break_min) for shift in shifts
+                                     if shift.break_min is not None),
+                work_times="|".join(_to_duration(shift.work_min) for shift in shifts
+                                    if shift.work_min is not None),
+            )
+        )
+
+    connection.execute(
+        schedule_table.update()
+        .where(schedule_table.c.names.is_(None))
+        .values(names="", start_hours="", end_hours="", starts="", ends="",
+                break_times="", work_times="")
+    )
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        for column in ('names', 'start_hours', 'end_hours', 'starts', 'ends', 'break_times', 'work_times'):
+            batch_op.alter_column(column, existing_type=sa.Text(), nullable=False)
+
+    with op.batch_alter_table('shifts', schema=None) as batch_op:
+        batch_op.drop_index('ix_shifts_employee_id_date')
+        batch_op.drop_index('ix_shifts_date')
+
+    op.drop_table('shifts')
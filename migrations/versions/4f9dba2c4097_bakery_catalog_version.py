@@ -0,0 +1,29 @@
+"""Bakery catalog version
+
+Revision ID: 4f9dba2c4097
+Revises: 1f7995c16566
+Create Date: 2026-10-18 11:03:27.540196
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f9dba2c4097'
+down_revision = '1f7995c16566'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_version = op.create_table('bakery_catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(catalog_version, [{'id': 1, 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('bakery_catalog_version')
@@ -0,0 +1,65 @@
+"""Schedule quarter coverage
+
+Revision ID: 7d2e9a4c15b8
+Revises: 4b3cb70c311a
+Create Date: 2026-10-18 17:05:12.204318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e9a4c15b8'
+down_revision = '4b3cb70c311a'
+branch_labels = None
+depends_on = None
+
+
+COVERAGE_JSON = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+QUARTERS_PER_DAY = 15 * 4
+
+
+def _coverage(blocks: list[tuple[int, int]]) -> list[int]:
+    # Difference array, same as schedule_stats.day_coverage
+    diff = [0] * (QUARTERS_PER_DAY + 1)
+    for start_q, end_q in blocks:
+        diff[min(max(start_q, 0), QUARTERS_PER_DAY)] += 1
+        diff[min(max(end_q, 0), QUARTERS_PER_DAY)] -= 1
+    coverage, on_duty = [], 0
+    for change in diff[:QUARTERS_PER_DAY]:
+        on_duty += change
+        coverage.append(on_duty)
+    return coverage
+
+
+def upgrade():
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('coverage', COVERAGE_JSON, nullable=True))
+
+    schedule = sa.table('schedule',
+        sa.column('date', sa.Date()),
+        sa.column('coverage', COVERAGE_JSON),
+    )
+    shifts = sa.table('shifts',
+        sa.column('date', sa.Date()),
+        sa.column('start_q', sa.Integer()),
+        sa.column('end_q', sa.Integer()),
+    )
+    connection = op.get_bind()
+    blocks: dict = {}
+    for date, start_q, end_q in connection.execute(
+            sa.select(shifts.c.date, shifts.c.start_q, shifts.c.end_q)).all():
+        blocks.setdefault(date, []).append((start_q, end_q))
+    for (date,) in connection.execute(sa.select(schedule.c.date)).all():
+        connection.execute(
+            schedule.update()
+            .where(schedule.c.date == date)
+            .values(coverage=_coverage(blocks.get(date, [])))
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('schedule', schema=None) as batch_op:
+        batch_op.drop_column('coverage')
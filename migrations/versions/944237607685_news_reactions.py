@@ -0,0 +1,111 @@
+"""News and comment reactions
+
+Revision ID: 944237607685
+Revises: cc90b2124dc3
+Create Date: 2026-10-18 14:37:12.904416
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '944237607685'
+down_revision = 'cc90b2124dc3'
+branch_labels = None
+depends_on = None
+
+
+LIKE = 1
+DISLIKE = -1
+
+# (parent table, reactions table, parent key column)
+REACTION_TABLES = [
+    ('news', 'news_reactions', 'news_id'),
+    ('comments', 'comment_reactions', 'comment_id'),
+]
+
+
+def _parse_ids(value) -> set[int]:
+    return {int(id_) for id_ in (value or "").split("|") if id_.isdigit()}
+
+
+def upgrade():
+    connection = op.get_bind()
+    user_ids = {row.id for row in connection.execute(sa.text("SELECT id FROM auth"))}
+
+    for parent, reactions, key in REACTION_TABLES:
+        reactions_table = op.create_table(reactions,
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column(key, sa.Integer(), nullable=False),
+        sa.Column('value', sa.SmallInteger(), nullable=False),
+        sa.Column('reacted_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint([key], [f'{parent}.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['auth.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', key)
+        )
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+            batch_op.add_column(sa.Column('dislike_count', sa.Integer(), server_default='0', nullable=False))
+
+        # Backfill from the '|' separated liked_by/disliked_by strings, a like wins
+        #  over a dislike by the same user
+        parent_table = sa.table(parent,
+            sa.column('id', sa.Integer()),
+            sa.column('liked_by', sa.Text()),
+            sa.column('disliked_by', sa.Text()),
+            sa.column('created_at', sa.DateTime()),
+            sa.column('like_count', sa.Integer()),
+            sa.column('dislike_count', sa.Integer()),
+        )
+        rows = []
+        for item in connection.execute(sa.select(
+                parent_table.c.id, parent_table.c.liked_by,
+                parent_table.c.disliked_by, parent_table.c.created_at)):
+            liked = _parse_ids(item.liked_by) & user_ids
+            disliked = _parse_ids(item.disliked_by) & user_ids - liked
+            for user_id in sorted(liked):
+                rows.append({'user_id': user_id, key: item.id, 'value': LIKE, 'reacted_at': item.created_at})
+            for user_id in sorted(disliked):
+                rows.append({'user_id': user_id, key: item.id, 'value': DISLIKE, 'reacted_at': item.created_at})
+            if liked or disliked:
+                connection.execute(
+                    parent_table.update()
+                    .where(parent_table.c.id == item.id)
+                    .values(like_count=len(liked), dislike_count=len(disliked))
+                )
+        if rows:
+            op.bulk_insert(reactions_table, rows)
+
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.drop_column('disliked_by')
+            batch_op.drop_column('liked_by')
+
+
+def downgrade():
+    connection = op.get_bind()
+
+    for parent, reactions, key in REACTION_TABLES:
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('liked_by', sa.Text(), nullable=True))
+            batch_op.add_column(sa.Column('disliked_by', sa.Text(), nullable=True))
+
+        values: dict[int, dict[str, str]] = {}
+        for reaction in connection.execute(sa.text(
+                f"SELECT user_id, {key} AS parent_id, value FROM {reactions} "
+                f"ORDER BY reacted_at, user_id")):
+            column = 'liked_by' if reaction.value == LIKE else 'disliked_by'
+            strings = values.setdefault(reaction.parent_id, {'liked_by': "", 'disliked_by': ""})
+            strings[column] += f"{reaction.user_id}|"
+        for parent_id, strings in values.items():
+            connection.execute(
+                sa.text(f"UPDATE {parent} SET liked_by = :liked_by, disliked_by = :disliked_by "
+                        f"WHERE id = :id"),
+                {**strings, 'id': parent_id},
+            )
+
+        with op.batch_alter_table(parent, schema=None) as batch_op:
+            batch_op.drop_column('dislike_count')
+            batch_op.drop_column('like_count')
+
+        op.drop_table(reactions)
@@ -0,0 +1,111 @@
+"""News grid and info as JSON
+
+Revision ID: a1b816f3fcf0
+Revises: 3a774132d8ea
+Create Date: 2026-10-18 15:40:21.553017
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1b816f3fcf0'
+down_revision = '3a774132d8ea'
+branch_labels = None
+depends_on = None
+
+
+NEWS_JSON = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+
+def _split(value) -> list[str]:
+    return value.split("|") if value else []
+
+
+def _to_grid(grid_cols, grid_rows) -> dict:
+    # Same nesting as the removed News._get_grid_rows
+    cols = _split(grid_cols)
+    cells = _split(grid_rows)
+    if not cols:
+        return {"cols": [], "rows": []}
+    return {"cols": cols, "rows": [cells[i:i + len(cols)] for i in range(0, len(cells), len(cols))]}
+
+
+def _to_info(info_cols, info_rows) -> list[list[str]]:
+    cols = _split(info_cols)
+    return [[cols[i] if i < len(cols) else "", content] for i, content in enumerate(_split(info_rows))]
+
+
+def upgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('grid', NEWS_JSON, nullable=True))
+        batch_op.add_column(sa.Column('info', NEWS_JSON, nullable=True))
+
+    news = sa.table('news',
+        sa.column('id', sa.Integer()),
+        sa.column('grid_cols', sa.Text()),
+        sa.column('grid_rows', sa.Text()),
+        sa.column('info_cols', sa.Text()),
+        sa.column('info_rows', sa.Text()),
+        sa.column('grid', NEWS_JSON),
+        sa.column('info', NEWS_JSON),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(
+        news.c.id, news.c.grid_cols, news.c.grid_rows, news.c.info_cols, news.c.info_rows)).all()
+    for row in rows:
+        connection.execute(
+            news.update()
+            .where(news.c.id == row.id)
+            .values(grid=_to_grid(row.grid_cols, row.grid_rows),
+                    info=_to_info(row.info_cols, row.info_rows))
+        )
+
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.alter_column('grid', existing_type=NEWS_JSON, nullable=False)
+        batch_op.alter_column('info', existing_type=NEWS_JSON, nullable=False)
+        batch_op.drop_column('info_rows')
+        batch_op.drop_column('info_cols')
+        batch_op.drop_column('grid_rows')
+        batch_op.drop_column('grid_cols')
+
+
+def downgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('grid_cols', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('grid_rows', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('info_cols', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('info_rows', sa.Text(), nullable=True))
+
+    news = sa.table('news',
+        sa.column('id', sa.Integer()),
+        sa.column('grid_cols', sa.Text()),
+        sa.column('grid_rows', sa.Text()),
+        sa.column('info_cols', sa.Text()),
+        sa.column('info_rows', sa.Text()),
+        sa.column('grid', NEWS_JSON),
+        sa.column('info', NEWS_JSON),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(news.c.id, news.c.grid, news.c.info)).all()
+    for row in rows:
+        grid = row.grid or {"cols": [], "rows": []}
+        info = row.info or []
+        connection.execute(
+            news.update()
+            .where(news.c.id == row.id)
+            .values(grid_cols="|".join(grid["cols"]),
+                    grid_rows="|".join(cell for cells in grid["rows"] for cell in cells),
+                    info_cols="|".join(title for title, _ in info),
+                    info_rows="|".join(content for _, content in info))
+        )
+
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.alter_column('grid_cols', existing_type=sa.Text(), nullable=False)
+        batch_op.alter_column('grid_rows', existing_type=sa.Text(), nullable=False)
+        batch_op.alter_column('info_cols', existing_type=sa.Text(), nullable=False)
+        batch_op.alter_column('info_rows', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column('info')
+        batch_op.drop_column('grid')
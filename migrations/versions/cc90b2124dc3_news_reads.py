@@ -0,0 +1,70 @@
+"""News reads
+
+Revision ID: cc90b2124dc3
+Revises: cf215d153662
+Create Date: 2026-10-18 13:58:41.207365
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cc90b2124dc3'
+down_revision = 'cf215d153662'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    news_reads = op.create_table('news_reads',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('news_id', sa.Integer(), nullable=False),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['news_id'], ['news.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['auth.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'news_id')
+    )
+    with op.batch_alter_table('news_reads', schema=None) as batch_op:
+        batch_op.create_index('ix_news_reads_news_id', ['news_id'], unique=False)
+
+    # Backfill from the '|' separated seen_by strings, the read time is unknown
+    #  so the news creation time is used
+    connection = op.get_bind()
+    news_table = sa.table('news',
+        sa.column('id', sa.Integer()),
+        sa.column('seen_by', sa.Text()),
+        sa.column('created_at', sa.DateTime()),
+    )
+    user_ids = {row.id for row in connection.execute(sa.text("SELECT id FROM auth"))}
+    rows = []
+    for news in connection.execute(sa.select(news_table)):
+        seen_by = {int(id_) for id_ in (news.seen_by or "").split("|") if id_.isdigit()}
+        for user_id in sorted(seen_by & user_ids):
+            rows.append({'user_id': user_id, 'news_id': news.id, 'read_at': news.created_at})
+    if rows:
+        op.bulk_insert(news_reads, rows)
+
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.drop_column('seen_by')
+
+
+def downgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('seen_by', sa.Text(), nullable=True))
+
+    connection = op.get_bind()
+    seen_by: dict[int, str] = {}
+    for read in connection.execute(
+            sa.text("SELECT user_id, news_id FROM news_reads ORDER BY read_at, user_id")):
+        seen_by[read.news_id] = seen_by.get(read.news_id, "") + f"{read.user_id}|"
+    for news_id, value in seen_by.items():
+        connection.execute(
+            sa.text("UPDATE news SET seen_by = :seen_by WHERE id = :id"),
+            {"seen_by": value, "id": news_id},
+        )
+
+    with op.batch_alter_table('news_reads', schema=None) as batch_op:
+        batch_op.drop_index('ix_news_reads_news_id')
+
+    op.drop_table('news_reads')
@@ -0,0 +1,26 @@
+"""News keyset index
+
+Revision ID: cf215d153662
+Revises: 4f9dba2c4097
+Create Date: 2026-10-18 13:21:05.618824
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cf215d153662'
+down_revision = '4f9dba2c4097'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.create_index('ix_news_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.drop_index('ix_news_created_at_id')
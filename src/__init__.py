@@ -33,6 +33,22 @@ from src.extensions_utils import (
     clear_webassets_cache,
     get_all_css_bundles,
 )
+from src.utils.activity_utils import activity_buffer_
+from src.utils.image_utils import (
+    bakery_picture,
+    check_bakery_images,
+)
+from src.utils.session_utils import (
+    session_has_writes,
+    teardown_stats_,
+    track_session_writes,
+)
+from src.utils.static_utils import (
+    fingerprint_static_urls,
+    get_stale_precompressed,
+    send_static_asset,
+    static_manifest_,
+)
 
 from src.cli.user_cli import user_cli
 from src.cli.news_cli import news_cli
@@ -113,6 +129,7 @@ def _configure_variables(app_: Flask) -> None:
 
 def _configure_extensions(app_: Flask) -> None:
     server_db_.init_app(app_)
+    track_session_writes(server_db_.session)
     
     # Configure cache
     cache_.init_app(app_, config={
@@ -146,6 +163,7 @@ def _configure_extensions(app_: Flask) -> None:
     app_.context_processor(lambda: {"assets": assets_})
     init_serializer(app_.ENV.FLASK_KEY.get_secret_value())
     compress_.init_app(app_)
+    activity_buffer_.init_app(app_)
 
 
 def _configure_blueprints(app_: Flask) -> None:
@@ -166,13 +184,17 @@ def _configure_blueprints(app_: Flask) -> None:
 def _configure_requests(app_: Flask) -> None:
     def handle_user_activity():
         if current_user.is_authenticated:
-            current_user.update_last_seen()
+            activity_buffer_.touch_user(current_user.id)
 
     def add_security_headers(resp):
         resp.headers.update(app_.config['SECURITY_HEADERS'])
         return resp
 
     def add_cache_control_headers(response):
+        # Fingerprinted static files, see send_static_asset
+        if response.cache_control.immutable:
+            return response
+
         content_type = response.headers.get("Content-Type", "")
         if "application/javascript" in content_type or "image/" in content_type:
             response.cache_control.public = True
@@ -195,12 +217,19 @@ def _configure_requests(app_: Flask) -> None:
     def manage_db_sessions(exception=None):
         if exception:
             server_db_.session.rollback()
+            teardown_stats_.count("rollbacks")
             logger.exception(f"Database error: {exception}")
         else:
             try:
-                server_db_.session.commit()
+                # Read-only requests end with the rollback of remove()
+                if session_has_writes(server_db_.session):
+                    server_db_.session.commit()
+                    teardown_stats_.count("commits")
+                else:
+                    teardown_stats_.count("avoided_commits")
             except SQLAlchemyError:
                 server_db_.session.rollback()
+                teardown_stats_.count("rollbacks")
                 logger.exception(f"Database commit failed")
             finally:
                 server_db_.session.remove()
@@ -299,9 +328,15 @@ def _configure_url_rules(app_: Flask) -> None:
                           filename))
     app_.add_url_rule("/static/images/bakery/health/<path:filename>",
                       endpoint="bakery_health_folder",
-                      view_func=lambda filename: send_from_directory(
+                      view_func=lambda filename: send_static_asset(
                           DIR.BAKERY_HEALTH,
-                          filename))
+                          filename,
+                          prefix="images/bakery/health/"))
+    # Content hashed static URLs
+    app_.view_functions["static"] = lambda filename: send_static_asset(
+        app_.static_folder,
+        filename)
+    app_.url_defaults(fingerprint_static_urls)
 
 
 def _configure_css(assets_: Environment) -> None:
@@ -317,6 +352,7 @@ def _configure_css(assets_: Environment) -> None:
 def _configure_jinja(app_: Flask) -> None:
     app_.jinja_env.add_extension('jinja2.ext.loopcontrols')
     app_.jinja_env.globals["REDIRECT"] = REDIRECT
+    app_.jinja_env.globals["bakery_picture"] = bakery_picture
 
 
 def get_app() -> Flask:
@@ -328,6 +364,12 @@ def get_app() -> Flask:
 
     app_ = _configure_server(app_)
     clear_webassets_cache()
+    check_bakery_images()
+    stale_static = get_stale_precompressed()
+    if stale_static:
+        logger.warning(f"[SYS] PRECOMPRESSED STATIC: {len(stale_static)} files without up to date "
+                       f"siblings, compressed per request. Run 'flask server compress-static'")
+    logger.info(f"[SYS] STATIC MANIFEST: {static_manifest_.build()} files fingerprinted")
 
     with app_.app_context():
         # Check if the database is empty using inspect
@@ -13,6 +13,8 @@ from src.models.bakery_model.bakery_mod_utils import (
     clear_bakery_db,
     get_bakery_dict,
 )
+from src.models.bakery_model.bakery_search import benchmark_search_backends
+from src.utils.image_utils import build_bakery_images
 
 
 @click.group()
@@ -67,4 +69,41 @@ def bakery_cli(app_: Flask) -> None:
         if v:
             click.echo(f"Successfully removed {item_count} BakeryItems from the Bakery Table.")
 
+    @bakery.command("bench-search")
+    @click.option("--items", default=50_000, help="Number of synthetic BakeryItems.")
+    @click.option("--repeat", default=5, help="Runs per query, the median is reported.")
+    @click.option("--url", default=None, help="Scratch database url [Default: in-memory SQLite].")
+    def bench_search(items: int, repeat: int, url: str | None) -> None:
+        """
+        Benchmarks the LIKE search against the indexed search backend.
+
+        Usage: flask bakery bench-search [--items 50000] [--repeat 5] [--url <scratch db>]
+        """
+        click.echo(f"Building synthetic catalog of {items} items...")
+        results = benchmark_search_backends(n_items=items, repeat=repeat, url=url)
+
+        click.echo(f"{'QUERY':<18}{'BACKEND':<10}{'ROWS':>8}{'MS':>10}")
+        for result in results:
+            click.echo(f"{result['query']:<18}{result['backend']:<10}"
+                       f"{result['rows']:>8}{result['ms']:>10.2f}")
+
+    @bakery.command("build-images")
+    @click.option("--v", is_flag=True, help="Enables verbose mode.")
+    @click.option("--force", is_flag=True, help="Rebuild unchanged images as well.")
+    @click.option("--workers", default=None, type=int, help="Worker processes [Default: CPU count].")
+    def build_images(v: bool, force: bool, workers: int | None) -> None:
+        """
+        Builds the resized WebP/AVIF derivatives of the bakery images and their manifest.
+
+        Usage: flask bakery build-images [--v] [--force] [--workers 4]
+        """
+        result = build_bakery_images(force=force, workers=workers)
+        logger.info(f"[CLI] BUILD IMAGES: {result['built']} built, "
+                    f"{result['skipped']} skipped, {result['removed']} removed.")
+        if v:
+            click.echo(f"Formats: {', '.join(result['formats'])}\n"
+                       f"Built: {result['built']}\n"
+                       f"Skipped (unchanged): {result['skipped']}\n"
+                       f"Removed: {result['removed']}")
+
     app_.cli.add_command(bakery)
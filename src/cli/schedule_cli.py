@@ -1,5 +1,11 @@
 import click
 import json
+import os
+
+from datetime import (
+    datetime,
+    timedelta,
+)
 
 from flask import Flask
 
@@ -15,13 +21,35 @@ from src.models.schedule_model.schedule_mod_utils import (
     _init_schedule,
     update_employee_json,
 )
+from src.models.schedule_model.schedule_stats import (
+    ShiftArrays,
+    benchmark_schedule_stats,
+    coverage_by_slot,
+    hours_by_period,
+    overtime_hours,
+)
 
 from src.utils.schedule import (
     _get_schedule_paths,
-    update_schedule,
+    get_new_schedule_dates,
+    update_schedules,
+)
+from src.utils.schedule_archive import schedule_archive_
+from src.utils.scraper_fixture import (
+    FixtureServer,
+    fixture_day,
+)
+from src.utils.scraper_utils import (
+    SCRAPER_BACKENDS,
+    LoginFailed,
+    get_scraper_backend,
+    scrape_dates,
 )
 from src.utils.misc_utils import crop_name
-from src.utils.encryption_utils import decrypt_data
+from src.utils.encryption_utils import (
+    decrypt_data,
+    encrypted_json_cache_,
+)
 
 from config.settings import PATH, SERVER
 
@@ -31,6 +59,12 @@ def schedule():
     """Schedule CLI commands."""
     pass
 
+
+def _echo_scrape_stats(stats: dict) -> None:
+    click.echo(f"{'DATES':<10}{'FAILED':>8}{'RETRIES':>9}{'ELAPSED':>10}{'MEAN':>8}{'MAX':>8}{'PER MIN':>9}")
+    click.echo(f"{stats['dates']:<10}{stats['failed']:>8}{stats['retries']:>9}{stats['elapsed']:>10.2f}"
+               f"{stats['mean']:>8.2f}{stats['max']:>8.2f}{stats['dates_per_minute']:>9.1f}")
+
 def schedule_cli(app_: Flask) -> None:
     @schedule.command("init-schedule")
     @click.option("--v", is_flag=True, help="Enables verbose mode.")
@@ -41,8 +75,9 @@ def schedule_cli(app_: Flask) -> None:
 
         Usage: flask schedule init-schedule [--v] [--c]
         """
-        paths = _get_schedule_paths()
-        nr_weeks = 0
+        nr_weeks = len(schedule_archive_.weeks())
+        # Year files are imported into the archive by _init_schedule
+        paths = _get_schedule_paths() if not nr_weeks else []
 
         for path in paths:
             try:
@@ -80,26 +115,104 @@ def schedule_cli(app_: Flask) -> None:
         if v:
             click.echo(f"Successfully added {nr_weeks} weeks to the Schedule Table.")
 
+    @schedule.command("import-archive")
+    @click.option("--v", is_flag=True, help="Enables verbose mode.")
+    @click.option("--c", is_flag=True, help="Confirm without prompting.")
+    def import_archive(v: bool, c: bool) -> None:
+        """
+        Splits the scheduleYYYY.json files into the per-week schedule archive.
+        Weeks scraped since the archive was introduced are kept.
+
+        Usage: flask schedule import-archive [--v] [--c]
+        """
+        paths = sorted(_get_schedule_paths())
+        if not paths:
+            click.echo("No schedule files to import.")
+            return
+
+        if not c and not click.confirm(
+                f"Are you sure you want to import {len(paths)} schedule files into the archive?"):
+            click.echo("Importing schedule files cancelled.")
+            return
+
+        nr_weeks = 0
+        for path in paths:
+            try:
+                imported = schedule_archive_.import_year_file(path)
+            except (json.JSONDecodeError, ValueError) as e:
+                click.echo(f"Error importing {path}: {e}")
+                return
+            nr_weeks += imported
+            if v:
+                click.echo(f"Imported {imported} weeks from {os.path.basename(path)}")
+
+        logger.info(f"[CLI] IMPORT ARCHIVE: {nr_weeks} weeks imported.")
+        if v:
+            click.echo(f"Successfully imported {nr_weeks} weeks into {schedule_archive_.folder}")
+
     @schedule.command("add-week")
-    @click.argument("week_number", type=int)
+    @click.argument("week_numbers", type=int, nargs=-1, required=True)
     @click.option("--v", is_flag=True, help="Enables verbose mode.")
     @click.option("--c", is_flag=True, help="Confirm without prompting.")
-    def add_week(week_number: int, c: bool, v: bool) -> None:
+    @click.option("--workers", default=SERVER.SCRAPER_POOL_SIZE, help="Concurrent PMT sessions.")
+    @click.option("--backend", default=SERVER.SCRAPER_BACKEND,
+                  type=click.Choice(list(SCRAPER_BACKENDS)), help="Scraper backend.")
+    def add_week(week_numbers: tuple[int, ...], c: bool, v: bool, workers: int, backend: str) -> None:
         """
-        Updates the Schedule with the given week number.
+        Updates the Schedule with the given week numbers, scraped concurrently.
 
-        Usage: flask schedule add-week <week_number>
+        Usage: flask schedule add-week <week_number> [<week_number> ...] [--workers 3] [--backend http]
         """
+        weeks = ", ".join(map(str, week_numbers))
         if not c and not click.confirm(
-                f"Are you sure you want to add the Schedule for week {week_number}?"):
+                f"Are you sure you want to add the Schedule for week {weeks}?"):
             click.echo("Adding Schedule cancelled.")
             return
         
-        
-        update_schedule(week_number)
-        logger.info(f"[CLI] ADD SCHEDULE: week {week_number} added.")
+        try:
+            stats = update_schedules(list(week_numbers), pool_size=workers, backend=backend).to_dict()
+        except LoginFailed as e:
+            click.echo(f"Error: {e}, check S_USERNAME and S_PASSWORD.")
+            return
+        logger.info(f"[CLI] ADD SCHEDULE: week {weeks} added.")
         if v:
-            click.echo(f"Successfully added Schedule for week {week_number}.")
+            click.echo(f"Successfully added Schedule for week {weeks}.")
+            _echo_scrape_stats(stats)
+
+    @schedule.command("scrape-fixture")
+    @click.option("--weeks", default=1, help="Number of weeks to scrape.")
+    @click.option("--workers", default=SERVER.SCRAPER_POOL_SIZE, help="Concurrent sessions.")
+    @click.option("--latency", default=0.5, help="Seconds per fixture schedule page.")
+    @click.option("--fail-rate", default=0.0, help="Share of dropped fixture requests.")
+    @click.option("--backend", "backends", multiple=True, type=click.Choice(list(SCRAPER_BACKENDS)),
+                  help="Backend to compare, repeatable [Default: all].")
+    def scrape_fixture(weeks: int, workers: int, latency: float, fail_rate: float,
+                       backends: tuple[str, ...]) -> None:
+        """
+        Scrapes a local PMT fixture server with every backend, compares
+         their throughput and checks their results, nothing is saved.
+
+        Usage: flask schedule scrape-fixture [--weeks 1] [--workers 3] [--latency 0.5] [--fail-rate 0.1] [--backend http]
+        """
+        dates = get_new_schedule_dates()
+        first = datetime.strptime(dates[0], "%d-%m-%Y")
+        dates = [(first + timedelta(days=i)).strftime("%d-%m-%Y") for i in range(7 * weeks)]
+
+        click.echo(f"{'BACKEND':<10}{'DATES':>6}{'FAILED':>8}{'RETRIES':>9}{'ELAPSED':>10}"
+                   f"{'MEAN':>8}{'MAX':>8}{'PER MIN':>9}{'WRONG':>7}")
+        for backend in backends or SCRAPER_BACKENDS:
+            with FixtureServer(latency=latency, fail_rate=fail_rate) as fixture:
+                try:
+                    day_schedules, stats = scrape_dates(dates, fixture.site(), pool_size=workers,
+                                                        retry_delay=0.1, backend=get_scraper_backend(backend))
+                except Exception as e:
+                    click.echo(f"{backend:<10}failed: {e!r}")
+                    continue
+            wrong = sum(day != fixture_day(date) for date, day in day_schedules.items())
+            result = stats.to_dict()
+            click.echo(f"{backend:<10}{result['dates']:>6}{result['failed']:>8}{result['retries']:>9}"
+                       f"{result['elapsed']:>10.2f}{result['mean']:>8.2f}{result['max']:>8.2f}"
+                       f"{result['dates_per_minute']:>9.1f}{wrong:>7}")
 
     @schedule.command("init-employees")
     @click.option("--v", is_flag=True, help="Enables verbose mode.")
@@ -110,11 +223,7 @@ def schedule_cli(app_: Flask) -> None:
 
         Usage: flask schedule init-employees [--v] [--c]
         """
-        with open(PATH.EMPLOYEES, "rb") as json_file:
-            encrypted_data = json_file.read()
-
-        decrypted_data = decrypt_data(encrypted_data.decode())
-        employees_data = json.loads(decrypted_data)
+        employees_data = encrypted_json_cache_.read(PATH.EMPLOYEES)
         for employee, _ in employees_data.items():
             logger.debug(employee)
         
@@ -218,6 +327,73 @@ def schedule_cli(app_: Flask) -> None:
         
         click.echo(f"Successfully deactivated Employee {user.employee_name}.")
 
+    @schedule.command("stats")
+    @click.option("--v", is_flag=True, help="Enables verbose mode.")
+    @click.option("--start", default=None, help="First date, dd-mm-yyyy [Default: 4 weeks ago].")
+    @click.option("--end", default=None, help="Last date, dd-mm-yyyy [Default: today].")
+    @click.option("--contract-hours", default=SERVER.WEEKLY_CONTRACT_HOURS,
+                  help="Weekly hours before overtime counts.")
+    @click.option("--benchmark", is_flag=True, help="Benchmark the loop against NumPy instead.")
+    @click.option("--employees", default=40, help="Benchmark: number of synthetic employees.")
+    @click.option("--days", default=365, help="Benchmark: number of synthetic days.")
+    @click.option("--repeat", default=5, help="Benchmark: runs per function, the median is reported.")
+    def stats(v: bool, start: str | None, end: str | None, contract_hours: float,
+              benchmark: bool, employees: int, days: int, repeat: int) -> None:
+        """
+        Shows hours, overtime and coverage per employee for a date range.
+
+        Usage: flask schedule stats [--v] [--start dd-mm-yyyy] [--end dd-mm-yyyy] [--contract-hours 38]
+               flask schedule stats --benchmark [--employees 40] [--days 365] [--repeat 5]
+        """
+        if benchmark:
+            click.echo(f"Building {days} days of synthetic shifts for {employees} employees...")
+            results = benchmark_schedule_stats(n_employees=employees, n_days=days, repeat=repeat)
+            click.echo(f"{'FUNCTION':<24}{'SHIFTS':>8}{'MS':>10}")
+            for result in results:
+                click.echo(f"{result['name']:<24}{result['shifts']:>8}{result['ms']:>10.2f}")
+            return
+
+        try:
+            end_date = datetime.strptime(end, "%d-%m-%Y").date() if end else datetime.now().date()
+            start_date = (datetime.strptime(start, "%d-%m-%Y").date() if start
+                          else end_date - timedelta(weeks=4))
+        except ValueError:
+            click.echo("Invalid date, expected dd-mm-yyyy.")
+            return
+
+        shifts = ShiftArrays.load(start=start_date, end=end_date)
+        if not len(shifts):
+            click.echo(f"No shifts between {start_date} and {end_date}.")
+            return
+
+        employee_ids, weeks, weekly = hours_by_period(shifts, "week")
+        _, months, monthly = hours_by_period(shifts, "month")
+        overtime = overtime_hours(weekly, contract_hours)
+        names = dict(
+            Employees.query
+            .with_entities(Employees.id, Employees.name)
+            .filter(Employees.id.in_(employee_ids.tolist()))
+            .all()
+        )
+
+        click.echo(f"{start_date} - {end_date}: {len(shifts)} shifts, {len(weeks)} weeks")
+        month_headers = "".join(f"{str(month)[:7]:>10}" for month in months)
+        click.echo(f"{'EMPLOYEE':<18}{'TOTAL':>8}{'PER WEEK':>10}{'OVERTIME':>10}{month_headers}")
+        for i, employee_id in enumerate(employee_ids.tolist()):
+            month_hours = "".join(f"{hours:>10.2f}" for hours in monthly[i])
+            click.echo(f"{names.get(employee_id, employee_id):<18}{weekly[i].sum():>8.2f}"
+                       f"{weekly[i].mean():>10.2f}{overtime[i]:>10.2f}{month_hours}")
+
+        dates, coverage = coverage_by_slot(shifts)
+        busiest_date, busiest_slot = divmod(int(coverage.argmax()), coverage.shape[1])
+        click.echo(f"Peak coverage: {coverage.max()} on {dates[busiest_date]} "
+                   f"at {6 + busiest_slot // 4}:{busiest_slot % 4 * 15:02d}")
+        if v:
+            click.echo("Mean coverage per hour: " + " ".join(
+                f"{6 + hour}h:{coverage[:, hour * 4:hour * 4 + 4].mean():.1f}"
+                for hour in range(coverage.shape[1] // 4)
+            ))
+
 
     app_.cli.add_command(schedule)
 
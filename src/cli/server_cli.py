@@ -14,6 +14,7 @@ from src.cli.bakery_cli import bakery
 from src.cli.news_cli import news
 from src.cli.schedule_cli import schedule
 from src.cli.user_cli import user
+from src.utils.static_utils import build_precompressed
 
 
 def server_cli(app_: Flask) -> None:
@@ -80,5 +81,20 @@ def server_cli(app_: Flask) -> None:
         ctx.invoke(schedule.commands['init-schedule'], v=v, c=c)
         ctx.invoke(schedule.commands['init-employees'], v=v, c=c)
 
+    @server.command("compress-static")
+    @click.option("--v", is_flag=True, help="Enables verbose mode.")
+    @click.option("--force", is_flag=True, help="Recompress files with up to date siblings as well.")
+    def compress_static(v: bool, force: bool) -> None:
+        """
+        Writes brotli, zstd and gzip siblings of the compressible static files.
+
+        Usage: flask server compress-static [--v] [--force]
+        """
+        result = build_precompressed(force=force)
+        logger.info(f"[CLI] COMPRESS STATIC: {result['built']} built, {result['skipped']} skipped.")
+        if v:
+            click.echo(f"Built: {result['built']}\n"
+                       f"Skipped (up to date): {result['skipped']}")
+
 
     app_.cli.add_command(server)
@@ -2,6 +2,7 @@ import json
 import os
 import sys
 from argon2 import PasswordHasher
+from cachelib import FileSystemCache
 from flask import current_app
 from flask_caching import Cache
 from flask_compress import Compress
@@ -21,6 +22,7 @@ from src.utils.logger import Logger
 from src.utils.encryption_utils import decrypt_data
 
 from config.settings import (
+    DIR,
     SERVER,
     PATH,
 )
@@ -60,6 +62,12 @@ flow_ = Flow.from_client_config(
 serializer_ = None
 compress_ = Compress()
 cache_ = Cache()
+# Shared by all workers, holds search result ids instead of the session
+search_cache_ = FileSystemCache(
+    DIR.SEARCH_CACHE,
+    threshold=SERVER.SEARCH_CACHE_THRESHOLD,
+    default_timeout=SERVER.SEARCH_CACHE_TIMEOUT,
+)
 
 
 def init_serializer(secret_key: str) -> None:
@@ -145,6 +145,17 @@ schedule_css = [
         ],
         "filters": "rcssmin",
         "output": "dist/calendar_css.min.css"
+    },
+    {
+        "name": "coverage_css",
+        "files": [
+            "css/schedule/schedule_base.css",
+            "css/schedule/personal.css",
+            "css/schedule/day.css",
+            "css/schedule/coverage.css",
+        ],
+        "filters": "rcssmin",
+        "output": "dist/coverage_css.min.css"
     }
 ]
 
@@ -0,0 +1,159 @@
+import threading
+
+from typing import Optional
+
+from flask import (
+    g,
+    has_app_context,
+)
+from sqlalchemy import (
+    Connection,
+    select,
+)
+
+from src.extensions import (
+    server_db_,
+    logger,
+)
+
+from src.models.bakery_model.bakery_mod import (
+    BakeryCatalogVersion,
+    BakeryItem,
+)
+from src.models.mod_utils import dialect_insert
+from src.models.bakery_model.bakery_ranking import bakery_ranker_
+from src.models.bakery_model.bakery_search import bakery_search_index_
+
+
+class BakeryRecord:
+    """
+    Read-only copy of a BakeryItem row, detached from the session.
+    Lists are stored as tuples, to_dict() matches BakeryItem.to_dict().
+    """
+    __slots__ = (
+        "id", "name", "category", "program", "nasa", "price",
+        "vegan", "lactose_free", "nutri_score",
+        "type", "tags", "package_type", "per_package", "rack_type", "per_rack",
+        "defrost_time", "cooldown_time", "make_halves",
+        "contains", "may_contain", "search_field", "image",
+    )
+
+    def __init__(self, item: BakeryItem):
+        data = item.to_dict()
+        for key in self.__slots__:
+            value = data[key]
+            object.__setattr__(self, key, tuple(value) if isinstance(value, list) else value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("BakeryRecord is read-only")
+
+    def to_dict(self, *keys) -> dict:
+        data = {}
+        for key in keys or self.__slots__:
+            if key in self.__slots__:
+                value = getattr(self, key)
+                data[key] = list(value) if isinstance(value, tuple) else value
+        return data
+
+
+class BakeryCatalog:
+    """
+    Immutable snapshot of the bakery catalog for a single worker.
+
+    - VERSION (int): Catalog version the snapshot was loaded at
+    - ITEMS (tuple[BakeryRecord]): All items, ordered by id
+    - BY_ID (dict[int, BakeryRecord]): Id index
+    - BY_PROGRAM (dict[int, tuple[BakeryRecord]]): Program index, ordered by id
+    - PROGRAM_SUMMARIES (tuple[dict]): Program and image per program, for /bakery
+    """
+    __slots__ = ("version", "items", "by_id", "by_program", "program_summaries")
+
+    def __init__(self, version: int, items: list[BakeryItem]):
+        self.version = version
+        self.items = tuple(BakeryRecord(item) for item in sorted(items, key=lambda item: item.id))
+        self.by_id = {record.id: record for record in self.items}
+
+        by_program: dict[int, list[BakeryRecord]] = {}
+        for record in self.items:
+            by_program.setdefault(record.program, []).append(record)
+        self.by_program = {program: tuple(records) for program, records in by_program.items()}
+
+        # First item per program represents it, Worstenbroodje has no fitting image
+        summaries = []
+        for program, records in sorted(self.by_program.items()):
+            for record in records:
+                if record.name != "Worstenbroodje":
+                    summaries.append(record.to_dict("program", "image"))
+                    break
+        self.program_summaries = tuple(summaries)
+
+    @classmethod
+    def load(cls, version: int) -> "BakeryCatalog":
+        items = server_db_.session.execute(select(BakeryItem)).scalars().all()
+        return cls(version, items)
+
+    def get(self, id_: int) -> Optional[BakeryRecord]:
+        return self.by_id.get(id_)
+
+    def program(self, program: int) -> tuple[BakeryRecord, ...]:
+        return self.by_program.get(program, ())
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+_catalog: Optional[BakeryCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog_version() -> int:
+    """
+    Returns the catalog version from the database.
+    Read once per request (or app context).
+    """
+    if has_app_context() and "bakery_catalog_version" in g:
+        return g.bakery_catalog_version
+
+    stmt = select(BakeryCatalogVersion.version).where(BakeryCatalogVersion.id == 1)
+    version = server_db_.session.execute(stmt).scalar_one_or_none() or 0
+    if has_app_context():
+        g.bakery_catalog_version = version
+    return version
+
+
+def bump_catalog_version(connection: Optional[Connection] = None) -> None:
+    """
+    Increments the catalog version in the current transaction.
+    Pass the connection when called from a session event.
+    A single upsert, so two first writers can't both insert the row.
+    """
+    executor = connection if connection is not None else server_db_.session
+    stmt = dialect_insert(BakeryCatalogVersion).values(id=1, version=1)
+    executor.execute(stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={"version": BakeryCatalogVersion.version + 1},
+    ))
+    if has_app_context():
+        g.pop("bakery_catalog_version", None)
+
+
+def get_bakery_catalog() -> BakeryCatalog:
+    """
+    Returns this worker's catalog snapshot, reloading it when the
+     catalog version in the database has moved on.
+    The in-memory search index and ranker are dropped along with it.
+    """
+    global _catalog
+    version = get_catalog_version()
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is None or _catalog.version != version:
+            if _catalog is not None:
+                bakery_search_index_.invalidate()
+                bakery_ranker_.invalidate()
+            _catalog = BakeryCatalog.load(version)
+            logger.debug(f"[SYS] BAKERY CATALOG LOADED: version {version}, {len(_catalog)} items")
+        return _catalog
@@ -199,3 +199,18 @@ class BakeryItem(server_db_.Model):
                 f"{'NASA':<18}{self.nasa}\n"
                 f"{'PRICE':<18}{self.price}")
 
+
+
+class BakeryCatalogVersion(server_db_.Model):
+    """
+    Stores the version of the bakery catalog (single row).
+    Bumped once per flush that writes BakeryItems, so workers know when to
+     reload their BakeryCatalog snapshot.
+
+    - ID (int): Identifier [Primary Key] [Always 1]
+    - VERSION (int): Catalog version [Default: 1]
+    """
+    __tablename__ = "bakery_catalog_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
@@ -1,42 +1,57 @@
-from typing import Optional
+from typing import (
+    Iterable,
+    Optional,
+)
+
+from flask_wtf import FlaskForm
 from sqlalchemy import (
+    Select,
     event,
     func,
+    or_,
     select,
 )
+from sqlalchemy.orm import (
+    Session,
+    object_session,
+)
 
 from src.extensions import (
     server_db_,
     logger,
 )
 
+from src.models.bakery_model.bakery_catalog import (
+    bump_catalog_version,
+    get_bakery_catalog,
+)
 from src.models.bakery_model.bakery_mod import BakeryItem
+from src.models.bakery_model.bakery_ranking import bakery_ranker_
+from src.models.bakery_model.bakery_search import (
+    bakery_search_index_,
+    get_search_backend,
+)
 
 from src.routes.bakery.bakery_items import get_bakery_dict
 
 
 def get_bakery_programs_info() -> list[dict]:
-    subquery = (
-        select(BakeryItem.program, func.min(BakeryItem.id).label("min_id"))
-        .where(BakeryItem.name != "Worstenbroodje")
-        .group_by(BakeryItem.program)
-        .subquery()
-    )
-    stmt = select(BakeryItem).join(subquery, BakeryItem.id == subquery.c.min_id)
-    result = server_db_.session.execute(stmt).scalars().all()
-    return [item.to_dict("program", "image") for item in result]
+    return list(get_bakery_catalog().program_summaries)
 
 
 def get_program_items_dicts(program: int) -> list[dict]:
-    stmt = select(BakeryItem).filter_by(program=program)
-    result = server_db_.session.execute(stmt).scalars().all()
-    return [item.to_dict() for item in result]
+    return [record.to_dict() for record in get_bakery_catalog().program(program)]
 
 
 def get_program_ids_and_names(program: int) -> list[dict]:
-    stmt = select(BakeryItem).filter_by(program=program)
-    items = server_db_.session.execute(stmt).scalars().all()
-    return [{"id": item.id, "name": item.name} for item in items]
+    return [{"id": record.id, "name": record.name}
+            for record in get_bakery_catalog().program(program)]
+
+
+def get_bakery_item_summaries() -> dict[int, dict]:
+    """Returns {id: {id, name, image}} for every BakeryItem in the catalog snapshot."""
+    return {record.id: record.to_dict("id", "name", "image")
+            for record in get_bakery_catalog().items}
 
 
 def get_item_by_id(id_: int) -> Optional[BakeryItem]:
@@ -45,9 +60,8 @@ def get_item_by_id(id_: int) -> Optional[BakeryItem]:
 
 
 def get_item_by_id_dict(id_: int) -> Optional[dict]:
-    stmt = select(BakeryItem).filter_by(id=id_)
-    result = server_db_.session.execute(stmt).scalar_one_or_none()
-    return result.to_dict() if result else None
+    record = get_bakery_catalog().get(id_)
+    return record.to_dict() if record else None
 
 
 def delete_item_by_id(id_: int) -> None:
@@ -56,21 +70,140 @@ def delete_item_by_id(id_: int) -> None:
     server_db_.session.commit()
     logger.warning(f"[DEL] BAKERY ITEM WITH ID {id_} named {item.name} DELETED")
 
-def search_bakery_items(query: str) -> list[BakeryItem]:
-    search_term = f"%{query}%"
-    stmt = select(BakeryItem).filter(BakeryItem.search_field.like(search_term))
+def search_bakery_items(query: str, match_all: bool = False) -> list[BakeryItem]:
+    """
+    Returns the BakeryItems matching any (or all) of the space separated terms
+     in a single query.
+    """
+    terms = query.split() if query else []
+    stmt = select(BakeryItem).where(get_search_backend().match(terms, match_all=match_all))
     return server_db_.session.execute(stmt).scalars().all()
 
 
+def build_bakery_search_query(form: FlaskForm,
+                              ranked_ids: Optional[Iterable[int]] = None) -> Select:
+    """
+    Compiles a BakerySearchForm into a single SELECT.
+    Terms are matched by the active search backend, every other filter
+    becomes a WHERE clause. Only the columns the results grid needs are selected.
+    Expects min_price and max_price to be normalized by the caller.
+
+    - RANKED_IDS (Iterable[int]): Ids matched by the ranker (typo tolerant),
+       accepted next to the backend matches [Optional]
+    """
+    stmt = (
+        select(BakeryItem.id, BakeryItem.name, BakeryItem.image)
+        .distinct()
+        .order_by(BakeryItem.name, BakeryItem.id)
+    )
+
+    terms = form.search_field.data.split() if form.search_field.data else []
+    if terms:
+        terms_clause = get_search_backend().match(terms)
+        if ranked_ids:
+            terms_clause = or_(terms_clause, BakeryItem.id.in_(list(ranked_ids)))
+        stmt = stmt.where(terms_clause)
+
+    for term in (form.contains.data or "").split():
+        stmt = stmt.where(BakeryItem.contains.ilike(f"%{term}%"))
+
+    for term in (form.may_contain.data or "").split():
+        stmt = stmt.where(BakeryItem.may_contain.ilike(f"%{term}%"))
+
+    if form.lactose_free.data:
+        stmt = stmt.where(BakeryItem.lactose_free.is_(True))
+
+    if form.vegan.data:
+        stmt = stmt.where(BakeryItem.vegan.is_(True))
+
+    if form.nutri_score.data:
+        stmt = stmt.where(func.lower(BakeryItem.nutri_score) == form.nutri_score.data.lower())
+
+    nasa = (form.nasa.data or "").strip()
+    if nasa.isdigit():
+        stmt = stmt.where(BakeryItem.nasa == int(nasa))
+
+    min_price = max(0, float(form.min_price.data))
+    max_price = min(float(form.max_price.data), 999)
+    stmt = stmt.where(BakeryItem.price > min_price, BakeryItem.price < max_price)
+
+    return stmt
+
+
 def clear_bakery_db() -> None:
     server_db_.session.query(BakeryItem).delete()
+    # Bulk deletes skip the mapper events
+    bump_catalog_version()
     server_db_.session.commit()
+    bakery_search_index_.invalidate()
+    bakery_ranker_.invalidate()
+
+
+# Session.info key of the BakeryItem changes flushed in the current transaction
+_INDEX_CHANGES_KEY: str = "bakery_index_changes"
+
+
+def _queue_index_change(target: BakeryItem, removed: bool = False) -> None:
+    """
+    Remembers a flushed change for the in-memory search index and ranker, keyed by id.
+    Applied when the transaction commits, dropped when it rolls back.
+    """
+    changes = object_session(target).info.setdefault(_INDEX_CHANGES_KEY, {})
+    if removed:
+        changes[target.id] = None
+    else:
+        # Copied now, the item is expired by the time the commit is applied
+        changes[target.id] = {
+            "search_field": target.search_field,
+            "fields": {field: getattr(target, field) for field in bakery_ranker_.FIELD_WEIGHTS},
+        }
+
+
+def _apply_index_changes(session: Session) -> None:
+    changes = session.info.pop(_INDEX_CHANGES_KEY, None) or {}
+    for id_, change in changes.items():
+        if change is None:
+            bakery_search_index_.remove(id_)
+            bakery_ranker_.remove(id_)
+        else:
+            bakery_search_index_.add(id_, change["search_field"])
+            bakery_ranker_.add(id_, change["fields"])
+
+
+def _drop_index_changes(session: Session, *_) -> None:
+    session.info.pop(_INDEX_CHANGES_KEY, None)
+
+
+def _bump_version_on_flush(session: Session, _) -> None:
+    """Bumps the catalog version once per flush that wrote BakeryItems, not once per row."""
+    if any(isinstance(obj, BakeryItem) for obj in session.new) \
+            or any(isinstance(obj, BakeryItem) for obj in session.deleted) \
+            or any(isinstance(obj, BakeryItem) and session.is_modified(obj) for obj in session.dirty):
+        bump_catalog_version(session.connection())
+
+
+event.listen(server_db_.session, "after_commit", _apply_index_changes)
+event.listen(server_db_.session, "after_rollback", _drop_index_changes)
+event.listen(server_db_.session, "after_flush", _bump_version_on_flush)
 
 
 @event.listens_for(BakeryItem, 'before_insert')
 @event.listens_for(BakeryItem, 'before_update')
 def update_search_field(mapper, connection, target):
     target.update_search_field()
+    if target.id is not None:
+        _queue_index_change(target)
+
+
+@event.listens_for(BakeryItem, 'after_insert')
+def index_new_search_field(mapper, connection, target):
+    # Autoincrement ids are only known after the INSERT
+    _queue_index_change(target)
+
+
+@event.listens_for(BakeryItem, 'after_delete')
+def remove_search_field(mapper, connection, target):
+    _queue_index_change(target, removed=True)
 
 
 def _init_bakery() -> bool:
@@ -0,0 +1,293 @@
+import math
+import re
+import threading
+
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from unidecode import unidecode
+
+from src.extensions import server_db_
+
+from src.models.bakery_model.bakery_mod import BakeryItem
+
+
+class BakeryRanker:
+    """
+    BM25F relevance ranking over the BakeryItem search fields with typo tolerance.
+
+    Fields (and weights) mirror BakeryItem.update_search_field.
+    Misspelled terms are resolved through a SymSpell style deletion index:
+     every vocabulary token is stored under all its variants with up to
+     MAX_EDITS characters deleted, so candidates are found with a few
+     dict lookups instead of an edit distance scan over every row.
+    """
+    FIELD_WEIGHTS: dict[str, float] = {
+        "name": 3.0,
+        "type": 1.5,
+        "tags": 1.5,
+        "category": 1.0,
+        "contains": 0.5,
+    }
+    K1: float = 1.2
+    B: float = 0.75
+    MAX_EDITS: int = 2
+    MIN_FUZZY_LENGTH: int = 4
+    # Score factor per kind of term match
+    EXACT: float = 1.0
+    PARTIAL: float = 0.7
+    FUZZY: float = 0.5
+
+    _SPLIT = re.compile(r"[|\s\-/&,()]+")
+
+    def __init__(self):
+        self._field_tfs: dict[int, dict[str, dict[str, int]]] = {}
+        self._field_lens: dict[int, dict[str, int]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._deletes: dict[str, set[str]] = {}
+        self._avg_lens: dict[str, float] = {}
+        self._built: bool = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def tokenize(cls, value: Optional[str]) -> list[str]:
+        """Lowercases, folds accents and splits on separators."""
+        if not value:
+            return []
+        return [token for token in cls._SPLIT.split(unidecode(value).lower()) if token]
+
+    def build(self) -> None:
+        """(Re)builds the ranker from the database in a single query."""
+        stmt = select(
+            BakeryItem.id,
+            BakeryItem.name,
+            BakeryItem.category,
+            BakeryItem.type,
+            BakeryItem.tags,
+            BakeryItem.contains,
+        )
+        rows = server_db_.session.execute(stmt).mappings().all()
+        with self._lock:
+            self._clear()
+            for row in rows:
+                self._add(row["id"], row)
+            self._rebuild_stats()
+            self._built = True
+
+    def invalidate(self) -> None:
+        """Drops the ranker; it is rebuilt on the next search."""
+        with self._lock:
+            self._clear()
+            self._built = False
+
+    def add(self, id_: int, fields: dict[str, Optional[str]]) -> None:
+        """Adds or replaces a single item, fields holds the FIELD_WEIGHTS columns."""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(id_)
+            self._add(id_, fields)
+            self._rebuild_stats()
+
+    def remove(self, id_: int) -> None:
+        """Removes a single item."""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(id_)
+            self._rebuild_stats()
+
+    def rank(self, terms: Iterable[str], match_all: bool = False) -> dict[int, float]:
+        """
+        Returns {item id: score} for every item matching the terms.
+        A term matches tokens exactly, as a substring, or within MAX_EDITS typos.
+
+        - MATCH_ALL (bool): Items must match every term [Default: False]
+        """
+        query_tokens = [token for term in terms for token in self.tokenize(term)]
+        with self._lock:
+            if not self._built:
+                self.build()
+
+            scores: dict[int, float] = {}
+            matched: Optional[set[int]] = None
+            for term in query_tokens:
+                term_scores: dict[int, float] = {}
+                for token, factor in self._expand(term).items():
+                    for id_, score in self._score_token(token).items():
+                        # Best expansion per item, so typo variants don't stack
+                        term_scores[id_] = max(term_scores.get(id_, 0.0), factor * score)
+
+                for id_, score in term_scores.items():
+                    scores[id_] = scores.get(id_, 0.0) + score
+                ids = set(term_scores)
+                matched = ids if matched is None else (matched & ids if match_all else matched | ids)
+
+        if match_all and matched is not None:
+            return {id_: score for id_, score in scores.items() if id_ in matched}
+        return scores
+
+    def suggest(self, term: str) -> Optional[str]:
+        """Returns the closest vocabulary token for a term that only matches through typos."""
+        tokens = self.tokenize(term)
+        if len(tokens) != 1:
+            return None
+        with self._lock:
+            if not self._built:
+                self.build()
+            if any(tokens[0] in token for token in self._postings):
+                return None
+            candidates = self._fuzzy(tokens[0])
+            if not candidates:
+                return None
+            return max(candidates, key=lambda token: (-candidates[token], len(self._postings[token])))
+
+    def _expand(self, term: str) -> dict[str, float]:
+        expansions: dict[str, float] = {}
+        if term in self._postings:
+            expansions[term] = self.EXACT
+        for token in self._postings:
+            if token != term and term in token:
+                expansions[token] = self.PARTIAL
+        if not expansions:
+            for token in self._fuzzy(term):
+                expansions[token] = self.FUZZY
+        return expansions
+
+    def _fuzzy(self, term: str) -> dict[str, int]:
+        """Returns {token: edit distance} for vocabulary tokens within MAX_EDITS."""
+        if len(term) < self.MIN_FUZZY_LENGTH:
+            return {}
+        max_edits = 1 if len(term) < 8 else self.MAX_EDITS
+        candidates: set[str] = set()
+        for variant in self._deletions(term, max_edits):
+            candidates |= self._deletes.get(variant, set())
+
+        result = {}
+        for token in candidates:
+            distance = self._edit_distance(term, token, max_edits)
+            if distance <= max_edits:
+                result[token] = distance
+        return result
+
+    def _score_token(self, token: str) -> dict[int, float]:
+        postings = self._postings.get(token)
+        if not postings:
+            return {}
+        n_docs = len(self._field_tfs)
+        idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+
+        scores = {}
+        for id_ in postings:
+            weighted_tf = 0.0
+            for field, weight in self.FIELD_WEIGHTS.items():
+                tf = self._field_tfs[id_][field].get(token, 0)
+                if not tf:
+                    continue
+                avg_len = self._avg_lens[field] or 1.0
+                norm = 1 - self.B + self.B * self._field_lens[id_][field] / avg_len
+                weighted_tf += weight * tf / norm
+            scores[id_] = idf * weighted_tf / (self.K1 + weighted_tf)
+        return scores
+
+    def _add(self, id_: int, fields) -> None:
+        self._field_tfs[id_] = {}
+        self._field_lens[id_] = {}
+        for field in self.FIELD_WEIGHTS:
+            tokens = self.tokenize(fields[field])
+            tfs: dict[str, int] = {}
+            for token in tokens:
+                tfs[token] = tfs.get(token, 0) + 1
+            self._field_tfs[id_][field] = tfs
+            self._field_lens[id_][field] = len(tokens)
+            for token in tfs:
+                if token not in self._postings:
+                    self._postings[token] = set()
+                    self._add_deletes(token)
+                self._postings[token].add(id_)
+
+    def _remove(self, id_: int) -> None:
+        field_tfs = self._field_tfs.pop(id_, None)
+        self._field_lens.pop(id_, None)
+        if field_tfs is None:
+            return
+        for tfs in field_tfs.values():
+            for token in tfs:
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.discard(id_)
+                if not postings:
+                    del self._postings[token]
+                    self._remove_deletes(token)
+
+    def _add_deletes(self, token: str) -> None:
+        for variant in self._deletions(token, self.MAX_EDITS):
+            self._deletes.setdefault(variant, set()).add(token)
+
+    def _remove_deletes(self, token: str) -> None:
+        for variant in self._deletions(token, self.MAX_EDITS):
+            tokens = self._deletes.get(variant)
+            if tokens is None:
+                continue
+            tokens.discard(token)
+            if not tokens:
+                del self._deletes[variant]
+
+    def _rebuild_stats(self) -> None:
+        n_docs = len(self._field_lens) or 1
+        self._avg_lens = {
+            field: sum(lens[field] for lens in self._field_lens.values()) / n_docs
+            for field in self.FIELD_WEIGHTS
+        }
+
+    def _clear(self) -> None:
+        self._field_tfs.clear()
+        self._field_lens.clear()
+        self._postings.clear()
+        self._deletes.clear()
+        self._avg_lens = {}
+
+    @staticmethod
+    def _deletions(word: str, max_edits: int) -> set[str]:
+        """Returns the word and every variant with up to max_edits characters deleted."""
+        result = {word}
+        frontier = {word}
+        for _ in range(max_edits):
+            next_frontier = set()
+            for variant in frontier:
+                if len(variant) <= 1:
+                    continue
+                for i in range(len(variant)):
+                    next_frontier.add(variant[:i] + variant[i + 1:])
+            result |= next_frontier
+            frontier = next_frontier
+        return result
+
+    @staticmethod
+    def _edit_distance(a: str, b: str, max_edits: int) -> int:
+        """Optimal string alignment distance, stops early above max_edits."""
+        if abs(len(a) - len(b)) > max_edits:
+            return max_edits + 1
+        previous = None
+        current = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            before, previous = previous, current
+            current = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cost = 0 if a[i - 1] == b[j - 1] else 1
+                current[j] = min(previous[j] + 1,
+                                 current[j - 1] + 1,
+                                 previous[j - 1] + cost)
+                if (before is not None and i > 1 and j > 1
+                        and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                    current[j] = min(current[j], before[j - 2] + 1)
+            if min(current) > max_edits:
+                return max_edits + 1
+        return current[-1]
+
+    def __len__(self) -> int:
+        return len(self._field_tfs)
+
+
+bakery_ranker_ = BakeryRanker()
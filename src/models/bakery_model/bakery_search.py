@@ -0,0 +1,361 @@
+import re
+import threading
+
+from typing import Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import (
+    ColumnElement,
+    and_,
+    column,
+    false,
+    inspect,
+    or_,
+    select,
+    table,
+    true,
+)
+
+from src.extensions import (
+    server_db_,
+    logger,
+)
+
+from src.models.bakery_model.bakery_mod import BakeryItem
+
+
+class BakerySearchIndex:
+    """
+    In-memory inverted index over BakeryItem.search_field.
+
+    Maps every token of the search field to the set of item ids containing it.
+    Built lazily on first use (one query) and kept up to date by the
+    BakeryItem mapper events in bakery_mod_utils, once their transaction commits.
+
+    - POSTINGS (dict[str, set[int]]): Token -> item ids
+    - TOKENS (dict[int, set[str]]): Item id -> tokens (for incremental updates)
+    """
+    _SPLIT = re.compile(r"[|\s]+")
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = {}
+        self._tokens: dict[int, set[str]] = {}
+        self._term_cache: dict[str, frozenset[int]] = {}
+        self._built: bool = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def tokenize(cls, value: Optional[str]) -> set[str]:
+        """Splits a search field or query on '|' and whitespace."""
+        if not value:
+            return set()
+        return {token for token in cls._SPLIT.split(value.lower()) if token}
+
+    def build(self) -> None:
+        """(Re)builds the index from the database in a single query."""
+        stmt = select(BakeryItem.id, BakeryItem.search_field)
+        rows = server_db_.session.execute(stmt).all()
+        with self._lock:
+            self._postings.clear()
+            self._tokens.clear()
+            self._term_cache.clear()
+            for id_, search_field in rows:
+                self._add(id_, search_field)
+            self._built = True
+
+    def invalidate(self) -> None:
+        """Drops the index; it is rebuilt on the next search."""
+        with self._lock:
+            self._postings.clear()
+            self._tokens.clear()
+            self._term_cache.clear()
+            self._built = False
+
+    def add(self, id_: int, search_field: Optional[str]) -> None:
+        """Adds or replaces the postings of a single item."""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(id_)
+            self._add(id_, search_field)
+            self._term_cache.clear()
+
+    def remove(self, id_: int) -> None:
+        """Removes a single item from the index."""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(id_)
+            self._term_cache.clear()
+
+    def search(self, terms: Iterable[str], match_all: bool = False) -> set[int]:
+        """
+        Returns the ids of items matching the terms.
+        A term matches every token it is a substring of, mirroring LIKE '%term%'.
+
+        - MATCH_ALL (bool): AND the terms instead of OR [Default: False]
+        """
+        terms = [term.lower() for term in terms if term]
+        with self._lock:
+            if not self._built:
+                self.build()
+            result: Optional[set[int]] = None
+            for term in terms:
+                ids = self._match_term(term)
+                if result is None:
+                    result = set(ids)
+                elif match_all:
+                    result &= ids
+                else:
+                    result |= ids
+                if match_all and not result:
+                    break
+        return result or set()
+
+    def _match_term(self, term: str) -> frozenset[int]:
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        ids = set(self._postings.get(term, ()))
+        for token, postings in self._postings.items():
+            if term in token:
+                ids |= postings
+        result = frozenset(ids)
+        self._term_cache[term] = result
+        return result
+
+    def _add(self, id_: int, search_field: Optional[str]) -> None:
+        tokens = self.tokenize(search_field)
+        self._tokens[id_] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(id_)
+
+    def _remove(self, id_: int) -> None:
+        for token in self._tokens.pop(id_, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(id_)
+            if not postings:
+                del self._postings[token]
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+
+bakery_search_index_ = BakerySearchIndex()
+
+
+# Mirrors migration 1f7995c16566, used to set up scratch databases (benchmarks)
+SEARCH_INDEX_DDL: dict[str, list[str]] = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_bakery_items_search_field_trgm "
+        "ON bakery_items USING gin (search_field gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS bakery_items_fts USING fts5("
+        "search_field, content='bakery_items', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS bakery_items_fts_ai AFTER INSERT ON bakery_items BEGIN "
+        "INSERT INTO bakery_items_fts(rowid, search_field) VALUES (new.id, new.search_field); END",
+        "CREATE TRIGGER IF NOT EXISTS bakery_items_fts_ad AFTER DELETE ON bakery_items BEGIN "
+        "INSERT INTO bakery_items_fts(bakery_items_fts, rowid, search_field) "
+        "VALUES ('delete', old.id, old.search_field); END",
+        "CREATE TRIGGER IF NOT EXISTS bakery_items_fts_au AFTER UPDATE ON bakery_items BEGIN "
+        "INSERT INTO bakery_items_fts(bakery_items_fts, rowid, search_field) "
+        "VALUES ('delete', old.id, old.search_field); "
+        "INSERT INTO bakery_items_fts(rowid, search_field) VALUES (new.id, new.search_field); END",
+        "INSERT INTO bakery_items_fts(bakery_items_fts) VALUES ('rebuild')",
+    ],
+}
+
+_bakery_items_fts = table(
+    "bakery_items_fts",
+    column("rowid"),
+    column("search_field"),
+)
+
+
+class SearchBackend:
+    """
+    Turns search terms into a WHERE clause on BakeryItem.
+    Base implementation is the plain LIKE '%term%' scan.
+    """
+    name: str = "like"
+
+    def match(self, terms: Iterable[str], match_all: bool = False) -> ColumnElement[bool]:
+        clauses = [self._term_clause(term.lower()) for term in terms if term]
+        if not clauses:
+            return true()
+        return and_(*clauses) if match_all else or_(*clauses)
+
+    def _term_clause(self, term: str) -> ColumnElement[bool]:
+        return BakeryItem.search_field.like(f"%{term}%")
+
+
+class MemoryIndexBackend(SearchBackend):
+    """Resolves the terms through the per-process BakerySearchIndex."""
+    name: str = "memory"
+
+    def match(self, terms: Iterable[str], match_all: bool = False) -> ColumnElement[bool]:
+        terms = [term for term in terms if term]
+        if not terms:
+            return true()
+        ids = bakery_search_index_.search(terms, match_all=match_all)
+        return BakeryItem.id.in_(ids) if ids else false()
+
+
+class PostgresTrigramBackend(SearchBackend):
+    """
+    Plain search_field LIKE '%term%', served by the pg_trgm GIN index on the
+     bare column (ix_bakery_items_search_field_trgm).
+    search_field is stored lowercased and match() lowercases the terms, so no
+     lower() is applied to the column, it would hide the index expression.
+    Terms shorter than 3 characters fall back to a scan.
+    """
+    name: str = "pg_trgm"
+
+
+class SqliteFtsBackend(SearchBackend):
+    """
+    Substring match on the trigram tokenized bakery_items_fts table.
+    Terms shorter than 3 characters fall back to a scan.
+    """
+    name: str = "fts5"
+
+    def _term_clause(self, term: str) -> ColumnElement[bool]:
+        if len(term) < 3:
+            return super()._term_clause(term)
+        rowids = (
+            select(_bakery_items_fts.c.rowid)
+            .where(_bakery_items_fts.c.search_field.like(f"%{term}%"))
+        )
+        return BakeryItem.id.in_(rowids)
+
+
+SEARCH_BACKENDS: dict[str, type[SearchBackend]] = {
+    backend.name: backend for backend in (
+        SearchBackend,
+        MemoryIndexBackend,
+        PostgresTrigramBackend,
+        SqliteFtsBackend,
+    )
+}
+
+_search_backend: Optional[SearchBackend] = None
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    Returns the search backend for this process.
+    Uses BAKERY_SEARCH_BACKEND from the config, or selects one from the
+     engine dialect when set to 'auto'.
+    """
+    global _search_backend
+    if _search_backend is None:
+        name = current_app.config.get("BAKERY_SEARCH_BACKEND", "auto")
+        if name == "auto":
+            name = _detect_search_backend()
+        _search_backend = SEARCH_BACKENDS[name]()
+        logger.info(f"[SYS] BAKERY SEARCH BACKEND: {name}")
+    return _search_backend
+
+
+def _detect_search_backend() -> str:
+    engine = server_db_.engine
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        indexes = inspect(engine).get_indexes("bakery_items")
+        if any(index["name"] == "ix_bakery_items_search_field_trgm" for index in indexes):
+            return PostgresTrigramBackend.name
+    elif dialect == "sqlite":
+        if inspect(engine).has_table("bakery_items_fts"):
+            return SqliteFtsBackend.name
+    return MemoryIndexBackend.name
+
+
+def benchmark_search_backends(n_items: int = 50_000, repeat: int = 5,
+                              url: str | None = None) -> list[dict]:
+    """
+    Compares the LIKE scan with the indexed backend of the scratch database's
+     dialect on a synthetically enlarged catalog.
+    Uses an in-memory SQLite database unless a scratch database url is given;
+     the bakery_items table is created there and dropped afterwards.
+    """
+    import statistics
+    import time
+
+    from sqlalchemy import create_engine
+
+    from src.routes.bakery.bakery_items import get_bakery_dict
+
+    engine = create_engine(url or "sqlite://")
+    dialect = engine.dialect.name
+    if dialect not in SEARCH_INDEX_DDL:
+        raise ValueError(f"No search index for dialect '{dialect}'")
+    indexed = PostgresTrigramBackend() if dialect == "postgresql" else SqliteFtsBackend()
+
+    bakery_table = BakeryItem.__table__
+    bakery_table.create(engine)
+    try:
+        base_items = list(get_bakery_dict().items())
+        rows = []
+        for i in range(n_items):
+            name, item = base_items[i % len(base_items)]
+            name = f"{name} {i // len(base_items)}"
+            search_field = "|".join([
+                name.lower(),
+                item["category"].lower(),
+                "|".join(item["type"]).lower(),
+                "|".join(item["tags"]).lower(),
+                "|".join(item["contains"]).lower(),
+            ])
+            rows.append({
+                "name": name[:75],
+                "category": item["category"],
+                "program": item["program"],
+                "nasa": item["nasa"],
+                "price": item["price"],
+                "vegan": item["vegan"],
+                "lactose_free": item["lactose_free"],
+                "nutri_score": item["nutri_score"],
+                "type": "|".join(item["type"]),
+                "tags": "|".join(item["tags"]),
+                "contains": "|".join(item["contains"]),
+                "may_contain": "|".join(item["may_contain"]),
+                "image": item["image"],
+                "search_field": search_field,
+            })
+
+        with engine.begin() as connection:
+            connection.execute(bakery_table.insert(), rows)
+            for statement in SEARCH_INDEX_DDL[dialect]:
+                connection.exec_driver_sql(statement)
+            if dialect == "postgresql":
+                connection.exec_driver_sql("ANALYZE bakery_items")
+
+        queries = ["croissant", "sesamzaad", "beurre 417", "volkoren", "spelt", "zzz"]
+        results = []
+        with engine.connect() as connection:
+            for query in queries:
+                for backend in (SearchBackend(), indexed):
+                    stmt = select(BakeryItem.id).where(backend.match(query.split()))
+                    timings = []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        count = len(connection.execute(stmt).all())
+                        timings.append((time.perf_counter() - start) * 1000)
+                    results.append({
+                        "query": query,
+                        "backend": backend.name,
+                        "rows": count,
+                        "ms": statistics.median(timings),
+                    })
+        return results
+    finally:
+        with engine.begin() as connection:
+            if dialect == "sqlite":
+                connection.exec_driver_sql("DROP TABLE IF EXISTS bakery_items_fts")
+        bakery_table.drop(engine)
+        engine.dispose()
@@ -2,6 +2,9 @@ from datetime import datetime
 from functools import wraps
 from typing import Callable
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
 from src.extensions import server_db_, login_manager_
 
 from config.settings import SERVER
@@ -14,6 +17,12 @@ def load_user(user_id):
     return server_db_.session.get(User, user_id)
 
 
+def dialect_insert(model):
+    """INSERT supporting on_conflict_do_nothing/do_update on both Postgres and SQLite."""
+    insert_ = pg_insert if server_db_.engine.dialect.name == "postgresql" else sqlite_insert
+    return insert_(model)
+
+
 def set_updated_at(func: Callable) -> Callable:
     """
     Decorator to set the updated_setting_at and last_setting_update attributes
@@ -1,13 +1,20 @@
 from datetime import datetime
 from sqlalchemy import (
+    JSON,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
     Text,
+    func,
+    select,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import (
     Mapped,
+    column_property,
     mapped_column,
     relationship,
 )
@@ -17,10 +24,16 @@ from src.extensions import (
 )
 
 from src.models.auth_model.auth_mod import User
-from src.models.email_model.email_mod_utils import add_notification_email_to_db
 from config.settings import SERVER
 
 
+# NewsReaction.value and CommentReaction.value
+LIKE: int = 1
+DISLIKE: int = -1
+
+NEWS_JSON = JSON().with_variant(JSONB(), "postgresql")
+
+
 class News(server_db_.Model):
     """
     Stores the News data.
@@ -31,24 +44,27 @@ class News(server_db_.Model):
     - CODE (int): News code [Required]
     - COLOR (str): News color [Required]
     - IMPORTANT (str): News important [Required]
-    - GRID_COLS (str): News grid columns [Required] ['|' separated]
-    - GRID_ROWS (str): News grid rows [Required] ['|' separated]
-    - INFO_COLS (str): News info columns [Required] ['|' separated]
-    - INFO_ROWS (str): News info rows [Required] ['|' separated]
+    - GRID (dict): News table {"cols": list[str], "rows": list[list[str]]} [Required] [JSON]
+    - INFO (list[list[str]]): News topics as [title, content] pairs [Required] [JSON]
     - AUTHOR (str): News author [Required]
     
-    - SEEN_BY (str): User IDs [Default: ""] ['|' separated]
     - ACCEPTED_BY (str): User IDs [Default: ""] ['|' separated]
-    - LIKED_BY (str): User IDs [Default: ""] ['|' separated]
-    - DISLIKED_BY (str): User IDs [Default: ""] ['|' separated]
+    - LIKE_COUNT (int): Number of likes, maintained with NewsReaction [Default: 0]
+    - DISLIKE_COUNT (int): Number of dislikes, maintained with NewsReaction [Default: 0]
+    - VERSION (int): Content version, bumped by comments and reactions [Default: 1]
     
     - CREATED_AT (datetime): Timestamp of when the news article was created [Default: CET]
     
     - USER_ID (int): Foreign key referencing the associated User object
     - USER: Relationship to the associated User object
     - COMMENTS (list[Comment]): Relationship to the associated Comment objects
+    - SEEN_COUNT (int): Number of NewsRead rows, loaded with the News row
     """
     __tablename__ = 'news'  # noqa
+    __table_args__ = (
+        # Keyset pagination of the news feed
+        Index("ix_news_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(Text, nullable=False)
@@ -56,16 +72,17 @@ class News(server_db_.Model):
     code: Mapped[int] = mapped_column(Integer, nullable=False)
     color: Mapped[str] = mapped_column(String(10), nullable=True)
     important: Mapped[str] = mapped_column(Text, nullable=False)
-    grid_cols: Mapped[str] = mapped_column(Text, nullable=False)
-    grid_rows: Mapped[str] = mapped_column(Text, nullable=False)
-    info_cols: Mapped[str] = mapped_column(Text, nullable=False)
-    info_rows: Mapped[str] = mapped_column(Text, nullable=False)
+    grid: Mapped[dict] = mapped_column(NEWS_JSON, nullable=False)
+    info: Mapped[list] = mapped_column(NEWS_JSON, nullable=False)
     author: Mapped[str] = mapped_column(Text, nullable=False)
     
-    seen_by: Mapped[str] = mapped_column(Text, nullable=True, default="")
     accepted_by: Mapped[str] = mapped_column(Text, nullable=True, default="")
-    liked_by: Mapped[str] = mapped_column(Text, nullable=True, default="")
-    disliked_by: Mapped[str] = mapped_column(Text, nullable=True, default="")
+    like_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    dislike_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1")
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(SERVER.CET))
@@ -80,72 +97,21 @@ class News(server_db_.Model):
     )
     
     def __init__(self, title: str, header: str, code: int, important: str,
-                 grid_cols: list[str], grid_rows: list[str], info_cols: list[str],
-                 info_rows: list[str], author: str, user_id: int):
+                 grid: dict, info: list[list[str]], author: str, user_id: int):
         """
-        _cols and _rows are lists of strings that are joined
-        with '|' to form a single string to be stored in the database.
+        grid and info are stored as given, in the shape the template uses.
+        Build them with parse_news_grid and parse_news_info.
         """	
         self.title = title
         self.header = header
         self.code = code
         self.color = self._get_color(code)
         self.important = important
-        self.grid_cols = self._join(grid_cols)
-        self.grid_rows = self._join(grid_rows)
-        self.info_cols = self._join(info_cols)
-        self.info_rows = self._join(info_rows)
+        self.grid = grid
+        self.info = info
         self.author = author
         self.user_id=user_id
     
-    def grid_len(self) -> int:
-        return len(self.grid_cols.split("|")) if self.grid_cols else 0
-    
-    def info_len(self) -> int:
-        return len(self.info_cols.split("|")) if self.info_cols else 0
-    
-    def _get_grid_rows(self) -> list[list[str]]:
-        """
-        Sets up correct nesting for the grid rows to be
-        properly displayed in the frontend.
-        """	    
-        grid_len = self.grid_len()
-        row_list = []
-    
-        if grid_len:
-            if grid_len == len(self.grid_rows.split("|")):
-                list_ = self.grid_rows.split("|")
-                row_list.append(list_)
-            else:
-                for i in range(0, len(self.grid_rows.split("|")), grid_len):   
-                    row_list.append(self.grid_rows.split("|")[i:i + grid_len])
-
-        return row_list
-    
-    def set_seen_by(self, user_id: int):
-        if not str(user_id) in self.seen_by:
-            self.seen_by += f"{user_id}|"
-    
-    def set_liked_by(self, user_id: int):
-        self._remove_disliked_by(user_id)
-        if not str(user_id) in self.liked_by:
-            self.liked_by += f"{user_id}|"
-    
-    def set_disliked_by(self, user_id: int):
-        self._remove_liked_by(user_id)
-        if not str(user_id) in self.disliked_by:
-            self.disliked_by += f"{user_id}|"
-    
-    def _remove_liked_by(self, user_id: int):
-        self.liked_by = self.liked_by.replace(f"{user_id}|", "")
-    
-    def _remove_disliked_by(self, user_id: int):
-        self.disliked_by = self.disliked_by.replace(f"{user_id}|", "")
-    
-    @staticmethod
-    def _join(value: list[str]) -> str:
-        return "|".join(value)
-    
     @staticmethod
     def _split(value: str) -> list[str]:
         return value.split("|") if value else []
@@ -175,15 +141,13 @@ class News(server_db_.Model):
             "code": self.code,
             "color": self.color,
             "important": self.important,
-            "grid_cols": self._split(str(self.grid_cols)),
-            "grid_rows": self._get_grid_rows(),
-            "info_cols": self._split(str(self.info_cols)),
-            "info_rows": self._split(str(self.info_rows)),
+            "grid": self.grid,
+            "info": self.info,
             "author": self.author,
-            "seen_by": [num for num in self._split(str(self.seen_by)) if num],
+            "seen_count": self.seen_count,
             "accepted_by": self._split(str(self.accepted_by)),
-            "liked_by": [num for num in self._split(str(self.liked_by)) if num],
-            "disliked_by": [num for num in self._split(str(self.disliked_by)) if num],
+            "like_count": self.like_count,
+            "dislike_count": self.dislike_count,
             "created_at": self.created_at.strftime("%d %b %Y @ %H:%M"),
             "comments": [comment.to_dict() for comment in self.comments],
         }
@@ -205,6 +169,42 @@ class News(server_db_.Model):
                 f"{'AUTHOR':<18}{self.author}\n"
                 f"{'IMPORTANT':<18}{self.important[:50]}..")
 
+
+class NewsRead(server_db_.Model):
+    """
+    Stores which User has read which News item.
+
+    - USER_ID (int): Foreign key referencing the reading User [Primary Key]
+    - NEWS_ID (int): Foreign key referencing the read News item [Primary Key]
+    - READ_AT (datetime): Timestamp of the first read [Default: CET]
+    """
+    __tablename__ = "news_reads"  # noqa
+    __table_args__ = (
+        # View counts per News item, (user_id, news_id) is covered by the primary key
+        Index("ix_news_reads_news_id", "news_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("auth.id", ondelete="CASCADE"), primary_key=True)
+    news_id: Mapped[int] = mapped_column(
+        ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
+    read_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(SERVER.CET))
+
+    def __repr__(self) -> str:
+        return (f"NewsRead:"
+                f" (user_id={self.user_id},"
+                f" news_id={self.news_id})"
+                )
+
+
+News.seen_count = column_property(
+    select(func.count())
+    .where(NewsRead.news_id == News.id)
+    .correlate_except(NewsRead)
+    .scalar_subquery()
+)
+
     
 class Comment(server_db_.Model):
     """
@@ -215,8 +215,8 @@ class Comment(server_db_.Model):
     - AUTHOR (str): Author of the comment [Required]
     - CREATED_AT (datetime): Timestamp of creation [Default: CET]
     
-    - LIKED_BY (str): User IDs [Default: ""] ['|' separated]
-    - DISLIKED_BY (str): User IDs [Default: ""] ['|' separated]
+    - LIKE_COUNT (int): Number of likes, maintained with CommentReaction [Default: 0]
+    - DISLIKE_COUNT (int): Number of dislikes, maintained with CommentReaction [Default: 0]
     
     - NEWS_ID (int): Foreign key referencing the associated news article
     - NEWS: Relationship to the associated News object
@@ -231,8 +231,10 @@ class Comment(server_db_.Model):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(SERVER.CET))
     
-    liked_by: Mapped[str] = mapped_column(Text, nullable=True, default="")
-    disliked_by: Mapped[str] = mapped_column(Text, nullable=True, default="")
+    like_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
+    dislike_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0")
     
     news_id: Mapped[int] = mapped_column(ForeignKey("news.id"), nullable=False)
     news: Mapped["News"] = relationship("News", back_populates="comments")
@@ -251,34 +253,9 @@ class Comment(server_db_.Model):
             "user_id": self.user_id,
             "display_name": self.user.display_name if self.user.display_name else self.user.username,
             "created_at": self.created_at.strftime("%d %b %Y @ %H:%M"),
-            "liked_by": [num for num in self._split(str(self.liked_by)) if num],
-            "disliked_by": [num for num in self._split(str(self.disliked_by)) if num],
+            "like_count": self.like_count,
+            "dislike_count": self.dislike_count,
         }
-    
-    def set_liked_by(self, user_id: int) -> None:
-        self._remove_disliked_by(user_id)
-        if not str(user_id) in self.liked_by:
-            self.liked_by += f"{user_id}|"
-            user = User.query.get(user_id)
-            add_notification_email_to_db(recipient_email=user.email,
-                            email_type="comment",
-                            news_id=self.news_id,
-                            comment_id=self.id)
-
-    def set_disliked_by(self, user_id: int) -> None:
-        self._remove_liked_by(user_id)
-        if not str(user_id) in self.disliked_by:
-            self.disliked_by += f"{user_id}|"
-    
-    def _remove_liked_by(self, user_id: int) -> None:
-        self.liked_by = self.liked_by.replace(f"{user_id}|", "")
-    
-    def _remove_disliked_by(self, user_id: int) -> None:
-        self.disliked_by = self.disliked_by.replace(f"{user_id}|", "")
-    
-    @staticmethod
-    def _split(value: str) -> list[str]:
-        return value.split("|") if value else []
 
     def __repr__(self) -> str:
         return (f"Comment:"
@@ -294,5 +271,45 @@ class Comment(server_db_.Model):
                 f"{'NEWS ID':<18}{self.news_id}\n"
                 f"{'USERNAME':<18}{self.user.username}\n"
                 f"{'CONTENT':<18}{self.content[:40]}..\n"
-                f"{'LIKE/DISLIKE':<18}{self.liked_by} / {self.disliked_by}")
-    
\ No newline at end of file
+                f"{'LIKE/DISLIKE':<18}{self.like_count} / {self.dislike_count}")
+    
+
+
+class NewsReaction(server_db_.Model):
+    """
+    Stores a User's like or dislike of a News item.
+
+    - USER_ID (int): Foreign key referencing the reacting User [Primary Key]
+    - NEWS_ID (int): Foreign key referencing the News item [Primary Key]
+    - VALUE (int): LIKE (1) or DISLIKE (-1) [Required]
+    - REACTED_AT (datetime): Timestamp of the last change [Default: CET]
+    """
+    __tablename__ = "news_reactions"  # noqa
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("auth.id", ondelete="CASCADE"), primary_key=True)
+    news_id: Mapped[int] = mapped_column(
+        ForeignKey("news.id", ondelete="CASCADE"), primary_key=True)
+    value: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    reacted_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(SERVER.CET))
+
+
+class CommentReaction(server_db_.Model):
+    """
+    Stores a User's like or dislike of a Comment.
+
+    - USER_ID (int): Foreign key referencing the reacting User [Primary Key]
+    - COMMENT_ID (int): Foreign key referencing the Comment [Primary Key]
+    - VALUE (int): LIKE (1) or DISLIKE (-1) [Required]
+    - REACTED_AT (datetime): Timestamp of the last change [Default: CET]
+    """
+    __tablename__ = "comment_reactions"  # noqa
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("auth.id", ondelete="CASCADE"), primary_key=True)
+    comment_id: Mapped[int] = mapped_column(
+        ForeignKey("comments.id", ondelete="CASCADE"), primary_key=True)
+    value: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    reacted_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(SERVER.CET))
@@ -1,35 +1,270 @@
-from sqlalchemy import select
+import base64
 
-from flask import session
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    Select,
+    and_,
+    exists,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import selectinload
+
+from flask import (
+    current_app,
+    get_template_attribute,
+    render_template,
+    session,
+)
 from flask_login import current_user
+from markupsafe import Markup
 
 from src.extensions import (
     server_db_,
+    cache_,
     logger,
 )
 
+from src.models.email_model.email_mod_utils import add_notification_email_to_db
+from src.models.mod_utils import dialect_insert
 from src.models.news_model.news_mod import (
+    DISLIKE,
+    LIKE,
     Comment,
+    CommentReaction,
     News,
+    NewsReaction,
+    NewsRead,
 )
 
 from src.routes.news.news_forms import AddNewsForm
+from src.utils.activity_utils import activity_buffer_
+from config.settings import (
+    SERVER,
+    TEMPLATE,
+)
 from src.routes.news.news_items import get_news_dict
 
 
-def get_all_news_dict() -> list[dict]:
-    result = server_db_.session.execute(
-        select(News)
-    ).scalars().all()
-    return [news.to_dict() for news in result]
+def encode_news_cursor(news: News) -> str:
+    """Opaque 'load more' cursor pointing just past a News item."""
+    raw = f"{news.created_at.isoformat()}|{news.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_news_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, int]]:
+    """Returns (created_at, id) of a cursor, or None for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id_ = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(id_)
+    except (ValueError, UnicodeDecodeError):
+        return None
 
 
-def get_all_unread_dict(user_id: int) -> list[dict]:
-    result = server_db_.session.execute(
+# Comments and their authors in one extra query, whatever the number of News
+#  items, instead of a lazy load per News item and per Comment author
+NEWS_FEED_OPTIONS = (
+    selectinload(News.comments).joinedload(Comment.user),
+)
+
+
+def _unread_clause(user_id: int):
+    # Anti-join, served by the (user_id, news_id) primary key of news_reads
+    clause = ~exists().where(NewsRead.user_id == user_id, NewsRead.news_id == News.id)
+    pending = activity_buffer_.pending_reads(user_id)
+    if pending:
+        # Reads still in this worker's write-behind buffer
+        clause = and_(clause, News.id.not_in(pending))
+    return clause
+
+
+def _news_page_stmt(cursor: Optional[str], page_size: int) -> Select:
+    """
+    Newest first on the (created_at, id) keyset, one extra row tells
+     whether there is a next page.
+    """
+    stmt = (
         select(News)
-    ).scalars().all()
-    return [news.to_dict() for news in result
-            if str(user_id) not in news.seen_by.split("|")]
+        .options(*NEWS_FEED_OPTIONS)
+        .order_by(News.created_at.desc(), News.id.desc())
+        .limit(page_size + 1)
+    )
+    position = decode_news_cursor(cursor)
+    if position is not None:
+        created_at, id_ = position
+        stmt = stmt.where(or_(
+            News.created_at < created_at,
+            and_(News.created_at == created_at, News.id < id_),
+        ))
+    return stmt
+
+
+def get_news_page(cursor: Optional[str] = None, unread_by: Optional[int] = None,
+                  page_size: Optional[int] = None) -> tuple[list[dict], Optional[str]]:
+    """
+    Returns one page of News dicts and the cursor of the next page.
+
+    - CURSOR (str): Cursor returned with the previous page [Optional]
+    - UNREAD_BY (int): Only News not yet seen by this user id [Optional]
+    - PAGE_SIZE (int): Items per page [Default: NEWS_PAGE_SIZE]
+    """
+    page_size = page_size or current_app.config["NEWS_PAGE_SIZE"]
+    stmt = _news_page_stmt(cursor, page_size)
+    if unread_by is not None:
+        stmt = stmt.where(_unread_clause(unread_by))
+
+    result = server_db_.session.execute(stmt).scalars().all()
+    next_cursor = encode_news_cursor(result[page_size - 1]) if len(result) > page_size else None
+    return [news.to_dict() for news in result[:page_size]], next_cursor
+
+
+def count_news(unread_by: Optional[int] = None) -> int:
+    """COUNT(*) on News, optionally only the items unread by a user id."""
+    stmt = select(func.count(News.id))
+    if unread_by is not None:
+        stmt = stmt.where(_unread_clause(unread_by))
+    return server_db_.session.execute(stmt).scalar_one()
+
+
+def mark_news_read(news_id: int, user_id: int) -> None:
+    """
+    Records a read once, repeated reads keep the original read_at.
+    Written behind by activity_buffer_, seen counts follow within ACTIVITY_FLUSH_INTERVAL.
+    """
+    activity_buffer_.mark_read(user_id, news_id)
+
+
+def bump_news_version(news_id: int) -> None:
+    """Invalidates the cached fragments of a News item, in the current transaction."""
+    server_db_.session.execute(
+        update(News)
+        .where(News.id == news_id)
+        .values(version=News.version + 1)
+    )
+
+
+def _news_fragments_key(news: News) -> str:
+    # created_at guards against a reused id after clear_news_db
+    return f"news_fragments:{news.id}:{news.version}:{news.created_at.timestamp()}"
+
+
+def get_news_fragments(news: News) -> dict:
+    """
+    Returns the shared parts of the /news/id/<id> page for the News item's
+     current version, from cache_ when rendered before:
+    - NEWS (dict): News.to_dict(), including the formatted comments
+    - ARTICLE (Markup): Rendered header, important, table and info blocks
+    - COMMENTS (dict): Comment id -> {"header": Markup, "content": Markup},
+       the rendered author, date and content of every comment
+    Per-user state (reactions, views, flashes, admin links) is rendered by the view.
+    """
+    key = _news_fragments_key(news)
+    fragments = cache_.get(key)
+    if fragments is None:
+        news_dict = get_news_dict_by_id(news.id)
+        comment_header = get_template_attribute(TEMPLATE.NEWS_COMMENT, "comment_header")
+        comment_content = get_template_attribute(TEMPLATE.NEWS_COMMENT, "comment_content")
+        fragments = {
+            "news": news_dict,
+            "article": Markup(render_template(TEMPLATE.NEWS_ARTICLE, news_dict=news_dict)),
+            "comments": {
+                comment["id"]: {
+                    "header": Markup(comment_header(comment)),
+                    "content": Markup(comment_content(comment)),
+                }
+                for comment in news_dict["comments"]
+            },
+        }
+        cache_.set(key, fragments, timeout=SERVER.NEWS_FRAGMENT_TIMEOUT)
+    return fragments
+
+
+def _set_reaction(reaction_model, target_model, target_key: str,
+                  target_id: int, user_id: int, value: int) -> Optional[int]:
+    """
+    Sets a user's reaction and moves the target's like/dislike counters
+     with a relative UPDATE, so concurrent reactions never lose a count.
+    Returns the previous reaction, equal to value when nothing changed.
+    """
+    target_column = getattr(reaction_model, target_key)
+    filters = (reaction_model.user_id == user_id, target_column == target_id)
+    previous = server_db_.session.execute(
+        select(reaction_model.value).where(*filters).with_for_update()
+    ).scalar_one_or_none()
+    if previous == value:
+        return previous
+
+    now = datetime.now(SERVER.CET)
+    if previous is None:
+        stmt = (
+            dialect_insert(reaction_model)
+            .values(user_id=user_id, value=value, reacted_at=now, **{target_key: target_id})
+            .on_conflict_do_nothing(index_elements=["user_id", target_key])
+        )
+    else:
+        stmt = (
+            update(reaction_model)
+            .where(*filters, reaction_model.value == previous)
+            .values(value=value, reacted_at=now)
+        )
+    if not server_db_.session.execute(stmt).rowcount:
+        # Lost a race against the same user's other request
+        return value
+
+    like_delta = int(value == LIKE) - int(previous == LIKE)
+    dislike_delta = int(value == DISLIKE) - int(previous == DISLIKE)
+    server_db_.session.execute(
+        update(target_model)
+        .where(target_model.id == target_id)
+        .values(
+            like_count=target_model.like_count + like_delta,
+            dislike_count=target_model.dislike_count + dislike_delta,
+        )
+    )
+    return previous
+
+
+def set_news_reaction(news_id: int, user_id: int, value: int) -> None:
+    """Likes (LIKE) or dislikes (DISLIKE) a News item, replacing the user's other reaction."""
+    if _set_reaction(NewsReaction, News, "news_id", news_id, user_id, value) != value:
+        bump_news_version(news_id)
+    server_db_.session.commit()
+
+
+def set_comment_reaction(comment: Comment, user_id: int, value: int) -> None:
+    """Likes (LIKE) or dislikes (DISLIKE) a Comment, replacing the user's other reaction."""
+    previous = _set_reaction(CommentReaction, Comment, "comment_id", comment.id, user_id, value)
+    if previous != value:
+        bump_news_version(comment.news_id)
+    if value == LIKE and previous != LIKE:
+        from src.models.auth_model.auth_mod import User
+        user = server_db_.session.get(User, user_id)
+        add_notification_email_to_db(recipient_email=user.email,
+                                     email_type="comment",
+                                     news_id=comment.news_id,
+                                     comment_id=comment.id)
+    server_db_.session.commit()
+
+
+def get_user_reactions(news_id: int, user_id: int) -> tuple[Optional[int], dict[int, int]]:
+    """Returns the user's reaction to a News item and {comment id: reaction} for its comments."""
+    news_reaction = server_db_.session.execute(
+        select(NewsReaction.value)
+        .where(NewsReaction.user_id == user_id, NewsReaction.news_id == news_id)
+    ).scalar_one_or_none()
+    comment_reactions = server_db_.session.execute(
+        select(CommentReaction.comment_id, CommentReaction.value)
+        .join(Comment, Comment.id == CommentReaction.comment_id)
+        .where(CommentReaction.user_id == user_id, Comment.news_id == news_id)
+    ).all()
+    return news_reaction, dict(comment_reactions)
 
 
 def get_news_by_id(id_: int):
@@ -38,7 +273,8 @@ def get_news_by_id(id_: int):
 
 
 def get_news_dict_by_id(id_: int):
-    result = server_db_.session.get(News, id_)
+    stmt = select(News).where(News.id == id_).options(*NEWS_FEED_OPTIONS)
+    result = server_db_.session.execute(stmt).scalar_one()
     return result.to_dict()
 
 
@@ -65,7 +301,8 @@ def delete_comment_by_id(id_: int, cli: bool = False) -> bool:
     comment = server_db_.session.get(Comment, id_)
     if comment is not None:
         deleted_message = f"Comment {comment.content[:10]}.. by {comment.user.username} removed."
-        server_db_.session.delete(server_db_.session.get(Comment, id_))
+        server_db_.session.delete(comment)
+        bump_news_version(comment.news_id)
         server_db_.session.commit()
         if not cli:
             logger.warning(deleted_message)
@@ -74,30 +311,56 @@ def delete_comment_by_id(id_: int, cli: bool = False) -> bool:
 
 
 def clear_news_db() -> None:
+    server_db_.session.query(NewsReaction).delete()
+    server_db_.session.query(NewsRead).delete()
     server_db_.session.query(News).delete()
     server_db_.session.commit()
 
 
 def clear_comments_db() -> None:
+    server_db_.session.query(CommentReaction).delete()
     server_db_.session.query(Comment).delete()
+    server_db_.session.execute(update(News).values(version=News.version + 1))
     server_db_.session.commit()
 
 
+def parse_news_grid(grid_cols: list[str], grid_rows: list[str]) -> dict:
+    """
+    Builds News.grid from the column headers and the table rows.
+    Rows may hold several cells on separate lines (the add form's textareas),
+     all cells are regrouped into rows of len(grid_cols).
+    """
+    if not grid_cols:
+        return {"cols": [], "rows": []}
+    cells = [cell.rstrip("\r") for row in grid_rows for cell in row.split("\n")]
+    width = len(grid_cols)
+    return {
+        "cols": list(grid_cols),
+        "rows": [cells[i:i + width] for i in range(0, len(cells), width)],
+    }
+
+
+def parse_news_info(info_cols: list[str], info_rows: list[str]) -> list[list[str]]:
+    """Builds News.info as [title, content] pairs, a missing title is left empty."""
+    return [
+        [info_cols[i] if i < len(info_cols) else "", content]
+        for i, content in enumerate(info_rows)
+    ]
+
+
 def add_news_message(form: AddNewsForm, grid_cols: list[str], grid_rows: list[str],
-                     info_cols: list[str], info_rows: list[str]) -> None:
-    from src.models.news_model.news_mod import News
+                     info_cols: list[str], info_rows: list[str], user_id: int) -> None:
+    """Parses the table and topics once, News.to_dict() passes them through."""
     # noinspection PyArgumentList
     new_news = News(
         title=form.title.data,
         header=form.header.data,
         code=form.code.data,
         important=form.important.data,
-        grid_cols=grid_cols,
-        grid_rows=grid_rows,
-        info_cols=info_cols,
-        info_rows=info_rows,
+        grid=parse_news_grid(grid_cols, grid_rows),
+        info=parse_news_info(info_cols, info_rows),
         author=form.author.data,
-        user_id=current_user.id
+        user_id=user_id
     )
     server_db_.session.add(new_news)
     server_db_.session.commit()
@@ -120,10 +383,8 @@ def _init_news() -> bool:
                 title=item_details["title"],
                 code=item_details["code"],
                 important=item_details["important"],
-                grid_cols=item_details["grid_cols"],
-                grid_rows=item_details["grid_rows"],
-                info_cols=item_details["info_cols"],
-                info_rows=item_details["info_rows"],
+                grid=parse_news_grid(item_details["grid_cols"], item_details["grid_rows"]),
+                info=parse_news_info(item_details["info_cols"], item_details["info_rows"]),
                 author=item_details["author"],
                 user_id=lowest_user_id,
             )
@@ -145,5 +406,6 @@ def add_new_comment(news_id: int, user_id: int, content: str) -> None:
         content=content,
     )
     server_db_.session.add(comment)
+    bump_news_version(news_id)
     server_db_.session.commit()
     logger.info(f"[ADD] COMMENT CREATED: {comment.content[:10]}.. by {comment.user.username}")
@@ -1,18 +1,26 @@
 import random
-from typing import Any
+from typing import (
+    Any,
+    Optional,
+)
 
 from flask_login import current_user
 from datetime import datetime
 from sqlalchemy import (
     Boolean,
     Date,
+    ForeignKey,
+    Index,
     Integer,
+    JSON,
+    SmallInteger,
     String,
-    Text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
+    relationship,
 )
 
 from src.extensions import (
@@ -29,6 +37,9 @@ from src.utils.misc_utils import crop_name
 from config.settings import SERVER
 
 
+# Occupancy per quarter of a day, JSONB on Postgres
+COVERAGE_JSON = JSON().with_variant(JSONB(), "postgresql")
+
 class Employees(server_db_.Model):
     """
     Stores the employee data.
@@ -97,145 +108,193 @@ class Employees(server_db_.Model):
 
 class Schedule(server_db_.Model):
     """
-    Stores the schedule data.
+    Stores the schedule days, the shifts are stored per employee in Shift.
     
     - ID (int): Identifier [Primary Key]
     - DATE (date): Date of the schedule [Unique]
     - WEEK_NUMBER (str): Week number of the schedule
     - DAY (str): Day of the schedule
-    - NAMES (list[str]): Names of the schedule
-    
-    - START_HOURS (str): Start hours of the schedule
-    - END_HOURS (str): End hours of the schedule
-    - STARTS (str): Starts of the schedule
-    - ENDS (str): Ends of the schedule
-    
-    - BREAK_TIME (str): Break time of the schedule
-    - WORK_TIME (str): Work time of the schedule
+    - COVERAGE (list[int]): Employees on duty per quarter after 06:00 [Optional]
     
+    - SHIFTS (list[Shift]): Relationship to the Shifts of the day, in schedule order
     """
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     date: Mapped[datetime] = mapped_column(Date, unique=True, nullable=False)
     week_number: Mapped[int] = mapped_column(Integer, nullable=False)
     day: Mapped[str] = mapped_column(String(255), nullable=False)
-    names: Mapped[str] = mapped_column(Text, nullable=False)
-    
-    start_hours: Mapped[str] = mapped_column(Text, nullable=False)
-    end_hours: Mapped[str] = mapped_column(Text, nullable=False)
-    starts: Mapped[str] = mapped_column(Text)
-    ends: Mapped[str] = mapped_column(Text)
-    
-    break_times: Mapped[str] = mapped_column(Text, nullable=False)
-    work_times: Mapped[str] = mapped_column(Text, nullable=False)
+    coverage: Mapped[Optional[list]] = mapped_column(COVERAGE_JSON)
+
+    shifts: Mapped[list["Shift"]] = relationship(
+        "Shift",
+        back_populates="schedule",
+        order_by="Shift.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def __init__(self, date: datetime, week_number: int, day: str,
-                 names: list[str], hours: list[str],
-                 break_times: list[str], work_times: list[str]):
+                 shifts: list["Shift"] | None = None, coverage: list[int] | None = None):
         self.date = date
         self.week_number = week_number
         self.day = day
-        self.names = self._join(names)
-        
-        self.start_hours = self._get_start_hours(hours)
-        self.end_hours = self._get_end_hours(hours)
-        self.starts = self._get_starts(hours)
-        self.ends = self._get_ends(hours)
-        
-        self.break_times = self._join(break_times)
-        self.work_times = self._join(work_times)
-    
-    def _get_start_hours(self, hours: list[str]) -> str:
-        start_hours = [hour.split(" - ")[0] for hour in hours]
-        return self._join(start_hours)
-    
-    def _get_end_hours(self, hours: list[str]) -> str:
-        end_hours = [hour.split(" - ")[1] for hour in hours]
-        return self._join(end_hours)
-    
-    def _get_starts(self, hours: list[str]) -> str:
-        starts = []
-        for hour in hours:
-            start_time = hour.split(" - ")[0]
-            start_value = self._convert_time_to_value(start_time)
-            starts.append(str(start_value))
-        return self._join(starts)
-        
-    def _get_ends(self, hours: list[str]) -> str:
-        ends = []
-        for hour in hours:
-            end_time = hour.split(" - ")[1]
-            end_value = self._convert_time_to_value(end_time)
-            ends.append(str(end_value))
-        return self._join(ends)
-    
-    def _convert_time_to_value(self, time_str: str) -> int:
-        hours, minutes = map(int, time_str.split(":"))
-        total_minutes = (hours - 6) * 60 + minutes
-        return total_minutes // 15
+        self.shifts = shifts or []
+        self.coverage = coverage
     
     def date_to_dict(self) -> dict:
+        """Parallel lists per shift, as the day view renders them."""
         return {
             "date": self.date.strftime("%d-%m-%Y"),
             "week_number": int(self.week_number),
             "day": self.day,
-            "names": self._split(self.names),
+            "names": [shift.employee.name for shift in self.shifts],
             
-            "start_hours": self._split(self.start_hours),
-            "end_hours": self._split(self.end_hours),
-            "starts": self._split(self.starts, make_int=True),
-            "ends": self._split(self.ends, make_int=True),
+            "start_hours": [shift.start_hour for shift in self.shifts],
+            "end_hours": [shift.end_hour for shift in self.shifts],
+            "starts": [shift.start_q for shift in self.shifts],
+            "ends": [shift.end_q for shift in self.shifts],
             
-            "break_times": self._split(self.break_times),
-            "work_times": self._split(self.work_times)
+            "break_times": [shift.break_time for shift in self.shifts if shift.break_time is not None],
+            "work_times": [shift.work_time for shift in self.shifts if shift.work_time is not None],
         }
     
-    def to_personal_dict(self, name: str) -> dict:
-        name = name if name in self.names else ""
-        names = self._split(self.names)
-        
-        start_hours = self._split(self.start_hours)
-        start_hour = start_hours[names.index(name)] if name in names else None
-        end_hours = self._split(self.end_hours)
-        end_hour = end_hours[names.index(name)] if name in names else None
-        
-        starts = self._split(self.starts, make_int=True)
-        start = int(starts[names.index(name)]) if name in names else None
-        ends = self._split(self.ends, make_int=True)
-        end = int(ends[names.index(name)]) if name in names else None
-        
-        break_times = self._split(self.break_times)
-        break_time = break_times[names.index(name)] if name in names else None
-        work_times = self._split(self.work_times)
-        work_time = work_times[names.index(name)] if name in names else None
-        
+    def to_personal_dict(self, name: str, shift: Optional["Shift"] = None) -> dict:
+        """The day for a single employee, pass their first Shift of the day if any."""
         return {
             "date": self.date.strftime("%d-%m-%Y"),
             "week_number": int(self.week_number),
             "day": self.day,
-            "name": name,
+            "name": name if shift else "",
             
-            "start_hour": start_hour,
-            "end_hour": end_hour,
-            "start": start,
-            "end": end,
+            "start_hour": shift.start_hour if shift else None,
+            "end_hour": shift.end_hour if shift else None,
+            "start": shift.start_q if shift else None,
+            "end": shift.end_q if shift else None,
             
-            "break_time": break_time,
-            "work_time": work_time
+            "break_time": shift.break_time if shift else None,
+            "work_time": shift.work_time if shift else None,
         }
-    
-    @staticmethod
-    def _join(value: list[str]) -> str:
-        return "|".join(value)
-    
-    @staticmethod
-    def _split(value: str, make_int: bool = False) -> list[str]:
-        return [int(item) if make_int else item for item in value.split("|")] if value else []
 
     def cli_repr(self) -> str:
         return (f"{'ID':<18}{self.id}\n"
                 f"{'DATE':<18}{self.date}\n"
                 f"{'WEEK NUMBER':<18}{self.week_number}\n"
                 f"{'DAY':<18}{self.day}\n"
-                f"{'NAMES':<18}{self.names}")
+                f"{'NAMES':<18}{'|'.join(shift.employee.name for shift in self.shifts)}")
+
+
+class Shift(server_db_.Model):
+    """
+    Stores a single shift of an Employee.
+    
+    - ID (int): Identifier [Primary Key]
+    - DATE (date): Foreign key referencing the Schedule day
+    - POSITION (int): Order of the shift in the day's schedule
+    - EMPLOYEE_ID (int): Foreign key referencing the Employee
+    
+    - START_Q (int): Start in quarters after 06:00
+    - END_Q (int): End in quarters after 06:00
+    - BREAK_MIN (int): Break in minutes [Optional] [None for a second shift that day]
+    - WORK_MIN (int): Worked minutes [Optional] [None for a second shift that day]
+    
+    - SCHEDULE: Relationship to the Schedule day
+    - EMPLOYEE: Relationship to the Employee
+    """
+    __tablename__ = "shifts"  # noqa
+    __table_args__ = (
+        # Personal schedule and calendar range scans
+        Index("ix_shifts_employee_id_date", "employee_id", "date"),
+        Index("ix_shifts_date", "date"),
+    )
+    # Quarter 0 starts at 06:00
+    DAY_START: int = 6 * 60
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    date: Mapped[datetime] = mapped_column(
+        ForeignKey("schedule.date", ondelete="CASCADE"), nullable=False)
+    position: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), nullable=False)
+
+    start_q: Mapped[int] = mapped_column(Integer, nullable=False)
+    end_q: Mapped[int] = mapped_column(Integer, nullable=False)
+    break_min: Mapped[Optional[int]] = mapped_column(Integer)
+    work_min: Mapped[Optional[int]] = mapped_column(Integer)
+
+    schedule: Mapped["Schedule"] = relationship("Schedule", back_populates="shifts")
+    employee: Mapped["Employees"] = relationship("Employees", lazy="joined")
+
+    @classmethod
+    def from_day(cls, names: list[str], hours: list[str], break_times: list[str],
+                 work_times: list[str], employee_ids: dict[str, int]) -> list["Shift"]:
+        """
+        Builds the Shifts of a scraped day.
+        A second shift block repeats the name and hours but has no break or
+         work time of its own, so break_times and work_times are consumed per row.
+        """
+        shifts = []
+        extra_blocks = len(names) - len(break_times)
+        row = 0
+        for position, (name, hour) in enumerate(zip(names, hours)):
+            second_block = (extra_blocks > 0 and position > 0 and name == names[position - 1])
+            if second_block:
+                extra_blocks -= 1
+                break_min = work_min = None
+            else:
+                break_min = cls.duration_to_minutes(break_times[row]) if row < len(break_times) else None
+                work_min = cls.duration_to_minutes(work_times[row]) if row < len(work_times) else None
+                row += 1
+            start_hour, end_hour = hour.split(" - ")
+            shifts.append(cls(
+                position=position,
+                employee_id=employee_ids[name],
+                start_q=cls.time_to_quarter(start_hour),
+                end_q=cls.time_to_quarter(end_hour),
+                break_min=break_min,
+                work_min=work_min,
+            ))
+        return shifts
+
+    @classmethod
+    def time_to_quarter(cls, time_str: str) -> int:
+        hours, minutes = map(int, time_str.split(":"))
+        return (hours * 60 + minutes - cls.DAY_START) // 15
+
+    @classmethod
+    def quarter_to_time(cls, quarter: int) -> str:
+        hours, minutes = divmod(cls.DAY_START + quarter * 15, 60)
+        return f"{hours:02d}:{minutes:02d}"
+
+    @staticmethod
+    def duration_to_minutes(duration: str) -> int:
+        hours, minutes = map(int, duration.split(":"))
+        return hours * 60 + minutes
+
+    @staticmethod
+    def minutes_to_duration(minutes: Optional[int]) -> Optional[str]:
+        if minutes is None:
+            return None
+        return f"{minutes // 60}:{minutes % 60:02d}"
+
+    @property
+    def start_hour(self) -> str:
+        return self.quarter_to_time(self.start_q)
+
+    @property
+    def end_hour(self) -> str:
+        return self.quarter_to_time(self.end_q)
+
+    @property
+    def break_time(self) -> Optional[str]:
+        return self.minutes_to_duration(self.break_min)
+
+    @property
+    def work_time(self) -> Optional[str]:
+        return self.minutes_to_duration(self.work_min)
 
+    def __repr__(self) -> str:
+        return (f"Shift:"
+                f" (date={self.date},"
+                f" employee_id={self.employee_id},"
+                f" start_q={self.start_q},"
+                f" end_q={self.end_q})"
+                )
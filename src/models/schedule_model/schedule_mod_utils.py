@@ -1,29 +1,44 @@
 import json
-import os
 import random
 
-from datetime import datetime
+from datetime import (
+    date as date_,
+    datetime,
+    timedelta,
+)
+from typing import (
+    Iterable,
+    Optional,
+)
+
 from flask import flash
 from flask_login import current_user
+from sqlalchemy import (
+    delete,
+    func,
+    insert,
+    select,
+)
 from unidecode import unidecode
 
 from src.models.schedule_model.schedule_mod import (
     Employees,
     Schedule,
+    Shift,
 )
 
 from src.extensions import (
     server_db_,
-    cache_,
     logger,
 )
 
 from src.models.auth_model.auth_mod_utils import get_user_by_employee_name
 from src.models.schedule_model.schedule_mod import update_employee_json
 
-from src.utils.schedule import (
-    _date_from_week_day_year,
-    _get_schedule_paths,
+from src.utils.schedule import _get_schedule_paths
+from src.utils.schedule_archive import (
+    schedule_archive_,
+    week_record_days,
 )
 from src.utils.misc_utils import crop_name
 
@@ -33,32 +48,188 @@ from config.settings import (
     Environ,
 )
 
-from src.utils.schedule import check_for_new_employees
-from src.utils.encryption_utils import decrypt_data
+from src.models.mod_utils import dialect_insert
+
+from src.utils.schedule import add_employees_json
+from src.utils.encryption_utils import encrypted_json_cache_
+
+
+def get_schedule_bounds() -> tuple[Optional[date_], Optional[date_]]:
+    """
+    Returns the earliest and latest schedule date, (None, None) without schedules.
+    Not cached, schedules are added by the CLI which can't clear the workers' caches,
+     and MIN/MAX on the unique date index are cheap.
+    """
+    return server_db_.session.execute(select(func.min(Schedule.date), func.max(Schedule.date))).one()
+
 
+def get_employee_id_by_name(name: Optional[str]) -> Optional[int]:
+    if not name:
+        return None
+    stmt = select(Employees.id).where(Employees.name == name)
+    return server_db_.session.execute(stmt).scalar_one_or_none()
 
-@cache_.cached(timeout=0)
-def get_schedule_bounds():
-    """Returns earliest and latest schedule from database"""
-    earliest = Schedule.query.order_by(Schedule.date.asc()).first()
-    latest = Schedule.query.order_by(Schedule.date.desc()).first()
-    return earliest, latest
+
+def resolve_employee_ids(names: Iterable[str]) -> tuple[dict[str, int], list[str]]:
+    """
+    Returns {name: Employee id} and the names that were new.
+    Known names are read in one IN query, new ones added in one bulk INSERT.
+    Nothing is committed and the employees JSON is left to the caller.
+    """
+    unique_names = set(names)
+    if not unique_names:
+        return {}, []
+    stmt = select(Employees.name, Employees.id).where(Employees.name.in_(unique_names))
+    employee_ids = dict(server_db_.session.execute(stmt).all())
+
+    new_names = sorted(unique_names - employee_ids.keys())
+    if new_names:
+        rows = [
+            {"name": name, "code": random.randint(10000, 99999), "is_activated": False}
+            for name in new_names
+        ]
+        stmt = (
+            dialect_insert(Employees)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Employees.name, Employees.id)
+        )
+        employee_ids.update(server_db_.session.execute(stmt).all())
+        # Added by a concurrent ingest between the SELECT and the INSERT
+        missing = unique_names - employee_ids.keys()
+        if missing:
+            stmt = select(Employees.name, Employees.id).where(Employees.name.in_(missing))
+            employee_ids.update(server_db_.session.execute(stmt).all())
+        for name in new_names:
+            logger.info(f"[ADD] EMPLOYEE {name} ADDED")
+    return employee_ids, new_names
+
+
+def get_employee_ids(names: list[str]) -> dict[str, int]:
+    """Returns {name: Employee id}, adding unknown employees first."""
+    employee_ids, new_names = resolve_employee_ids(names)
+    if new_names:
+        add_employees_json(new_names)
+    return employee_ids
+
+
+def _schedule_rows(day: dict, employee_ids: dict[str, int]) -> tuple[dict, list[dict]]:
+    """The Schedule row and Shift rows of a day dict, see upsert_schedule_days."""
+    from src.models.schedule_model.schedule_stats import day_coverage
+
+    shifts = Shift.from_day(day["names"], day["hours"], day["break_times"], day["work_times"], employee_ids)
+    schedule_row = {
+        "date": day["date"],
+        "week_number": int(day["week_number"]),
+        "day": day["day"],
+        "coverage": day_coverage([shift.start_q for shift in shifts], [shift.end_q for shift in shifts]),
+    }
+    shift_rows = [
+        {
+            "date": day["date"],
+            "position": shift.position,
+            "employee_id": shift.employee_id,
+            "start_q": shift.start_q,
+            "end_q": shift.end_q,
+            "break_min": shift.break_min,
+            "work_min": shift.work_min,
+        }
+        for shift in shifts
+    ]
+    return schedule_row, shift_rows
+
+
+def upsert_schedule_days(days: list[dict]) -> int:
+    """
+    Writes whole days at once, typically a week, in a single transaction.
+    Days already stored are replaced, so ingesting a week twice is harmless.
+
+    Every day is {"date": date, "week_number": int, "day": str, "names": list,
+     "hours": list, "break_times": list, "work_times": list}.
+    New employees are added in one INSERT and the employees JSON is written once,
+     after the commit.
+    Returns the number of Shifts written.
+    """
+    if not days:
+        return 0
+    employee_ids, new_names = resolve_employee_ids(name for day in days for name in day["names"])
+
+    schedule_rows = []
+    shift_rows = []
+    for day in days:
+        schedule_row, day_shift_rows = _schedule_rows(day, employee_ids)
+        schedule_rows.append(schedule_row)
+        shift_rows.extend(day_shift_rows)
+
+    try:
+        stmt = dialect_insert(Schedule).values(schedule_rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["date"],
+            set_={
+                "week_number": stmt.excluded.week_number,
+                "day": stmt.excluded.day,
+                "coverage": stmt.excluded.coverage,
+            },
+        )
+        server_db_.session.execute(stmt)
+        server_db_.session.execute(
+            delete(Shift).where(Shift.date.in_([row["date"] for row in schedule_rows]))
+        )
+        if shift_rows:
+            # Core executemany, the ORM would split the rows on their None columns
+            server_db_.session.execute(insert(Shift.__table__), shift_rows)
+        server_db_.session.commit()
+    except Exception:
+        server_db_.session.rollback()
+        raise
+
+    if new_names:
+        add_employees_json(new_names)
+    return len(shift_rows)
+
+
+def get_week_coverage(week_start: date_) -> list[dict]:
+    """
+    Returns the stored coverage of the 7 days from week_start in one query,
+     as [{"date": str, "day": str, "coverage": list[int]}], missing days are left out.
+    """
+    stmt = (
+        select(Schedule.date, Schedule.day, Schedule.coverage)
+        .where(Schedule.date >= week_start, Schedule.date < week_start + timedelta(days=7))
+        .order_by(Schedule.date)
+    )
+    return [
+        {"date": date.strftime("%d-%m-%Y"), "day": day, "coverage": coverage or []}
+        for date, day, coverage in server_db_.session.execute(stmt).all()
+    ]
+
+
+def get_employee_shifts(employee_id: int, start: date_, end: Optional[date_] = None) -> list[Shift]:
+    """An Employee's Shifts from start up to and including end, range scan on (employee_id, date)."""
+    stmt = select(Shift).where(Shift.employee_id == employee_id, Shift.date >= start)
+    if end is not None:
+        stmt = stmt.where(Shift.date <= end)
+    stmt = stmt.order_by(Shift.date, Shift.position)
+    return server_db_.session.execute(stmt).scalars().all()
 
 
 def get_calendar_on_duty_days(dates: list[str]) -> list[str]:
     """
     Returns the list of dates where the current user is on duty.
     """
+    employee_id = get_employee_id_by_name(current_user.employee_name)
+    if employee_id is None or not dates:
+        return []
+
     date_objects = [datetime.strptime(date, '%d-%m-%Y').date() for date in dates]
-    schedules = Schedule.query.filter(Schedule.date.in_(date_objects)).all()
-    
-    on_duty_dates = []
-    for schedule in schedules:
-        names = schedule.names.split('|')
-        if current_user.employee_name in names:
-            on_duty_dates.append(schedule.date.strftime('%d-%m-%Y'))
-    
-    return on_duty_dates
+    stmt = (
+        select(Shift.date)
+        .distinct()
+        .where(Shift.employee_id == employee_id,
+               Shift.date.between(min(date_objects), max(date_objects)))
+    )
+    on_duty = set(server_db_.session.execute(stmt).scalars())
+    return [date.strftime('%d-%m-%Y') for date in date_objects if date in on_duty]
 
 
 def activate_employee(name: str, code: str) -> bool:
@@ -115,9 +286,7 @@ def _init_employees() -> bool:
     """
     if not server_db_.session.query(Employees).count():
         try:
-            with open(PATH.EMPLOYEES, "rb") as json_file:
-                encrypted_data = json_file.read()
-                employees_data = json.loads(decrypt_data(encrypted_data).decode())
+            employees_data = encrypted_json_cache_.read(PATH.EMPLOYEES)
         except FileNotFoundError:
             logger.exception(f"[SYS] FILE {PATH.EMPLOYEES} NOT FOUND")
             return False
@@ -138,50 +307,35 @@ def _init_employees() -> bool:
 def _init_schedule() -> bool:
     """
     Initializes the schedule in the database. Used in cli.
+    Weeks are streamed from the schedule archive one at a time, the scheduleYYYY.json
+     files are imported into it first if it is still empty.
     """
     if not server_db_.session.query(Schedule).count():
-        schedule_paths = _get_schedule_paths()
-        
-        for path in schedule_paths:
-            filename = os.path.basename(path)
-            year = int(filename.split('schedule')[1].split('.json')[0])
-
-            try:
-                with open(path, "rb") as json_file:
-                    encrypted_data = json_file.read()
-                    schedule_data = json.loads(decrypt_data(encrypted_data).decode())
-            except FileNotFoundError:
-                logger.exception(f"[SYS] FILE {path} NOT FOUND")
-                return False
-            except json.JSONDecodeError:
-                logger.exception(f"[SYS] ERROR DECODING JSON FROM FILE {path}")
-                return False
-            
-            for week_number, week_data in schedule_data.items():
-                for day, day_data in week_data.items():
-                    # Use the year from the filename in date calculation
-                    date = _date_from_week_day_year(int(week_number), day, year).date()
-                    names = day_data["names"]
-                    names = [unidecode(name) for name in names]
-                    hours = day_data["hours"]
-                    break_times = day_data["break_times"]
-                    work_times = day_data["work_times"]
-                    
-                    schedule_item = Schedule(
-                        date=date,
-                        week_number=week_number,
-                        day=day,
-                        names=names,
-                        hours=hours,
-                        break_times=break_times,
-                        work_times=work_times
-                    )
-                    server_db_.session.add(schedule_item)
-                    unique_names = set(name for name in names)
-                    logger.debug(f"[DEBUG] UNIQUE NAMES: {unique_names}")
-                    check_for_new_employees(unique_names)
+        if not schedule_archive_.weeks():
+            for path in _get_schedule_paths():
+                try:
+                    schedule_archive_.import_year_file(path)
+                except FileNotFoundError:
+                    logger.exception(f"[SYS] FILE {path} NOT FOUND")
+                    return False
+                except (json.JSONDecodeError, ValueError):
+                    logger.exception(f"[SYS] ERROR IMPORTING SCHEDULE FILE {path}")
+                    return False
+
+        for record in schedule_archive_.iter_weeks():
+            days = []
+            for date, day, day_data in week_record_days(record):
+                days.append({
+                    "date": date,
+                    "week_number": int(record["week"]),
+                    "day": day,
+                    "names": [unidecode(name) for name in day_data["names"]],
+                    "hours": day_data["hours"],
+                    "break_times": day_data["break_times"],
+                    "work_times": day_data["work_times"],
+                })
+            upsert_schedule_days(days)
 
-        server_db_.session.commit()
         return True
     else:
         return False
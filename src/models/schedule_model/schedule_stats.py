@@ -0,0 +1,219 @@
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+from sqlalchemy import select
+
+from src.extensions import server_db_
+
+from src.models.schedule_model.schedule_mod import Shift
+
+from config.settings import SERVER
+
+
+# Slots shown on the schedule pages, 06:00 - 21:00 in quarters
+QUARTERS_PER_DAY: int = 15 * 4
+
+
+class ShiftArrays:
+    """
+    Column arrays of Shift rows, one element per shift.
+
+    - DATES (ndarray[datetime64[D]]): Shift date
+    - EMPLOYEE_IDS (ndarray[int32]): Employee id
+    - START_Q (ndarray[int16]): Start in quarters after 06:00
+    - END_Q (ndarray[int16]): End in quarters after 06:00
+    - BREAK_MIN (ndarray[int16]): Break in minutes, 0 for a second shift block
+    """
+    __slots__ = ("dates", "employee_ids", "start_q", "end_q", "break_min")
+
+    def __init__(self, dates: np.ndarray, employee_ids: np.ndarray, start_q: np.ndarray,
+                 end_q: np.ndarray, break_min: np.ndarray):
+        self.dates = dates
+        self.employee_ids = employee_ids
+        self.start_q = start_q
+        self.end_q = end_q
+        self.break_min = break_min
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple]) -> "ShiftArrays":
+        """Rows of (date, employee_id, start_q, end_q, break_min)."""
+        if not rows:
+            return cls(np.array([], dtype="datetime64[D]"), *(np.array([], dtype=np.int32) for _ in range(4)))
+        dates, employee_ids, start_q, end_q, break_min = zip(*rows)
+        return cls(
+            np.array(dates, dtype="datetime64[D]"),
+            np.array(employee_ids, dtype=np.int32),
+            np.array(start_q, dtype=np.int16),
+            np.array(end_q, dtype=np.int16),
+            np.array([minutes or 0 for minutes in break_min], dtype=np.int16),
+        )
+
+    @classmethod
+    def load(cls, start: Optional[date] = None, end: Optional[date] = None,
+             employee_id: Optional[int] = None) -> "ShiftArrays":
+        """Loads the Shifts between start and end (inclusive) in a single query."""
+        stmt = select(Shift.date, Shift.employee_id, Shift.start_q, Shift.end_q, Shift.break_min)
+        if employee_id is not None:
+            stmt = stmt.where(Shift.employee_id == employee_id)
+        if start is not None:
+            stmt = stmt.where(Shift.date >= start)
+        if end is not None:
+            stmt = stmt.where(Shift.date <= end)
+        return cls.from_rows(server_db_.session.execute(stmt).all())
+
+    def paid_hours(self) -> np.ndarray:
+        """Hours per shift, excluding the break."""
+        quarters = self.end_q.astype(np.float64) - self.start_q
+        return quarters / 4 - self.break_min / 60
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def week_starts(dates: np.ndarray) -> np.ndarray:
+    """Monday of the ISO week of every date."""
+    # 1970-01-01 was a Thursday
+    weekday = (dates.astype(np.int64) + 3) % 7
+    return dates - weekday.astype("timedelta64[D]")
+
+
+def hours_by_period(shifts: ShiftArrays, period: str = "week"
+                    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Paid hours per employee per week or month.
+    Returns (employee ids, period starts, hours[employee, period]).
+    """
+    if period == "week":
+        keys = week_starts(shifts.dates)
+    elif period == "month":
+        keys = shifts.dates.astype("datetime64[M]").astype("datetime64[D]")
+    else:
+        raise ValueError(f"Invalid period '{period}', expected 'week' or 'month'")
+
+    employee_ids, employee_index = np.unique(shifts.employee_ids, return_inverse=True)
+    periods, period_index = np.unique(keys, return_inverse=True)
+    flat = employee_index * len(periods) + period_index
+    hours = np.bincount(flat, weights=shifts.paid_hours(), minlength=len(employee_ids) * len(periods))
+    return employee_ids, periods, hours.reshape(len(employee_ids), len(periods))
+
+
+def hours_in_ranges(shifts: ShiftArrays, range_starts: np.ndarray) -> np.ndarray:
+    """
+    Paid hours per date range, ranges run from each start up to the next.
+    Shifts before the first start are ignored.
+    """
+    order = np.argsort(range_starts)
+    sorted_starts = range_starts[order]
+    index = np.searchsorted(sorted_starts, shifts.dates, side="right") - 1
+    valid = index >= 0
+    hours = np.bincount(index[valid], weights=shifts.paid_hours()[valid], minlength=len(range_starts))
+    result = np.empty_like(hours)
+    result[order] = hours
+    return result
+
+
+def coverage_by_slot(shifts: ShiftArrays, n_slots: int = QUARTERS_PER_DAY
+                     ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Number of employees on duty per date per quarter slot.
+    Returns (dates, coverage[date, slot]), from a difference array:
+     +1 at every start, -1 at every end, cumulated over the slots.
+    """
+    dates, date_index = np.unique(shifts.dates, return_inverse=True)
+    starts = np.clip(shifts.start_q, 0, n_slots)
+    ends = np.clip(shifts.end_q, 0, n_slots)
+    diff = np.zeros((len(dates), n_slots + 1), dtype=np.int32)
+    np.add.at(diff, (date_index, starts), 1)
+    np.add.at(diff, (date_index, ends), -1)
+    return dates, np.cumsum(diff, axis=1)[:, :n_slots]
+
+
+def day_coverage(start_q: list[int], end_q: list[int], n_slots: int = QUARTERS_PER_DAY) -> list[int]:
+    """
+    Number of employees on duty per quarter slot of a single day, as stored in Schedule.coverage.
+    Same difference array as coverage_by_slot, for one date.
+    """
+    diff = np.zeros(n_slots + 1, dtype=np.int32)
+    np.add.at(diff, np.clip(np.asarray(start_q, dtype=np.int32), 0, n_slots), 1)
+    np.add.at(diff, np.clip(np.asarray(end_q, dtype=np.int32), 0, n_slots), -1)
+    return np.cumsum(diff)[:n_slots].tolist()
+
+
+def overtime_hours(weekly_hours: np.ndarray,
+                   contract_hours: float = SERVER.WEEKLY_CONTRACT_HOURS) -> np.ndarray:
+    """Hours above contract_hours per employee, summed over the weeks."""
+    return np.clip(weekly_hours - contract_hours, 0, None).sum(axis=1)
+
+
+def _synthetic_shifts(n_employees: int, n_days: int, seed: int = 0) -> ShiftArrays:
+    """Roughly 60% of the employees working a day, 4 to 9 hour shifts."""
+    rng = np.random.default_rng(seed)
+    days = np.arange(np.datetime64("2025-01-06"), np.datetime64("2025-01-06") + n_days)
+    working = rng.random((n_days, n_employees)) < 0.6
+    day_index, employee_ids = np.nonzero(working)
+    start_q = rng.integers(0, 28, len(day_index))
+    end_q = np.minimum(start_q + rng.integers(16, 37, len(day_index)), QUARTERS_PER_DAY)
+    break_min = np.where(end_q - start_q > 22, 30, 0)
+    return ShiftArrays(days[day_index], employee_ids.astype(np.int32), start_q.astype(np.int16),
+                       end_q.astype(np.int16), break_min.astype(np.int16))
+
+
+def _loop_hours_per_week(shifts: ShiftArrays) -> dict[tuple[int, date], float]:
+    """
+    Reference implementation in the style of the former get_personal_hours_per_week:
+     per-day dicts with 'H:MM' break strings, summed in Python loops.
+    """
+    days = []
+    for i in range(len(shifts)):
+        break_min = int(shifts.break_min[i])
+        days.append({
+            "date": shifts.dates[i].item(),
+            "employee_id": int(shifts.employee_ids[i]),
+            "start": int(shifts.start_q[i]),
+            "end": int(shifts.end_q[i]),
+            "break_time": f"{break_min // 60}:{break_min % 60:02d}",
+        })
+    totals: dict[tuple[int, date], float] = {}
+    for day in days:
+        work_quarters = day["end"] - day["start"]
+        break_quarters = int(day["break_time"].split(":")[0]) * 4
+        break_quarters += int(day["break_time"].split(":")[1]) / 15
+        week = day["date"].isocalendar()[:2]
+        key = (day["employee_id"], week)
+        totals[key] = totals.get(key, 0) + (work_quarters - break_quarters) / 4
+    return totals
+
+
+def benchmark_schedule_stats(n_employees: int = 40, n_days: int = 365, repeat: int = 5) -> list[dict]:
+    """
+    Compares the dict/loop weekly hours with the vectorized hours_by_period on a
+     synthetic year of shifts, and times coverage_by_slot.
+    Checks that both weekly totals agree.
+    """
+    import statistics
+    import time
+
+    shifts = _synthetic_shifts(n_employees, n_days)
+
+    def timed(function) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    loop_totals = _loop_hours_per_week(shifts)
+    employee_ids, weeks, hours = hours_by_period(shifts, "week")
+    vector_total = float(hours.sum())
+    if not np.isclose(sum(loop_totals.values()), vector_total):
+        raise AssertionError("Loop and vectorized weekly hours differ")
+
+    return [
+        {"name": "weekly hours (loop)", "shifts": len(shifts), "ms": timed(lambda: _loop_hours_per_week(shifts))},
+        {"name": "weekly hours (numpy)", "shifts": len(shifts), "ms": timed(lambda: hours_by_period(shifts, "week"))},
+        {"name": "monthly hours (numpy)", "shifts": len(shifts), "ms": timed(lambda: hours_by_period(shifts, "month"))},
+        {"name": "coverage (numpy)", "shifts": len(shifts), "ms": timed(lambda: coverage_by_slot(shifts))},
+    ]
@@ -1,6 +1,7 @@
 from flask import (
     Blueprint,
     flash,
+    jsonify,
     redirect,
     render_template,
     request,
@@ -16,6 +17,7 @@ from src.extensions import logger
 
 from src.models.auth_model.auth_mod import User
 from src.models.auth_model.auth_mod_utils import (
+    admin_required,
     confirm_authentication_token,
     delete_authentication_token,
     get_user_by_email,
@@ -30,6 +32,9 @@ from src.routes.admin.admin_route_utils import (
     process_profile_picture,
 )
 
+from src.utils.activity_utils import activity_buffer_
+from src.utils.session_utils import teardown_stats_
+
 from src.routes.admin.admin_forms import (
     AuthenticationForm,
     NotificationsForm,
@@ -264,3 +269,12 @@ def email():
     )
 
 
+@admin_bp.route("/admin/server-stats")
+@admin_required
+@login_required
+def server_stats():
+    """Counters of the worker that serves the request."""
+    return jsonify({
+        "teardown": teardown_stats_.to_dict(),
+        "pending_activity": len(activity_buffer_),
+    })
@@ -1,39 +1,62 @@
-from flask import session
+import secrets
+
+from typing import Optional
+
 from flask_wtf import FlaskForm
 from sqlalchemy import select
 
-from src.extensions import server_db_
+from src.extensions import (
+    search_cache_,
+    server_db_,
+)
 
+from src.models.bakery_model.bakery_catalog import get_bakery_catalog
 from src.models.bakery_model.bakery_mod import BakeryItem
-from src.models.bakery_model.bakery_mod_utils import search_bakery_items
+from src.models.bakery_model.bakery_mod_utils import (
+    build_bakery_search_query,
+    get_bakery_item_summaries,
+)
+from src.models.bakery_model.bakery_ranking import bakery_ranker_
 
 
-def process_bakery_form(form: FlaskForm):
-    bakery_items = []
-    search_terms = form.search_field.data.split(" ")
-    for term in search_terms:
-        bakery_items.extend(search_bakery_items(term))
-
-    if form.lactose_free.data:
-        bakery_items = [item for item in bakery_items if item.lactose_free]
-        
-    if form.vegan.data:
-        bakery_items = [item for item in bakery_items if item.vegan]
-    
-    if form.nutri_score.data:
-        bakery_items = [item for item in bakery_items if item.nutri_score.lower() == form.nutri_score.data.lower()]
-
+def process_bakery_form(form: FlaskForm) -> list[dict]:
+    """
+    Runs the search in a single query and returns the
+     id, name and image of every matching BakeryItem,
+     ordered by relevance (BM25) when search terms are given.
+    """
     if not form.min_price.data:
         form.min_price.data = 0
     if not form.max_price.data:
         form.max_price.data = 9.99
     form.min_price.data = str(form.min_price.data).replace(",", ".")
     form.max_price.data = str(form.max_price.data).replace(",", ".")
-    min_price = max(0, float(form.min_price.data))
-    max_price = min(float(form.max_price.data), 999)
-    bakery_items = [item for item in bakery_items if min_price < item.price < max_price]
 
-    return [item.to_dict() for item in bakery_items]
+    # Drops a stale search index and ranker when the catalog version moved on
+    get_bakery_catalog()
+    terms = form.search_field.data.split() if form.search_field.data else []
+    scores = bakery_ranker_.rank(terms) if terms else {}
+
+    stmt = build_bakery_search_query(form, ranked_ids=scores)
+    result = server_db_.session.execute(stmt).mappings().all()
+    bakery_items = [dict(row) for row in result]
+    if scores:
+        # Stable sort keeps the name order for equal scores
+        bakery_items.sort(key=lambda item: -scores.get(item["id"], 0.0))
+    return bakery_items
+
+
+def get_search_suggestions(form: FlaskForm) -> dict[str, str]:
+    """
+    Returns {term: suggestion} for search terms that only matched through typo tolerance.
+    """
+    terms = form.search_field.data.split() if form.search_field.data else []
+    suggestions = {}
+    for term in terms:
+        suggestion = bakery_ranker_.suggest(term)
+        if suggestion:
+            suggestions[term] = suggestion
+    return suggestions
 
 
 def get_bakery_items_by_column(form: FlaskForm) -> list[BakeryItem] | None:
@@ -48,9 +71,60 @@ def get_bakery_items_by_column(form: FlaskForm) -> list[BakeryItem] | None:
     return bakery_items
 
 
-def update_bakery_search_form(form: FlaskForm) -> None:
-    input = session.get("bakery_search_input", None)
-    if input:
-        form.process(data=input)
+def store_bakery_search(form: FlaskForm, search_results: list[dict]) -> str:
+    """
+    Stores the result ids and the normalized query in the search cache.
+    Returns the short search id to keep in the session.
+    """
+    search_id = secrets.token_urlsafe(8)
+    search_cache_.set(f"bakery_search:{search_id}", {
+        "ids": [item["id"] for item in search_results],
+        "query": _normalize_search_query(form),
+        "suggestions": get_search_suggestions(form),
+    })
+    return search_id
+
+
+def load_bakery_search(search_id: Optional[str]) -> Optional[dict]:
+    """Returns the stored search, or None if unknown or expired."""
+    if not search_id:
+        return None
+    return search_cache_.get(f"bakery_search:{search_id}")
+
+
+def drop_bakery_search(search_id: Optional[str]) -> None:
+    if search_id:
+        search_cache_.delete(f"bakery_search:{search_id}")
+
+
+def hydrate_bakery_search(bakery_search: Optional[dict]) -> Optional[list[dict]]:
+    """
+    Returns the result dicts of a stored search from the catalog cache.
+    Items deleted since the search are skipped.
+    """
+    if not bakery_search:
+        return None
+    summaries = get_bakery_item_summaries()
+    return [summaries[id_] for id_ in bakery_search["ids"] if id_ in summaries]
+
+
+def update_bakery_search_form(form: FlaskForm, bakery_search: Optional[dict]) -> None:
+    if bakery_search:
+        form.process(data=bakery_search["query"])
         form.min_price.data = f"{float(form.min_price.data):.2f}"
         form.max_price.data = f"{float(form.max_price.data):.2f}"
+
+
+def _normalize_search_query(form: FlaskForm) -> dict:
+    """Returns the search fields of the form, without csrf token and buttons."""
+    return {
+        "search_field": " ".join((form.search_field.data or "").lower().split()),
+        "contains": " ".join((form.contains.data or "").split()),
+        "may_contain": " ".join((form.may_contain.data or "").split()),
+        "lactose_free": bool(form.lactose_free.data),
+        "vegan": bool(form.vegan.data),
+        "nutri_score": form.nutri_score.data or "",
+        "min_price": form.min_price.data,
+        "max_price": form.max_price.data,
+        "nasa": (form.nasa.data or "").strip(),
+    }
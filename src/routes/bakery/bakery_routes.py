@@ -21,7 +21,11 @@ from src.models.bakery_model.bakery_mod_utils import (
 )
 
 from src.routes.bakery.bakery_route_utils import (
+    drop_bakery_search,
+    hydrate_bakery_search,
+    load_bakery_search,
     process_bakery_form,
+    store_bakery_search,
     update_bakery_search_form,
 )
 
@@ -94,7 +98,7 @@ def info(id_: int):
 
 
 @bakery_bp.route("/bakery/search", defaults={"id_": None}, methods=["GET", "POST"])
-@bakery_bp.route("/bakery/search/<id_>", methods=["GET", "POST"])
+@bakery_bp.route("/bakery/search/<int:id_>", methods=["GET", "POST"])
 @login_required
 def search(id_: int | None = None, reset: bool = False):
     bakery_search_form = BakerySearchForm()
@@ -102,8 +106,7 @@ def search(id_: int | None = None, reset: bool = False):
 
     reset = request.args.get("reset")
     if reset:
-        session.pop("bakery_search_results")
-        session.pop("bakery_search_input")
+        drop_bakery_search(session.pop("bakery_search_id", None))
         return redirect(url_for(REDIRECT.SEARCH))
     
     if request.method == "POST":
@@ -111,25 +114,27 @@ def search(id_: int | None = None, reset: bool = False):
             if bakery_search_form.validate_on_submit():
                 search_results = process_bakery_form(bakery_search_form)
 
-                session["bakery_search_results"] = search_results
-                session["bakery_search_input"] = bakery_search_form.data
+                session["bakery_search_id"] = store_bakery_search(bakery_search_form, search_results)
                 return redirect(url_for(REDIRECT.SEARCH))
         
         elif form_type == FORM.BAKERY_REFINE_SEARCH:
             if bakery_search_form.validate_on_submit():
-                search_results = session.pop("bakery_search_results", [])
+                drop_bakery_search(session.pop("bakery_search_id", None))
                 search_results = process_bakery_form(bakery_search_form)
                 
-                session["bakery_search_results"] = search_results
-                session["bakery_search_input"] = bakery_search_form.data
+                session["bakery_search_id"] = store_bakery_search(bakery_search_form, search_results)
                 return redirect(url_for(REDIRECT.SEARCH))
             
             session["bakery_search_errors"] = bakery_search_form.errors
 
-    update_bakery_search_form(bakery_search_form)
+    bakery_search = load_bakery_search(session.get("bakery_search_id"))
+    if bakery_search is None and "bakery_search_id" in session:
+        session.pop("bakery_search_id")  # Expired
+    update_bakery_search_form(bakery_search_form, bakery_search)
     
     bakery_search_errors = session.pop("bakery_search_errors", None)
-    bakery_search_results_dicts = session.get("bakery_search_results", None)
+    bakery_search_results_dicts = hydrate_bakery_search(bakery_search)
+    bakery_search_suggestions = bakery_search["suggestions"] if bakery_search else None
     if bakery_search_results_dicts:
         bakery_search_form.submit.label.text = "Refine"
         
@@ -142,6 +147,7 @@ def search(id_: int | None = None, reset: bool = False):
         bakery_search_form=bakery_search_form,
         bakery_search_results_dicts=bakery_search_results_dicts,
         bakery_search_errors=bakery_search_errors,
+        bakery_search_suggestions=bakery_search_suggestions,
         
         bakery_item_dict=bakery_item_dict,
     )
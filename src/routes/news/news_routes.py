@@ -17,13 +17,21 @@ from src.models.news_model.news_mod_utils import (
     add_new_comment,
     add_news_message,
     delete_comment_by_id,
+    count_news,
     delete_news_by_id,
-    get_all_news_dict,
-    get_all_unread_dict,
     get_comment_by_id,
     get_news_by_id,
-    get_news_dict_by_id,
+    get_news_fragments,
     get_news_id_by_comment_id,
+    get_news_page,
+    get_user_reactions,
+    mark_news_read,
+    set_comment_reaction,
+    set_news_reaction,
+)
+from src.models.news_model.news_mod import (
+    DISLIKE,
+    LIKE,
 )
 from src.models.auth_model.auth_mod_utils import admin_required
 
@@ -50,12 +58,14 @@ news_bp = Blueprint("news", __name__)
 @login_required
 def all():
     """Serves all news items with pagination."""
-    all_news_dict = get_all_news_dict()
+    all_news_dict, next_cursor = get_news_page(cursor=request.args.get("cursor"))
     flash_type = "all_news"
 
     return render_template(
         TEMPLATE.ALL_NEWS,
         all_news_dict=all_news_dict,
+        next_cursor=next_cursor,
+        news_count=count_news(),
         flash_type=flash_type,
     )
 
@@ -63,11 +73,15 @@ def all():
 @news_bp.route("/news/unread")
 @login_required
 def unread():
-    all_news_dict = get_all_unread_dict(current_user.id)
+    """Serves the news items the user has not seen with pagination."""
+    all_news_dict, next_cursor = get_news_page(cursor=request.args.get("cursor"),
+                                               unread_by=current_user.id)
     
     return render_template(
         TEMPLATE.ALL_NEWS,
         all_news_dict=all_news_dict,
+        next_cursor=next_cursor,
+        news_count=count_news(unread_by=current_user.id),
     )
 
 
@@ -83,9 +97,9 @@ def news(id_: int):
     if not news_item:
         description = f"News item with ID {id_} not found"
         raise Abort404(description=description)
-    news_item.set_seen_by(current_user.id)
+    mark_news_read(news_item.id, current_user.id)
 
-    news_dict = get_news_dict_by_id(id_)
+    news_reaction, comment_reactions = get_user_reactions(news_item.id, current_user.id)
     comment_form = CommentForm()
     comment_form_errors = session.pop("comment_form_errors", None)
     form_data = session.pop("form_data", None)
@@ -114,11 +128,19 @@ def news(id_: int):
     comment_id = session.pop("comment_id", None)      # for like/dislike bg hghlight
     flash_type = session.pop("flash_type", None)      # for flash messages location
     
+    fragments = get_news_fragments(news_item)
     return render_template(
         TEMPLATE.NEWS,
         comment_form=comment_form,
         comment_form_errors=comment_form_errors,
-        news_dict=news_dict,
+        news_dict=fragments["news"],
+        article=fragments["article"],
+        comment_fragments=fragments["comments"],
+        seen_count=news_item.seen_count,
+        news_liked=news_reaction == LIKE,
+        news_disliked=news_reaction == DISLIKE,
+        liked_comments={comment for comment, value in comment_reactions.items() if value == LIKE},
+        disliked_comments={comment for comment, value in comment_reactions.items() if value == DISLIKE},
         
         post_comment=post_comment,
         comment_id=comment_id,
@@ -135,7 +157,7 @@ def add():
     if request.method == "POST":
         if add_news_form.validate_on_submit():
             grid_cols = request.form.getlist("table_cols[]")
-            grid_rows = [row.replace("\n", "|") for row in request.form.getlist("table_rows[]")]
+            grid_rows = request.form.getlist("table_rows[]")
             info_cols = request.form.getlist("alinea_headers[]")
             info_rows = request.form.getlist("alinea_contents[]")
             add_news_message(add_news_form,
@@ -171,10 +193,12 @@ def delete(id_: int):
         flash(f"News ID {id_} deleted")
         return redirect(url_for(REDIRECT.DELETE_NEWS))
     
-    all_news_dict = get_all_news_dict()
+    all_news_dict, next_cursor = get_news_page(cursor=request.args.get("cursor"))
     return render_template(
         TEMPLATE.DELETE_NEWS,
         all_news_dict=all_news_dict,
+        next_cursor=next_cursor,
+        news_count=count_news(),
     )
 
 
@@ -186,7 +210,7 @@ def like_news(id_: int):
         description = f"News item with ID {id_} not found"
         raise Abort404(description=description)
         
-    news_item.set_liked_by(current_user.id)
+    set_news_reaction(news_item.id, current_user.id, LIKE)
     session["news_id"] = int(id_)
     return redirect(url_for(
         REDIRECT.NEWS,
@@ -203,7 +227,7 @@ def dislike_news(id_: int):
         description = f"News item with ID {id_} not found"
         raise Abort404(description=description)
         
-    news_item.set_disliked_by(current_user.id)
+    set_news_reaction(news_item.id, current_user.id, DISLIKE)
     session["news_id"] = int(id_)
     return redirect(url_for(
         REDIRECT.NEWS,
@@ -238,7 +262,7 @@ def like_comment(id_: int):
         description = f"Comment with ID {id_} not found"
         raise Abort404(description=description)
         
-    comment_item.set_liked_by(current_user.id)
+    set_comment_reaction(comment_item, current_user.id, LIKE)
     session["comment_id"] = int(id_)
     return redirect(url_for(
         REDIRECT.NEWS,
@@ -255,7 +279,7 @@ def dislike_comment(id_: int):
         description = f"Comment with ID {id_} not found"
         raise Abort404(description=description)
         
-    comment_item.set_disliked_by(current_user.id)
+    set_comment_reaction(comment_item, current_user.id, DISLIKE)
     session["comment_id"] = int(id_)
     return redirect(url_for(
         REDIRECT.NEWS,
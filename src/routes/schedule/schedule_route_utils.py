@@ -14,37 +14,74 @@ from src.routes.errors.error_routes import Abort400
 def get_personal_schedule_dicts() -> list[list[dict]]:
     """
     Returns the personal schedule for the latest 5 weeks.
+    Only the current employee's Shifts are read, days off get an empty dict.
     """
     from src.models.schedule_model.schedule_mod import Schedule
+    from src.models.schedule_model.schedule_mod_utils import (
+        get_employee_id_by_name,
+        get_employee_shifts,
+    )
     latest_schedules = (
         Schedule.query
         .order_by(Schedule.date.desc())
         .limit(5*7)
         .all()
     )
+    first_shifts = {}
+    employee_id = get_employee_id_by_name(current_user.employee_name)
+    if employee_id is not None and latest_schedules:
+        for shift in get_employee_shifts(employee_id, latest_schedules[-1].date):
+            first_shifts.setdefault(shift.date, shift)
+
     schedules = []
     for i in range(0, len(latest_schedules), 7):
         week = latest_schedules[i:i+7]
-        week_dicts = [schedule.to_personal_dict(current_user.employee_name) for schedule in week][::-1]
+        week_dicts = [
+            schedule.to_personal_dict(current_user.employee_name, first_shifts.get(schedule.date))
+            for schedule in week
+        ][::-1]
         schedules.append(week_dicts)
     
     return schedules
 
 
-def get_personal_hours_per_week(schedule: dict) -> int:
-    total_hours = []
-    for week in schedule:
-        week_hours = 0
-        for day in week:
-            total_quarters = 0
-            if day["end"]:
-                work_quarters = (int(day["end"]) - int(day["start"]))
-                break_quarters = int(day["break_time"].split(":")[0]) * 4
-                break_quarters += int(day["break_time"].split(":")[1]) / 15
-                total_quarters += work_quarters - break_quarters
-                week_hours += total_quarters / 4
-        total_hours.append(week_hours)
-    return total_hours
+def get_personal_hours_per_week(schedule: list[list[dict]]) -> list[float]:
+    """
+    Returns the paid hours of the current employee per week of the personal schedule.
+    All Shifts of a day are counted, summed in a single vectorized pass.
+    """
+    import numpy as np
+
+    from src.models.schedule_model.schedule_mod_utils import get_employee_id_by_name
+    from src.models.schedule_model.schedule_stats import (
+        ShiftArrays,
+        hours_in_ranges,
+    )
+    employee_id = get_employee_id_by_name(current_user.employee_name)
+    if employee_id is None or not schedule:
+        return [0] * len(schedule)
+
+    week_starts = np.array(
+        [datetime.strptime(week[0]["date"], "%d-%m-%Y").date() for week in schedule],
+        dtype="datetime64[D]",
+    )
+    shifts = ShiftArrays.load(start=week_starts.min().item(), employee_id=employee_id)
+    return [round(hours, 2) for hours in hours_in_ranges(shifts, week_starts).tolist()]
+
+
+def get_personal_hours_this_month() -> float:
+    """Returns the paid hours of the current employee in the current month."""
+    from src.models.schedule_model.schedule_mod_utils import get_employee_id_by_name
+    from src.models.schedule_model.schedule_stats import ShiftArrays
+
+    employee_id = get_employee_id_by_name(current_user.employee_name)
+    if employee_id is None:
+        return 0
+    today = datetime.now().date()
+    month_start = today.replace(day=1)
+    month_end = month_start.replace(day=calendar.monthrange(today.year, today.month)[1])
+    shifts = ShiftArrays.load(start=month_start, end=month_end, employee_id=employee_id)
+    return round(float(shifts.paid_hours().sum()), 2)
 
 
 def personal_dicts_to_calendar_dicts(personal_dicts: list[dict]) -> list[dict]:
@@ -19,6 +19,7 @@ from src.models.schedule_model.schedule_mod import Schedule
 from src.models.schedule_model.schedule_mod_utils import (
     activate_employee,
     get_calendar_on_duty_days,
+    get_week_coverage,
 )
 from src.models.auth_model.auth_mod_utils import (
     confirm_authentication_token,
@@ -32,6 +33,7 @@ from src.routes.schedule.schedule_route_utils import (
     get_calendar_week_numbers,
     get_next_month_days,
     get_personal_hours_per_week,
+    get_personal_hours_this_month,
     get_personal_schedule_dicts,
     get_prev_month_days,
     get_requested_date,
@@ -62,14 +64,15 @@ schedule_bp = Blueprint("schedule", __name__)
 def personal(date: str = None):
     requested_date = get_requested_date(date)
 
-    earliest_schedule, latest_schedule = get_schedule_bounds()
-    may_prev = earliest_schedule and requested_date > earliest_schedule.date
-    may_next = latest_schedule and requested_date < latest_schedule.date
+    earliest_date, latest_date = get_schedule_bounds()
+    may_prev = earliest_date and requested_date > earliest_date
+    may_next = latest_date and requested_date < latest_date
 
     requested_schedule = Schedule.query.filter_by(date=requested_date).one_or_none()
     requested_schedule_dict = requested_schedule.date_to_dict() if requested_schedule else {}
     personal_schedule_dicts = get_personal_schedule_dicts()
     personal_hours_per_week = get_personal_hours_per_week(personal_schedule_dicts)
+    personal_hours_this_month = get_personal_hours_this_month()
 
     current_week_num = _week_from_date(_now())
 
@@ -78,12 +81,33 @@ def personal(date: str = None):
         schedule=requested_schedule_dict,
         personal_schedule_dicts=personal_schedule_dicts,
         personal_hours_per_week=personal_hours_per_week,
+        personal_hours_this_month=personal_hours_this_month,
         current_week_num=current_week_num,
         may_prev=may_prev,
         may_next=may_next
         )
 
 
+@schedule_bp.route("/schedule/coverage", methods=["GET"])
+@schedule_bp.route("/schedule/coverage/<date>", methods=["GET"])
+@employee_required
+@login_required
+def coverage(date: str = None):
+    requested_date = get_requested_date(date)
+    week_start = requested_date - timedelta(days=requested_date.weekday())
+    week_coverage = get_week_coverage(week_start)
+    peak = max((max(day["coverage"], default=0) for day in week_coverage), default=0)
+
+    return render_template(
+        TEMPLATE.COVERAGE,
+        week_coverage=week_coverage,
+        week_number=week_start.isocalendar()[1],
+        prev_week=(week_start - timedelta(days=7)).strftime("%d-%m-%Y"),
+        next_week=(week_start + timedelta(days=7)).strftime("%d-%m-%Y"),
+        peak=peak,
+    )
+
+
 @schedule_bp.route("/schedule/calendar", methods=["GET", "POST"])
 @employee_required
 @login_required
@@ -0,0 +1,164 @@
+import atexit
+import threading
+import time
+
+from datetime import datetime
+from typing import Optional
+
+from flask import Flask
+
+from config.settings import SERVER
+
+
+class ActivityBuffer:
+    """
+    Per-worker write-behind buffer for low-value activity writes:
+     User.last_seen_at and NewsRead rows.
+
+    Requests only touch memory; the buffer is flushed in one bulk UPDATE
+     and one multi-row INSERT on its own connection, every FLUSH_INTERVAL
+     seconds or after MAX_ENTRIES entries, and when the worker exits.
+    Flushes run on the timer thread, a full buffer only wakes it up.
+    last_seen_at is only buffered again after LAST_SEEN_GRANULARITY seconds.
+
+    - LAST_SEEN (dict[int, datetime]): User id -> last seen, pending
+    - READS (dict[tuple[int, int], datetime]): (user id, news id) -> read at, pending
+    """
+    def __init__(self):
+        self.app: Optional[Flask] = None
+        self.flush_interval: float = 10
+        self.max_entries: int = 200
+        self.last_seen_granularity: float = 60
+
+        self._last_seen: dict[int, datetime] = {}
+        self._reads: dict[tuple[int, int], datetime] = {}
+        self._touched: dict[int, float] = {}
+        self._last_flush: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+    def init_app(self, app_: Flask) -> None:
+        """Reads the settings and starts the flush timer of this worker."""
+        self.app = app_
+        self.flush_interval = app_.config.get("ACTIVITY_FLUSH_INTERVAL", self.flush_interval)
+        self.max_entries = app_.config.get("ACTIVITY_MAX_ENTRIES", self.max_entries)
+        self.last_seen_granularity = app_.config.get("LAST_SEEN_GRANULARITY",
+                                                     self.last_seen_granularity)
+        atexit.register(self.flush)
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._run, name="activity-flush", daemon=True)
+            self._timer.start()
+
+    def touch_user(self, user_id: int) -> None:
+        """Buffers a last_seen_at update, at most once per LAST_SEEN_GRANULARITY."""
+        now = time.monotonic()
+        with self._lock:
+            touched = self._touched.get(user_id)
+            if touched is not None and now - touched < self.last_seen_granularity:
+                return
+            self._touched[user_id] = now
+            self._last_seen[user_id] = datetime.now(SERVER.CET)
+        self._maybe_flush()
+
+    def mark_read(self, user_id: int, news_id: int) -> None:
+        """Buffers a NewsRead, the first read_at wins."""
+        with self._lock:
+            self._reads.setdefault((user_id, news_id), datetime.now(SERVER.CET))
+        self._maybe_flush()
+
+    def pending_reads(self, user_id: int) -> set[int]:
+        """News ids read by the user in this worker and not flushed yet."""
+        with self._lock:
+            return {news_id for reader, news_id in self._reads if reader == user_id}
+
+    def flush(self) -> dict:
+        """
+        Writes the pending entries, returns {"last_seen": int, "reads": int}.
+        A failed flush is logged and its entries dropped.
+        """
+        from src.extensions import logger
+
+        with self._flush_lock:
+            with self._lock:
+                last_seen, self._last_seen = self._last_seen, {}
+                reads, self._reads = self._reads, {}
+                self._last_flush = time.monotonic()
+            if not last_seen and not reads:
+                return {"last_seen": 0, "reads": 0}
+            if self.app is None:
+                return {"last_seen": 0, "reads": 0}
+
+            try:
+                with self.app.app_context():
+                    _write_activity(last_seen, reads)
+            except Exception:
+                logger.exception(f"[SYS] ACTIVITY FLUSH FAILED: "
+                                 f"{len(last_seen)} last seen, {len(reads)} reads dropped")
+                return {"last_seen": 0, "reads": 0}
+            return {"last_seen": len(last_seen), "reads": len(reads)}
+
+    def _maybe_flush(self) -> None:
+        with self._lock:
+            full = len(self._last_seen) + len(self._reads) >= self.max_entries
+        if full:
+            # Keeps the UPDATE and INSERT off the request thread
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            woken = self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if woken or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def __len__(self) -> int:
+        return len(self._last_seen) + len(self._reads)
+
+
+def _write_activity(last_seen: dict[int, datetime],
+                    reads: dict[tuple[int, int], datetime]) -> None:
+    """One bulk UPDATE of auth.last_seen_at and one INSERT of news_reads, in one transaction."""
+    from sqlalchemy import (
+        bindparam,
+        select,
+        update,
+    )
+
+    from src.extensions import server_db_
+    from src.models.auth_model.auth_mod import User
+    from src.models.news_model.news_mod import News, NewsRead
+    from src.models.mod_utils import dialect_insert
+
+    auth_table = User.__table__
+    with server_db_.engine.begin() as connection:
+        if last_seen:
+            connection.execute(
+                update(auth_table)
+                .where(auth_table.c.id == bindparam("user_id"))
+                .values(last_seen_at=bindparam("seen_at")),
+                [{"user_id": user_id, "seen_at": seen_at} for user_id, seen_at in last_seen.items()],
+            )
+        if reads:
+            # News or users deleted since the read would fail the foreign keys
+            news_ids = set(connection.execute(
+                select(News.id).where(News.id.in_({news_id for _, news_id in reads}))
+            ).scalars())
+            user_ids = set(connection.execute(
+                select(User.id).where(User.id.in_({user_id for user_id, _ in reads}))
+            ).scalars())
+            rows = [
+                {"user_id": user_id, "news_id": news_id, "read_at": read_at}
+                for (user_id, news_id), read_at in reads.items()
+                if user_id in user_ids and news_id in news_ids
+            ]
+            if rows:
+                connection.execute(
+                    dialect_insert(NewsRead)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=["user_id", "news_id"])
+                )
+
+
+activity_buffer_ = ActivityBuffer()
@@ -1,30 +1,67 @@
+import copy
 import json
 import os
+import threading
 
-from cryptography.fernet import Fernet
+from functools import lru_cache
+from typing import (
+    Any,
+    Iterable,
+)
+
+from cryptography.fernet import (
+    Fernet,
+    MultiFernet,
+)
 
 
 def get_key() -> bytes:
-    """Load the encryption key from an environment variable."""
+    """Load the primary encryption key from an environment variable."""
+    return get_keys()[0]
+
+
+def get_keys() -> list[bytes]:
+    """
+    Load the encryption keys from an environment variable.
+    ENCRYPTION_KEY may hold several comma separated keys, newest first, to rotate keys:
+     data is encrypted with the first key and decrypted with any of them.
+    """
     key = os.environ.get("ENCRYPTION_KEY")
     if key is None:
         raise ValueError("Encryption key not found in environment variables.")
-    return key.encode()  # Ensure it's in bytes
+    return _split_keys(key)
+
+
+def _split_keys(keys: str) -> list[bytes]:
+    return [key.strip().encode() for key in keys.split(",") if key.strip()]  # Ensure it's in bytes
+
+
+@lru_cache(maxsize=1)
+def _cipher_from_keys(keys: str) -> Fernet | MultiFernet:
+    fernets = [Fernet(key) for key in _split_keys(keys)]
+    return fernets[0] if len(fernets) == 1 else MultiFernet(fernets)
+
+
+def get_cipher() -> Fernet | MultiFernet:
+    """
+    The cipher for the current ENCRYPTION_KEY, built once per process and
+     rebuilt only when the environment variable changes.
+    """
+    keys = os.environ.get("ENCRYPTION_KEY")
+    if keys is None:
+        raise ValueError("Encryption key not found in environment variables.")
+    return _cipher_from_keys(keys)
 
 
 def encrypt_data(data: bytes) -> bytes:
     """Encrypt the given data using the key from environment variables."""
-    key = get_key()
-    cipher = Fernet(key)
-    encrypted_data = cipher.encrypt(data)
-    return encrypted_data
+    return get_cipher().encrypt(data)
 
 
 def decrypt_data(encrypted_data: bytes) -> bytes:
-    """Decrypt the given data using the key from environment variables."""
+    """Decrypt the given data using the keys from environment variables."""
     from src.extensions import logger
-    key = get_key()
-    cipher = Fernet(key)
+    cipher = get_cipher()
     try:
         decrypted_data = cipher.decrypt(encrypted_data)
     except Exception:
@@ -33,6 +70,89 @@ def decrypt_data(encrypted_data: bytes) -> bytes:
     return decrypted_data
 
 
+def encrypt_many(items: Iterable[bytes]) -> list[bytes]:
+    """Encrypts every item with the same cipher."""
+    cipher = get_cipher()
+    return [cipher.encrypt(data) for data in items]
+
+
+def decrypt_many(items: Iterable[bytes]) -> list[bytes]:
+    """Decrypts every item with the same cipher, raises like decrypt_data on the first bad token."""
+    from src.extensions import logger
+    cipher = get_cipher()
+    try:
+        return [cipher.decrypt(encrypted_data) for encrypted_data in items]
+    except Exception:
+        logger.exception(f"Error decrypting data")
+        raise Exception("Error decrypting data")
+
+
+def rotate_data(encrypted_data: bytes) -> bytes:
+    """Re-encrypts data made with any of the keys with the primary key."""
+    cipher = get_cipher()
+    if isinstance(cipher, MultiFernet):
+        return cipher.rotate(encrypted_data)
+    return cipher.encrypt(cipher.decrypt(encrypted_data))
+
+
+class EncryptedJsonCache:
+    """
+    Decrypted JSON documents in memory, keyed on file path and checked against
+     the file's mtime and size, so unchanged files skip both reading and decryption.
+    Documents are deep copied on the way in and out, callers may modify them.
+
+    - DOCUMENTS (dict): path -> ((mtime_ns, size), document)
+    """
+    def __init__(self):
+        self.documents: dict[str, tuple[tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version(path: str) -> tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self, path: str) -> Any:
+        """The decrypted document, raises FileNotFoundError or json.JSONDecodeError like a plain read."""
+        version = self._version(path)
+        with self._lock:
+            cached = self.documents.get(path)
+        if cached is not None and cached[0] == version:
+            return copy.deepcopy(cached[1])
+
+        with open(path, "rb") as json_file:
+            document = json.loads(decrypt_data(json_file.read()).decode())
+        with self._lock:
+            self.documents[path] = (version, document)
+        return copy.deepcopy(document)
+
+    def write(self, path: str, document: Any) -> None:
+        """
+        Encrypts the document to a temporary file and renames it over the old one,
+         so readers never see a half written file, and keeps it cached under the new mtime.
+        """
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as json_file:
+                json_file.write(encrypt_data(json.dumps(document).encode()))
+                json_file.flush()
+                os.fsync(json_file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        with self._lock:
+            self.documents[path] = (self._version(path), copy.deepcopy(document))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.documents.clear()
+
+
+encrypted_json_cache_ = EncryptedJsonCache()
+
+
 def encrypt_json_file(file_path: str) -> None:
     """Encrypts the JSON data in the specified file."""
     # Load the encryption key from environment variables
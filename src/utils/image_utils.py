@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from markupsafe import (
+    Markup,
+    escape,
+)
+from PIL import Image
+
+from config.settings import (
+    DIR,
+    PATH,
+)
+
+
+# Derivative widths in px, capped at the source width (sources are 200x200)
+IMAGE_WIDTHS: tuple[int, ...] = (100, 150, 200)
+IMAGE_QUALITY: dict[str, int] = {
+    "avif": 55,
+    "webp": 80,
+}
+# Matches the .image-grid columns in bakery_base.css
+GRID_SIZES: str = "(max-width: 474.98px) 150px, 180px"
+
+_manifest: dict = {}
+_manifest_mtime: Optional[float] = None
+_manifest_lock = threading.Lock()
+
+
+def get_image_formats() -> list[str]:
+    """Returns the derivative formats this Pillow build can encode, best first."""
+    try:
+        import pillow_avif  # noqa: F401 - registers the AVIF plugin on older Pillow
+    except ImportError:
+        pass
+    Image.init()
+    return [format_ for format_ in ("avif", "webp") if format_.upper() in Image.SAVE]
+
+
+def hash_file(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _static_path(path: str) -> str:
+    """Path relative to the static folder, as stored in BakeryItem.image."""
+    return os.path.relpath(path, DIR.STATIC).replace(os.sep, "/")
+
+
+def _derivative_path(source: str, width: int, format_: str) -> str:
+    relative = os.path.relpath(source, DIR.BAKERY)
+    stem = os.path.splitext(relative)[0]
+    return os.path.join(DIR.BAKERY_DERIVED, f"{stem}-{width}.{format_}")
+
+
+def _build_derivatives(job: tuple[str, str, list[str]]) -> dict:
+    """
+    Process pool worker: renders every width and format of a single source.
+    Returns its manifest entry.
+    """
+    source, source_hash, formats = job
+    variants: dict[str, dict[str, str]] = {format_: {} for format_ in formats}
+    with Image.open(source) as image:
+        image.load()
+        source_width, source_height = image.size
+        widths = sorted({min(width, source_width) for width in IMAGE_WIDTHS})
+        for width in widths:
+            height = round(source_height * width / source_width)
+            resized = image if width == source_width else image.resize((width, height), Image.LANCZOS)
+            for format_ in formats:
+                path = _derivative_path(source, width, format_)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                resized.save(path, format_.upper(), quality=IMAGE_QUALITY[format_])
+                variants[format_][str(width)] = _static_path(path)
+    return {
+        "hash": source_hash,
+        "width": source_width,
+        "height": source_height,
+        "variants": variants,
+    }
+
+
+def _find_sources() -> list[str]:
+    sources = []
+    for folder, _, files in os.walk(DIR.BAKERY):
+        for file in files:
+            if file.lower().endswith(".png"):
+                sources.append(os.path.join(folder, file))
+    return sorted(sources)
+
+
+def _read_manifest() -> dict:
+    try:
+        with open(PATH.BAKERY_IMAGE_MANIFEST, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"formats": [], "images": {}}
+
+
+def _write_manifest(manifest: dict) -> None:
+    """Writes to a temporary file first so workers never read half a manifest."""
+    os.makedirs(os.path.dirname(PATH.BAKERY_IMAGE_MANIFEST), exist_ok=True)
+    temp_path = f"{PATH.BAKERY_IMAGE_MANIFEST}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(temp_path, PATH.BAKERY_IMAGE_MANIFEST)
+
+
+def _is_current(entry: Optional[dict], source_hash: str, formats: list[str]) -> bool:
+    if not entry or entry.get("hash") != source_hash:
+        return False
+    variants = entry.get("variants", {})
+    return all(
+        format_ in variants and all(
+            os.path.exists(os.path.join(DIR.STATIC, path))
+            for path in variants[format_].values()
+        )
+        for format_ in formats
+    )
+
+
+def get_stale_images(manifest: Optional[dict] = None) -> list[str]:
+    """Returns the sources whose derivatives are missing or built from an older version."""
+    manifest = manifest or _read_manifest()
+    formats = get_image_formats()
+    stale = []
+    for source in _find_sources():
+        entry = manifest["images"].get(_static_path(source))
+        if not _is_current(entry, hash_file(source), formats):
+            stale.append(source)
+    return stale
+
+
+def build_bakery_images(force: bool = False, workers: Optional[int] = None) -> dict:
+    """
+    Renders WebP (and AVIF where Pillow supports it) derivatives of every
+     bakery image in IMAGE_WIDTHS, in parallel, and writes the manifest.
+    Sources with an unchanged hash and existing derivatives are skipped.
+    Returns {"built": int, "skipped": int, "removed": int, "formats": list}.
+    """
+    formats = get_image_formats()
+    old_manifest = _read_manifest()
+    if old_manifest.get("formats") != formats:
+        force = True
+
+    images: dict[str, dict] = {}
+    jobs: list[tuple[str, str, list[str]]] = []
+    for source in _find_sources():
+        key = _static_path(source)
+        source_hash = hash_file(source)
+        entry = old_manifest["images"].get(key)
+        if not force and _is_current(entry, source_hash, formats):
+            images[key] = entry
+        else:
+            jobs.append((source, source_hash, formats))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for (source, _, _), entry in zip(jobs, executor.map(_build_derivatives, jobs, chunksize=8)):
+                images[_static_path(source)] = entry
+
+    removed = [key for key in old_manifest["images"] if key not in images]
+    for key in removed:
+        for paths in old_manifest["images"][key].get("variants", {}).values():
+            for path in paths.values():
+                full_path = os.path.join(DIR.STATIC, path)
+                if os.path.exists(full_path):
+                    os.remove(full_path)
+
+    _write_manifest({"formats": formats, "images": images})
+    return {
+        "built": len(jobs),
+        "skipped": len(images) - len(jobs),
+        "removed": len(removed),
+        "formats": formats,
+    }
+
+
+def check_bakery_images() -> None:
+    """
+    Startup check: logs the bakery images with stale derivatives, nothing is built.
+    Stale images are served as the original PNGs until 'flask bakery build-images' runs.
+    """
+    from src.extensions import logger
+
+    stale = get_stale_images()
+    if not stale:
+        logger.info("[SYS] BAKERY IMAGES: derivatives up to date")
+        return
+    logger.warning(f"[SYS] BAKERY IMAGES: {len(stale)} stale, serving originals. "
+                   f"Run 'flask bakery build-images' to build the derivatives")
+
+
+def load_image_manifest() -> dict:
+    """Returns the derivative manifest, re-read when the file changes."""
+    global _manifest, _manifest_mtime
+    try:
+        mtime = os.stat(PATH.BAKERY_IMAGE_MANIFEST).st_mtime
+    except FileNotFoundError:
+        return {}
+    if mtime != _manifest_mtime:
+        with _manifest_lock:
+            if mtime != _manifest_mtime:
+                _manifest = _read_manifest().get("images", {})
+                _manifest_mtime = mtime
+    return _manifest
+
+
+def image_srcset(image: str, format_: str) -> Optional[str]:
+    """Returns the srcset of an image's derivatives in a format, or None if not built."""
+    from flask import url_for
+
+    entry = load_image_manifest().get(image)
+    if not entry or format_ not in entry["variants"]:
+        return None
+    return ", ".join(
+        f"{url_for('static', filename=path)} {width}w"
+        for width, path in sorted(entry["variants"][format_].items(), key=lambda item: int(item[0]))
+    )
+
+
+def bakery_picture(image: Optional[str], alt: str = "", class_: str = "",
+                   sizes: str = GRID_SIZES) -> Markup:
+    """
+    Jinja helper: renders a <picture> with AVIF/WebP srcsets for a BakeryItem.image,
+     falling back to the original PNG when no derivatives are built.
+    """
+    from flask import url_for
+
+    if not image:
+        return Markup("")
+    entry = load_image_manifest().get(image, {})
+    sources = []
+    for format_ in entry.get("variants", {}):
+        srcset = image_srcset(image, format_)
+        if srcset:
+            sources.append(
+                f'<source type="image/{format_}" srcset="{escape(srcset)}" sizes="{escape(sizes)}">'
+            )
+    size_attrs = ""
+    if entry:
+        size_attrs = f' width="{entry["width"]}" height="{entry["height"]}"'
+    img = (
+        f'<img class="{escape(class_)}" src="{escape(url_for("static", filename=image))}"'
+        f' alt="{escape(alt)}"{size_attrs} loading="lazy" decoding="async">'
+    )
+    return Markup(f"<picture>{''.join(sources)}{img}</picture>")
@@ -1,5 +1,4 @@
 import calendar
-import json
 import os
 import time
 
@@ -20,79 +19,92 @@ from selenium.webdriver.support.ui import WebDriverWait
 from src.extensions import server_db_, logger
 
 from src.utils.misc_utils import crop_name
-from src.utils.selenium_utils import (
-    get_undetectable_driver, movement
+from src.utils.schedule_archive import schedule_archive_
+from src.utils.scraper_utils import (
+    ScheduleSite,
+    ScrapeStats,
+    get_scraper_backend,
+    scrape_dates,
 )
+from src.utils.selenium_utils import movement
 
-from config.settings import DIR, PATH, Environ
-from src.utils.encryption_utils import encrypt_data, decrypt_data
+from config.settings import DIR, PATH, SERVER, Environ
+from src.utils.encryption_utils import encrypted_json_cache_
 
 
-def update_schedule(week_number: int | None = None) -> None:
+def update_schedule(week_number: int | None = None) -> ScrapeStats:
     """
     If week_number is not provided the schedule 2 weeks from now is collected.
     Data is saved to the database and json file.
     New employees are added to the database and json file.
     """
-    driver = get_undetectable_driver()
-    log_in(driver)
-    movement(driver)
-    
-    if week_number is None:
-        dates = get_new_schedule_dates()
-        logger.info(f"[ADD] Getting new schedules for week: {_week_from_date(dates[0])}")
-    else:
-        dates = get_new_schedule_dates_by_week(week_number)
-        logger.info(f"[ADD] Getting new schedules for week: {week_number}")
-
-    names_list = []
-    hours_list = []
-    break_times_list = []
-    work_times_list = []
-    date = dates[-1]
-
-    for date in dates:
-        names, hours, break_times, work_times = get_schedule_info_per_date(driver, date)
-        clean_names = [unidecode(name) for name in names]
-        names = [crop_name(name) for name in clean_names]
-        
-        names_list.append([name for name in names])
-        hours_list.append([hour for hour in hours])
-        break_times_list.append([break_time for break_time in break_times])
-        work_times_list.append([work_time for work_time in work_times])
-        
-        
-        save_schedule_to_db(date, names, hours, break_times, work_times)
+    return update_schedules([week_number])
 
-    save_schedule_to_json(date, names_list, hours_list, break_times_list, work_times_list)
 
-    driver.quit()
-    
-    unique_names = set(name for sublist in names_list for name in sublist)
-    check_for_new_employees(unique_names)
-
-    from src.models.schedule_model.schedule_mod_utils import get_schedule_bounds
-    from src.extensions import cache_
-    cache_.delete("get_schedule_bounds")
-
-
-def log_in(driver: webdriver.Firefox) -> None:
+def update_schedules(week_numbers: list[int | None], pool_size: int = SERVER.SCRAPER_POOL_SIZE,
+                     backend: str = SERVER.SCRAPER_BACKEND) -> ScrapeStats:
+    """
+    Collects the schedules of all weeks at once, the dates are scraped
+     concurrently through a pool of pool_size sessions sharing one login.
+    A week with a date that failed every retry is not saved, so it can be
+     added again later.
+    Returns the timings of the scrape, raises LoginFailed when PMT rejects the login.
+    """
+    weeks = {}
+    for week_number in week_numbers:
+        if week_number is None:
+            dates = get_new_schedule_dates()
+        else:
+            dates = get_new_schedule_dates_by_week(week_number)
+        weeks[_week_from_date(dates[0])] = dates
+    logger.info(f"[ADD] Getting new schedules for weeks: {', '.join(map(str, weeks))}")
+
+    all_dates = [date for dates in weeks.values() for date in dates]
+    day_schedules, stats = scrape_dates(all_dates, ScheduleSite.from_app(current_app), pool_size,
+                                        backend=get_scraper_backend(backend))
+
+    for week_number, dates in weeks.items():
+        if any(date not in day_schedules for date in dates):
+            logger.error(f"[ADD] Schedule for week {week_number} incomplete, not saved")
+            continue
+
+        names_list = []
+        hours_list = []
+        break_times_list = []
+        work_times_list = []
+        for date in dates:
+            names, hours, break_times, work_times = day_schedules[date]
+            names_list.append([crop_name(unidecode(name)) for name in names])
+            hours_list.append(hours)
+            break_times_list.append(break_times)
+            work_times_list.append(work_times)
+
+        save_schedule_week_to_db(dates, names_list, hours_list, break_times_list, work_times_list)
+        save_schedule_to_json(dates[-1], names_list, hours_list, break_times_list, work_times_list)
+
+    return stats
+
+
+def log_in(driver: webdriver.Firefox, site: ScheduleSite | None = None) -> None:
     """ Logs in to PMT. """
-    driver.get(current_app.ENV.S_LOGIN_URL.get_secret_value())
-    movement(driver)
+    site = site or ScheduleSite.from_app(current_app)
+    driver.get(site.login_url)
+    if site.humanize:
+        movement(driver)
     
     username_input = driver.find_element(By.ID, "loginUsername")
-    username_input.send_keys(current_app.ENV.S_USERNAME.get_secret_value())
+    username_input.send_keys(site.username)
     password_input = driver.find_element(By.ID, "loginPassword")
-    password_input.send_keys(current_app.ENV.S_PASSWORD.get_secret_value())
+    password_input.send_keys(site.password)
     
-    movement(driver)
+    if site.humanize:
+        movement(driver)
     login_btn = WebDriverWait(driver, 10).until(
         EC.element_to_be_clickable((By.ID, "login-button"))
     )
     driver.execute_script("arguments[0].click();", login_btn)
     logger.info("[ADD] Logged in to PMT")
-    time.sleep(2)
+    time.sleep(2 if site.humanize else 0.2)
 
 
 def get_new_schedule_dates() -> list[str]:
@@ -124,16 +136,19 @@ def get_new_schedule_dates_by_week(week_number: int) -> list[str]:
     return week_dates
 
 
-def get_schedule_info_per_date(driver: webdriver.Firefox,
-                                date: str) -> tuple[list[str], list[str], list[str], list[str]]:
+def get_schedule_info_per_date(driver: webdriver.Firefox, date: str,
+                               site: ScheduleSite | None = None
+                               ) -> tuple[list[str], list[str], list[str], list[str]]:
     """
     Returns a tuple of lists of names, hours, break times and work times for a given date.
     Date format: 'dd-mm-yyyy'
     """
-    url = f"{current_app.ENV.S_SCHEDULE_URL.get_secret_value()}{date}"
+    site = site or ScheduleSite.from_app(current_app)
+    url = f"{site.schedule_url}{date}"
     driver.get(url)
     logger.info(f"Navigated to: '{url}'")
-    movement(driver)
+    if site.humanize:
+        movement(driver)
     
     rows = driver.find_elements(By.CLASS_NAME, "employee-row")
     names = []
@@ -146,7 +161,7 @@ def get_schedule_info_per_date(driver: webdriver.Firefox,
         names.append(name_element.text)
         
         hour_elements = row.find_elements(By.CLASS_NAME, "shift-block-content")
-        hours.append(hour_elements[0].text.split("|")[0])
+        hours.append(hour_elements[0].text.split("|")[0].strip())
         
         break_time_element = row.find_element(By.CLASS_NAME, "break")
         break_times.append(break_time_element.text)
@@ -165,33 +180,44 @@ def get_schedule_info_per_date(driver: webdriver.Firefox,
 def save_schedule_to_db(date: str, names: list[str], hours: list[str],
                         break_times: list[str], work_times: list[str]) -> None:
     """
-    Saves schedule data per date to the database.
+    Saves schedule data per date to the database, replacing the stored day.
     """
-    from src.models.schedule_model.schedule_mod import Schedule
-    week_number = _week_from_date(date)
-    day = _day_from_date(date)
-    date_obj = datetime.strptime(date, "%d-%m-%Y").date()
-    schedule_item = Schedule(date=date_obj,
-                            week_number=week_number,
-                            day=day,
-                            names=names,
-                            hours=hours,
-                            break_times=break_times,
-                            work_times=work_times)
-    server_db_.session.add(schedule_item)
-    server_db_.session.commit()
-    logger.info(f"[ADD] Saved schedule to db for date: {date}")
+    save_schedule_week_to_db([date], [names], [hours], [break_times], [work_times])
+
+
+def save_schedule_week_to_db(dates: list[str], names: list[list[str]], hours: list[list[str]],
+                             break_times: list[list[str]], work_times: list[list[str]]) -> None:
+    """
+    Saves the schedule of several dates, typically a week, in one transaction.
+    Dates already in the database are replaced.
+    """
+    from src.models.schedule_model.schedule_mod_utils import upsert_schedule_days
+    days = [
+        {
+            "date": datetime.strptime(date, "%d-%m-%Y").date(),
+            "week_number": _week_from_date(date),
+            "day": _day_from_date(date),
+            "names": day_names,
+            "hours": day_hours,
+            "break_times": day_break_times,
+            "work_times": day_work_times,
+        }
+        for date, day_names, day_hours, day_break_times, day_work_times
+        in zip(dates, names, hours, break_times, work_times)
+    ]
+    shift_count = upsert_schedule_days(days)
+    logger.info(f"[ADD] Saved schedule to db for dates: {dates[0]} - {dates[-1]}, {shift_count} shifts")
 
 
 def save_schedule_to_json(date: str, names: list[str], hours: list[str],
                           break_times: list[str], work_times: list[str]) -> None:
     """
-    Saves schedule data to an encrypted JSON file, grouped by week number.
-    
-    If the file already exists, it merges the new data with the existing data.
+    Saves a week of schedule data to its own encrypted file in the schedule archive.
+    Other weeks are not read or rewritten.
     """
     week_number = _week_from_date(date)
-    schedule_path = _schedule_path_from_date(date)
+    year = datetime.strptime(date, "%d-%m-%Y").date().isocalendar()[0]
+    schedule_path = schedule_archive_.path(year, week_number)
 
     # Prepare the new schedule data
     week_data = {}
@@ -204,33 +230,12 @@ def save_schedule_to_json(date: str, names: list[str], hours: list[str],
             "break_times": break_time_list,
             "work_times": work_time_list
         }
-
-    data_to_save = {
-        str(week_number): week_data
-    }
+    week_start = datetime.strptime(date, "%d-%m-%Y") - timedelta(days=days.index(_day_from_date(date)))
+    week_dates = {day: (week_start + timedelta(days=i)).strftime("%d-%m-%Y")
+                  for i, day in enumerate(days) if day in week_data}
 
     try:
-        # Check if the schedule file already exists
-        if os.path.exists(schedule_path):
-            try:
-                # Read and decrypt existing data
-                with open(schedule_path, "rb") as json_file:  # Open in binary mode
-                    existing_encrypted_data = json_file.read()
-                    existing_data = decrypt_data(existing_encrypted_data.decode())
-                    existing_data = json.loads(existing_data)
-            except (json.JSONDecodeError, ValueError):
-                existing_data = {}
-
-            # Merge existing data with new data
-            existing_data.update(data_to_save)
-            data_to_save = existing_data
-
-        # Encrypt the data before saving
-        encrypted_data = encrypt_data(json.dumps(data_to_save).encode())
-
-        # Save the encrypted data to the JSON file
-        with open(schedule_path, "wb") as json_file:  # Open in binary mode
-            json_file.write(encrypted_data)
+        schedule_archive_.write_week(year, week_number, week_data, week_dates)
         logger.info(f"[ADD] Saved encrypted schedule to json for week: {week_number}")
 
     except PermissionError:
@@ -241,36 +246,24 @@ def save_schedule_to_json(date: str, names: list[str], hours: list[str],
         return
 
 
-def check_for_new_employees(names: list[str]) -> None:
-    """
-    Checks for new employees in the schedule and adds them to the DB and JSON.
-    """
-    if not names:
-        return
-
-    from src.models.schedule_model.schedule_mod import Employees
-    for name in names:
-        if not Employees.query.filter_by(name=name).first():
-            Employees.add_employee(name)
-            add_employee_json(name)
-
-
 def add_employee_json(name: str, email: str = None, is_verified: bool = None) -> None:
     """Adds a new Employee to the employees JSON file."""
-    with open(PATH.EMPLOYEES, "rb") as json_file:
-        encrypted_data = json_file.read()
-        employees_data = json.loads(decrypt_data(encrypted_data).decode())
+    add_employees_json([name], email, is_verified)
+
+
+def add_employees_json(names: list[str], email: str = None, is_verified: bool = None) -> None:
+    """Adds new Employees to the employees JSON file, reading and writing it once."""
+    employees_data = encrypted_json_cache_.read(PATH.EMPLOYEES)
 
     email = email if email is not None else ""
     is_verified = is_verified if is_verified is not None else False
-    employees_data[name] = {"email": email, "is_verified": is_verified}
+    for name in names:
+        employees_data[name] = {"email": email, "is_verified": is_verified}
 
     sorted_employees_data = dict(sorted(employees_data.items()))
     try:
-        # Encrypt the data before saving
-        encrypted_data = encrypt_data(json.dumps(sorted_employees_data).encode())
-        with open(PATH.EMPLOYEES, "wb") as json_file:
-            json_file.write(encrypted_data)
+        # Encrypted on write, the cache keeps the decrypted copy
+        encrypted_json_cache_.write(PATH.EMPLOYEES, sorted_employees_data)
     except PermissionError:
         logger.exception(f"[SYS] PERMISSION DENIED when accessing: {PATH.EMPLOYEES}")
         return
@@ -301,27 +294,10 @@ def _week_from_date(date_str: str) -> int:
     return date_obj.isocalendar()[1]
 
 
-def _schedule_path_from_date(date: str) -> str:
-    """
-    Returns the path to the schedule's JSON file for the given date.
-    """
-    if _week_from_date(date) == 1:
-        year = date[-4:]
-        path = f"schedule{year}.json"
-        return os.path.join(DIR.SCHEDULE, path)
-    
-    files = os.listdir(DIR.SCHEDULE)
-    schedule_files = [int(file.split(".")[0][-4:]) for file in files if file.startswith("schedule") and file.endswith(".json")]
-    latest_year = max(schedule_files)
-    return os.path.join(DIR.SCHEDULE, f"schedule{latest_year}.json")
-
-
 def update_employee_json(name: str, email: str | None = None,
                          is_verified: bool | None = None) -> None:
     """Updates the Employee in the Employees JSON file."""
-    with open(PATH.EMPLOYEES, "rb") as json_file:
-        encrypted_data = json_file.read()
-        employees_data = json.loads(decrypt_data(encrypted_data).decode())
+    employees_data = encrypted_json_cache_.read(PATH.EMPLOYEES)
 
     if name in employees_data:
         if email is not None:
@@ -330,10 +306,8 @@ def update_employee_json(name: str, email: str | None = None,
             employees_data[name]["is_verified"] = is_verified
 
     try:
-        # Encrypt the data before saving
-        encrypted_data = encrypt_data(json.dumps(employees_data).encode())
-        with open(PATH.EMPLOYEES, "wb") as json_file:
-            json_file.write(encrypted_data)
+        # Encrypted on write, the cache keeps the decrypted copy
+        encrypted_json_cache_.write(PATH.EMPLOYEES, employees_data)
     except PermissionError:
         logger.exception(f"[SYS] PERMISSION DENIED when accessing: {PATH.EMPLOYEES}")
         return
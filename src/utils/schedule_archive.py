@@ -0,0 +1,145 @@
+import json
+import os
+import re
+import threading
+
+from datetime import (
+    date as date_,
+    datetime,
+)
+from typing import (
+    Iterator,
+    Optional,
+)
+
+from src.utils.encryption_utils import (
+    decrypt_data,
+    encrypt_data,
+)
+
+from config.settings import DIR
+
+
+class ScheduleArchive:
+    """
+    Encrypted schedule archive with one file per week, 'week-<year>-<week>.enc'.
+
+    A week is written to a temporary file and renamed over the old one, so a
+     crash never leaves a half written week, and is read without decrypting
+     any other week.
+    Every file holds {"year": int, "week": str, "days": {day: {names, hours,
+     break_times, work_times}}, "dates": {day: 'dd-mm-yyyy'}}.
+    "days" is the week exactly as stored in the former scheduleYYYY.json files,
+     "dates" is empty for weeks imported from them.
+
+    - FOLDER (str): Directory of the week files
+    """
+    _WEEK_FILE = re.compile(r"^week-(\d{4})-(\d+)\.enc$")
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._weeks: Optional[set[tuple[int, int]]] = None
+        self._lock = threading.Lock()
+
+    def path(self, year: int, week: int | str) -> str:
+        return os.path.join(self.folder, f"week-{year}-{int(week):02d}.enc")
+
+    def weeks(self) -> list[tuple[int, int]]:
+        """(year, week) of every stored week in order, the folder is only listed once."""
+        if self._weeks is None:
+            weeks = set()
+            if os.path.isdir(self.folder):
+                for file in os.listdir(self.folder):
+                    match = self._WEEK_FILE.match(file)
+                    if match:
+                        weeks.add((int(match.group(1)), int(match.group(2))))
+            with self._lock:
+                self._weeks = weeks
+        return sorted(self._weeks)
+
+    def write_week(self, year: int, week: int | str, days: dict,
+                   dates: Optional[dict[str, str]] = None) -> str:
+        """Encrypts and atomically (re)places a single week, returns its path."""
+        os.makedirs(self.folder, exist_ok=True)
+        record = {"year": int(year), "week": str(week), "days": days, "dates": dates or {}}
+        path = self.path(year, week)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(encrypt_data(json.dumps(record).encode()))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+        self.weeks()
+        with self._lock:
+            self._weeks.add((int(year), int(week)))
+        return path
+
+    def read_week(self, year: int, week: int | str) -> Optional[dict]:
+        """The week's record, or None if it is not archived."""
+        try:
+            with open(self.path(year, week), "rb") as file:
+                return json.loads(decrypt_data(file.read()).decode())
+        except FileNotFoundError:
+            return None
+
+    def iter_weeks(self) -> Iterator[dict]:
+        """Yields the records in (year, week) order, one decrypted week in memory at a time."""
+        for year, week in self.weeks():
+            record = self.read_week(year, week)
+            if record is not None:
+                yield record
+
+    def export_year(self, year: int) -> dict:
+        """The weeks of a year in the scheduleYYYY.json layout, {week: days}."""
+        return {
+            record["week"]: record["days"]
+            for week_year, week in self.weeks() if week_year == year
+            for record in [self.read_week(week_year, week)] if record is not None
+        }
+
+    def import_year_file(self, path: str) -> int:
+        """
+        Splits a scheduleYYYY.json file into week files and checks that
+         exporting the year gives the same data back.
+        Returns the number of weeks imported.
+        """
+        year = int(os.path.basename(path).split("schedule")[1].split(".json")[0])
+        with open(path, "rb") as file:
+            schedule_data = json.loads(decrypt_data(file.read()).decode())
+
+        newer = set()
+        for week, days in schedule_data.items():
+            existing = self.read_week(year, week)
+            # Weeks scraped since the switch to the archive are kept
+            if existing is not None and existing["dates"]:
+                newer.add(week)
+                continue
+            self.write_week(year, week, days)
+
+        exported = self.export_year(year)
+        lost = [week for week, days in schedule_data.items()
+                if week not in newer and exported.get(week) != days]
+        if lost:
+            raise ValueError(f"Import of {path} lost weeks: {', '.join(lost)}")
+        return len(schedule_data)
+
+
+schedule_archive_ = ScheduleArchive(DIR.SCHEDULE_WEEKS)
+
+
+def week_record_days(record: dict) -> Iterator[tuple[date_, str, dict]]:
+    """
+    Yields (date, day, day data) per day of an archived week.
+    Weeks imported from the year files have no stored dates, those are computed
+     from the year and week number as _init_schedule always did.
+    """
+    from src.utils.schedule import _date_from_week_day_year
+
+    for day, day_data in record["days"].items():
+        stored = record["dates"].get(day)
+        if stored:
+            date = datetime.strptime(stored, "%d-%m-%Y").date()
+        else:
+            date = _date_from_week_day_year(int(record["week"]), day, record["year"]).date()
+        yield date, day, day_data
@@ -0,0 +1,208 @@
+import random
+import threading
+import time
+
+from datetime import datetime
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from html import escape
+from typing import Optional
+from urllib.parse import parse_qs
+
+from src.utils.scraper_utils import (
+    DaySchedule,
+    ScheduleSite,
+)
+
+
+FIXTURE_NAMES: tuple[str, ...] = (
+    "Anna de Vries", "Bram Jansen", "Chloe Bakker", "Daan Visser", "Emma Smit",
+    "Finn Meijer", "Gijs de Boer", "Hanna Mulder", "Isa de Groot", "Joris Bos",
+    "Kim Vos", "Lars Peters", "Mila Hendriks", "Noah van Dijk", "Olga Dekker",
+)
+SESSION_COOKIE: str = "pmt_session"
+
+LOGIN_PAGE: str = """<!DOCTYPE html>
+<html><body>
+<form method="post" action="/login">
+    <input id="loginUsername" name="username">
+    <input id="loginPassword" name="password" type="password">
+    <button id="login-button" type="submit">Login</button>
+</form>
+</body></html>"""
+
+
+def _fixture_rows(date: str) -> list[tuple[str, list[str], str, str]]:
+    """(name, shift blocks, break time, worked time) per employee-row, seeded by the date."""
+    rng = random.Random(date)
+    rows = []
+    for name in sorted(rng.sample(FIXTURE_NAMES, rng.randint(3, 8))):
+        start = rng.randint(0, 28)
+        end = min(start + rng.randint(16, 36), 56)
+        break_min = 30 if end - start > 22 else 0
+        worked = (end - start) * 15 - break_min
+        blocks = [f"{_quarter_to_time(start)} - {_quarter_to_time(end)}"]
+        # Some employees come back for a second shift block
+        if end < 50 and rng.random() < 0.15:
+            blocks.append(f"{_quarter_to_time(end + 4)} - {_quarter_to_time(min(end + 12, 60))}")
+        rows.append((name, blocks,
+                     f"{break_min // 60}:{break_min % 60:02d}",
+                     f"{worked // 60}:{worked % 60:02d}"))
+    return rows
+
+
+def fixture_day(date: str) -> DaySchedule:
+    """The schedule the fixture serves for a date, as get_schedule_info_per_date returns it."""
+    names, hours, break_times, work_times = [], [], [], []
+    for name, blocks, break_time, work_time in _fixture_rows(date):
+        for block in blocks:
+            names.append(name)
+            hours.append(block)
+        break_times.append(break_time)
+        work_times.append(work_time)
+    return names, hours, break_times, work_times
+
+
+def render_day(date: str) -> str:
+    """PMT day schedule markup, only the classes the scrapers read are kept."""
+    rows = []
+    for name, blocks, break_time, work_time in _fixture_rows(date):
+        block_html = "".join(
+            f'<div class="shift-block"><span class="shift-block-content">{escape(block)} | Winkel</span></div>'
+            for block in blocks
+        )
+        rows.append(
+            f'<div class="employee-row">'
+            f'<div class="name d-inline">{escape(name)}</div>'
+            f'{block_html}'
+            f'<span class="break">{escape(break_time)}</span>'
+            f'<span class="worked">{escape(work_time)}</span>'
+            f'</div>'
+        )
+    return (f'<!DOCTYPE html><html><body><h1>{escape(date)}</h1>'
+            f'<div class="schedule">{"".join(rows)}</div></body></html>')
+
+
+def _quarter_to_time(quarter: int) -> str:
+    hours, minutes = divmod(6 * 60 + quarter * 15, 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+class FixtureServer:
+    """
+    Local HTTP server mimicking the PMT login and day schedule pages, to run
+     the scrapers offline.
+
+    POST /login with the site() credentials sets SESSION_COOKIE and redirects
+     to the start page, other credentials get the login page back like PMT does.
+    GET /schedule/<dd-mm-yyyy> serves render_day() to logged-in clients.
+
+    - LATENCY (float): Seconds every schedule page takes
+    - FAIL_RATE (float): Share of schedule requests dropped without a response,
+       which Firefox and requests both raise on
+    - REQUESTS (int): Schedule pages served
+    - LOGINS (int): Login forms posted
+    """
+    def __init__(self, latency: float = 0, fail_rate: float = 0, seed: Optional[int] = 0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.requests: int = 0
+        self.logins: int = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def site(self) -> ScheduleSite:
+        return ScheduleSite(
+            login_url=f"{self.base_url}/login",
+            schedule_url=f"{self.base_url}/schedule/",
+            username="fixture",
+            password="fixture",
+            humanize=False,
+        )
+
+    def start(self) -> "FixtureServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="pmt-fixture", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self._rng.random() < self.fail_rate
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.startswith("/login"):
+                    self._send(200, LOGIN_PAGE)
+                elif self.path == "/":
+                    self._send(200, "<!DOCTYPE html><html><body>PMT</body></html>")
+                elif self.path.startswith("/schedule/"):
+                    self._schedule(self.path.rsplit("/", 1)[-1])
+                else:
+                    self._send(404, "Not found")
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+                with fixture._lock:
+                    fixture.logins += 1
+                form = {key: values[0] for key, values in parse_qs(body).items()}
+                site = fixture.site()
+                if (form.get("username"), form.get("password")) != (site.username, site.password):
+                    self._send(200, LOGIN_PAGE)
+                    return
+                self.send_response(303)
+                self.send_header("Set-Cookie", f"{SESSION_COOKIE}=fixture; Path=/; HttpOnly")
+                self.send_header("Location", "/")
+                self.end_headers()
+
+            def _schedule(self, date: str) -> None:
+                if f"{SESSION_COOKIE}=" not in (self.headers.get("Cookie") or ""):
+                    self._send(401, LOGIN_PAGE)
+                    return
+                try:
+                    datetime.strptime(date, "%d-%m-%Y")
+                except ValueError:
+                    self._send(404, "Not found")
+                    return
+                time.sleep(fixture.latency)
+                if fixture._should_fail():
+                    self.close_connection = True
+                    return
+                self._send(200, render_day(date))
+
+            def _send(self, status: int, body: str) -> None:
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
@@ -0,0 +1,501 @@
+import queue
+import statistics
+import threading
+import time
+
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+)
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+
+from flask import Flask
+from lxml import etree
+from selenium import webdriver
+
+from src.extensions import logger
+
+from src.utils.selenium_utils import get_undetectable_driver
+
+from config.settings import SERVER
+
+
+# names, hours, break_times, work_times of a single date
+DaySchedule = tuple[list[str], list[str], list[str], list[str]]
+# Selenium's add_cookie rejects the other keys of get_cookies()
+COOKIE_KEYS: tuple[str, ...] = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry")
+
+
+class ScrapeError(Exception):
+    """The page was loaded but is not a usable schedule page."""
+
+
+class LoginRequired(ScrapeError):
+    """Got the login page instead of a schedule page, the PMT session expired."""
+
+
+class LoginFailed(ScrapeError):
+    """Logging in to PMT failed, the run is aborted instead of trying again."""
+
+
+@dataclass(frozen=True)
+class ScheduleSite:
+    """
+    Where and as whom the PMT schedule is scraped.
+
+    - LOGIN_URL (str): Login page
+    - SCHEDULE_URL (str): Day schedule, the date 'dd-mm-yyyy' is appended
+    - USERNAME (str): PMT username
+    - PASSWORD (str): PMT password
+    - HUMANIZE (bool): Random sleeps and scrolling after every page load
+    """
+    login_url: str
+    schedule_url: str
+    username: str
+    password: str
+    humanize: bool = True
+
+    @classmethod
+    def from_app(cls, app_: Flask) -> "ScheduleSite":
+        return cls(
+            login_url=app_.ENV.S_LOGIN_URL.get_secret_value(),
+            schedule_url=app_.ENV.S_SCHEDULE_URL.get_secret_value(),
+            username=app_.ENV.S_USERNAME.get_secret_value(),
+            password=app_.ENV.S_PASSWORD.get_secret_value(),
+        )
+
+
+class ScraperBackend(ABC):
+    """
+    A way to read the PMT day schedules, the pool holds one session per worker.
+    The first session logs in, the others are given its cookies.
+    """
+    name: str = ""
+
+    @abstractmethod
+    def new_session(self) -> Any:
+        ...
+
+    @abstractmethod
+    def log_in(self, session: Any, site: ScheduleSite) -> list[dict]:
+        """Logs the session in, returns its cookies as [{"name", "value", "domain", "path", ...}]."""
+
+    @abstractmethod
+    def add_cookies(self, session: Any, site: ScheduleSite, cookies: list[dict]) -> None:
+        ...
+
+    @abstractmethod
+    def scrape_date(self, session: Any, date: str, site: ScheduleSite) -> DaySchedule:
+        ...
+
+    def close_session(self, session: Any) -> None:
+        pass
+
+
+class SeleniumBackend(ScraperBackend):
+    """Headless Firefox, renders the page like a browser would."""
+    name = "selenium"
+
+    def __init__(self, driver_factory: Callable[[], webdriver.Firefox] = get_undetectable_driver):
+        self.driver_factory = driver_factory
+
+    def new_session(self) -> webdriver.Firefox:
+        return self.driver_factory()
+
+    def log_in(self, session: webdriver.Firefox, site: ScheduleSite) -> list[dict]:
+        from src.utils.schedule import log_in
+
+        log_in(session, site)
+        # A rejected login shows the form again
+        if parse_login_form(session.page_source, session.current_url)[1]:
+            raise LoginFailed("Login to PMT failed, got the login form back")
+        return session.get_cookies()
+
+    def add_cookies(self, session: webdriver.Firefox, site: ScheduleSite, cookies: list[dict]) -> None:
+        # Cookies can only be set on a page of their domain
+        session.get(site.login_url)
+        for cookie in cookies:
+            session.add_cookie({key: value for key, value in cookie.items() if key in COOKIE_KEYS})
+
+    def scrape_date(self, session: webdriver.Firefox, date: str, site: ScheduleSite) -> DaySchedule:
+        from src.utils.schedule import get_schedule_info_per_date
+
+        return get_schedule_info_per_date(session, date, site)
+
+    def close_session(self, session: webdriver.Firefox) -> None:
+        session.quit()
+
+
+class HttpBackend(ScraperBackend):
+    """
+    Plain HTTP with a keep-alive requests.Session, the markup is parsed with lxml.
+    The schedule pages are static, so no browser is needed.
+    """
+    name = "http"
+    USER_AGENT: str = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                       "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+    def __init__(self, timeout: float = SERVER.SCRAPER_HTTP_TIMEOUT):
+        self.timeout = timeout
+
+    def new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers["User-Agent"] = self.USER_AGENT
+        return session
+
+    def log_in(self, session: requests.Session, site: ScheduleSite) -> list[dict]:
+        response = session.get(site.login_url, timeout=self.timeout)
+        response.raise_for_status()
+        action, fields = parse_login_form(response.text, response.url)
+        fields[fields.pop("_username", "username")] = site.username
+        fields[fields.pop("_password", "password")] = site.password
+
+        response = session.post(action, data=fields, timeout=self.timeout)
+        response.raise_for_status()
+        # The login page already sets cookies, a rejected login shows the form again
+        if parse_login_form(response.text, response.url)[1]:
+            raise LoginFailed("Login to PMT failed, got the login form back")
+        logger.info("[ADD] Logged in to PMT")
+        return [
+            {"name": cookie.name, "value": cookie.value, "domain": cookie.domain, "path": cookie.path}
+            for cookie in session.cookies
+        ]
+
+    def add_cookies(self, session: requests.Session, site: ScheduleSite, cookies: list[dict]) -> None:
+        for cookie in cookies:
+            session.cookies.set(cookie["name"], cookie["value"],
+                                domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+
+    def scrape_date(self, session: requests.Session, date: str, site: ScheduleSite) -> DaySchedule:
+        response = session.get(f"{site.schedule_url}{date}", timeout=self.timeout)
+        response.raise_for_status()
+        day_schedule = parse_schedule_html(response.text)
+        logger.info(f"Collected schedule data for: '{date}'")
+        return day_schedule
+
+    def close_session(self, session: requests.Session) -> None:
+        session.close()
+
+
+SCRAPER_BACKENDS: dict[str, type[ScraperBackend]] = {
+    SeleniumBackend.name: SeleniumBackend,
+    HttpBackend.name: HttpBackend,
+}
+
+
+def get_scraper_backend(name: str = SERVER.SCRAPER_BACKEND) -> ScraperBackend:
+    try:
+        return SCRAPER_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Invalid scraper backend '{name}', expected one of {', '.join(SCRAPER_BACKENDS)}")
+
+
+def _class_xpath(class_name: str) -> etree.XPath:
+    """Selenium's By.CLASS_NAME semantics, 'name.d-inline' matches elements with both classes."""
+    return etree.XPath(".//*" + "".join(
+        f"[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+        for name in class_name.split(".")
+    ))
+
+
+_EMPLOYEE_ROW = _class_xpath("employee-row")
+_NAME = _class_xpath("name.d-inline")
+_SHIFT_BLOCK = _class_xpath("shift-block-content")
+_BREAK = _class_xpath("break")
+_WORKED = _class_xpath("worked")
+_LOGIN_USERNAME = etree.XPath(".//*[@id='loginUsername']")
+
+
+def _text(element: lxml.html.HtmlElement) -> str:
+    return " ".join(element.text_content().split())
+
+
+def parse_schedule_html(html: str) -> DaySchedule:
+    """
+    Returns the names, hours, break times and work times of a PMT day schedule page,
+     the same lists get_schedule_info_per_date reads through Selenium.
+    """
+    document = lxml.html.fromstring(html)
+    if _LOGIN_USERNAME(document):
+        raise LoginRequired("Got the login page, the PMT session expired")
+
+    names = []
+    hours = []
+    break_times = []
+    work_times = []
+    for row in _EMPLOYEE_ROW(document):
+        name = _text(_NAME(row)[0])
+        hour_elements = _SHIFT_BLOCK(row)
+        names.append(name)
+        hours.append(_text(hour_elements[0]).split("|")[0].strip())
+        break_times.append(_text(_BREAK(row)[0]))
+        work_times.append(_text(_WORKED(row)[0]))
+
+        if len(hour_elements) > 1:
+            names.append(name)
+            hours.append(_text(hour_elements[1]).split("|")[0].strip())
+    return names, hours, break_times, work_times
+
+
+def parse_login_form(html: str, url: str) -> tuple[str, dict[str, str]]:
+    """
+    Returns the login form's absolute action and its fields, hidden inputs included.
+    The names of the username and password inputs are returned under '_username' and '_password'.
+    """
+    document = lxml.html.fromstring(html, base_url=url)
+    username = _LOGIN_USERNAME(document)
+    form = next(username[0].iterancestors("form"), None) if username else None
+    if form is None:
+        return url, {}
+
+    fields = {name: value or "" for name, value in form.form_values()}
+    fields["_username"] = username[0].get("name", "username")
+    password = form.xpath(".//*[@id='loginPassword']")
+    fields["_password"] = password[0].get("name", "password") if password else "password"
+    return urljoin(url, form.get("action") or url), fields
+
+
+class SessionPool:
+    """
+    Bounded pool of backend sessions sharing a single PMT login.
+
+    Sessions are created on demand up to SIZE. The first one logs in, the
+     others load its cookies instead of logging in again.
+    A session that raised while in use is closed and replaced on the next acquire.
+    When it raised LoginRequired the cookies are dropped as well, so its
+     replacement logs in again instead of loading the expired cookies.
+    A failed login is never retried, repeated rejected logins could lock the
+     PMT account. Every later acquire raises LOGIN_ERROR instead.
+
+    - SIZE (int): Maximum number of sessions
+    - COOKIES (list[dict]): Login cookies of the first session
+    - LOGIN_ERROR (LoginFailed): Why the login failed [Optional]
+    """
+    def __init__(self, site: ScheduleSite, size: int, backend: ScraperBackend):
+        self.site = site
+        self.size = max(1, size)
+        self.backend = backend
+        self.cookies: Optional[list[dict]] = None
+        self.login_error: Optional[LoginFailed] = None
+
+        self._idle: queue.Queue = queue.Queue()
+        self._sessions: list[Any] = []
+        # id(session) -> login the session's cookies came from
+        self._session_logins: dict[int, int] = {}
+        self._login: int = 0
+        self._lock = threading.Lock()
+        self._login_lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        session = self._get()
+        try:
+            yield session
+        except Exception as e:
+            if isinstance(e, LoginRequired):
+                self._expire_login(session)
+            self._discard(session)
+            raise
+        self._idle.put(session)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                self.backend.close_session(session)
+            except Exception:
+                logger.warning(f"[SYS] SCRAPER: failed to close a {self.backend.name} session")
+
+    def _get(self) -> Any:
+        if self.login_error is not None:
+            raise self.login_error
+        try:
+            return self._checked(self._idle.get_nowait())
+        except queue.Empty:
+            pass
+        with self._lock:
+            may_create = len(self._sessions) < self.size
+            if may_create:
+                # Reserve the slot before the slow start-up
+                self._sessions.append(None)
+        if not may_create:
+            return self._checked(self._idle.get())
+
+        try:
+            session = self._new_session()
+        except Exception:
+            with self._lock:
+                self._sessions.remove(None)
+            raise
+        with self._lock:
+            self._sessions[self._sessions.index(None)] = session
+        return session
+
+    def _checked(self, session: Any) -> Any:
+        if session is None:
+            # Put back by a failed login, pass it on to the next waiting thread
+            self._idle.put(None)
+            raise self.login_error
+        return session
+
+    def _new_session(self) -> Any:
+        session = self.backend.new_session()
+        try:
+            with self._login_lock:
+                if self.login_error is not None:
+                    raise self.login_error
+                if self.cookies is None:
+                    self.cookies = self._log_in(session)
+                    self._login += 1
+                    self._session_logins[id(session)] = self._login
+                    return session
+                cookies, self._session_logins[id(session)] = self.cookies, self._login
+            self.backend.add_cookies(session, self.site, cookies)
+            return session
+        except Exception:
+            self.backend.close_session(session)
+            raise
+
+    def _log_in(self, session: Any) -> list[dict]:
+        """Logs the session in, a failure is stored and wakes the threads waiting for a session."""
+        try:
+            return self.backend.log_in(session, self.site)
+        except LoginFailed as e:
+            self._fail_login(e)
+            raise
+        except Exception as e:
+            error = LoginFailed(f"Login to PMT failed: {e!r}")
+            self._fail_login(error)
+            raise error from e
+
+    def _fail_login(self, error: LoginFailed) -> None:
+        self.login_error = error
+        logger.error(f"[ADD] {error}, not logging in again")
+        self._idle.put(None)
+
+    def _expire_login(self, session: Any) -> None:
+        with self._login_lock:
+            # Sessions of an older login fail too, they must not drop a fresh login
+            if self._session_logins.get(id(session)) == self._login:
+                self.cookies = None
+                logger.warning("[ADD] PMT session expired, logging in again")
+
+    def _discard(self, session: Any) -> None:
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        with self._login_lock:
+            self._session_logins.pop(id(session), None)
+        try:
+            self.backend.close_session(session)
+        except Exception:
+            pass
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class ScrapeStats:
+    """
+    Timings of a scrape run.
+
+    - SECONDS (dict[str, float]): Date -> duration of its successful attempt
+    - ATTEMPTS (dict[str, int]): Date -> number of attempts
+    - FAILED (list[str]): Dates that failed every attempt
+    - ELAPSED (float): Wall time of the run
+    """
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+        self.attempts: dict[str, int] = {}
+        self.failed: list[str] = []
+        self.elapsed: float = 0
+        self._lock = threading.Lock()
+
+    def record(self, date: str, attempts: int, seconds: Optional[float]) -> None:
+        with self._lock:
+            self.attempts[date] = attempts
+            if seconds is None:
+                self.failed.append(date)
+            else:
+                self.seconds[date] = seconds
+
+    def to_dict(self) -> dict:
+        durations = list(self.seconds.values())
+        return {
+            "dates": len(self.attempts),
+            "failed": len(self.failed),
+            "retries": sum(self.attempts.values()) - len(self.attempts),
+            "elapsed": round(self.elapsed, 2),
+            "mean": round(statistics.mean(durations), 2) if durations else 0,
+            "max": round(max(durations), 2) if durations else 0,
+            "dates_per_minute": round(len(durations) / self.elapsed * 60, 1) if self.elapsed else 0,
+        }
+
+
+def _scrape_date(pool: SessionPool, date: str, retries: int, retry_delay: float,
+                 stats: ScrapeStats) -> Optional[DaySchedule]:
+    for attempt in range(1, retries + 2):
+        start = time.perf_counter()
+        try:
+            with pool.acquire() as session:
+                day_schedule = pool.backend.scrape_date(session, date, pool.site)
+        except LoginFailed:
+            stats.record(date, attempt, None)
+            raise
+        except Exception as e:
+            logger.warning(f"[ADD] SCRAPE {date} attempt {attempt} failed: {e!r}")
+            if attempt <= retries:
+                time.sleep(retry_delay * attempt)
+            continue
+        stats.record(date, attempt, time.perf_counter() - start)
+        return day_schedule
+
+    stats.record(date, retries + 1, None)
+    logger.error(f"[ADD] SCRAPE {date} failed after {retries + 1} attempts")
+    return None
+
+
+def scrape_dates(dates: list[str], site: ScheduleSite, pool_size: int = SERVER.SCRAPER_POOL_SIZE,
+                 retries: int = SERVER.SCRAPER_RETRIES, retry_delay: float = SERVER.SCRAPER_RETRY_DELAY,
+                 backend: Optional[ScraperBackend] = None,
+                 ) -> tuple[dict[str, DaySchedule], ScrapeStats]:
+    """
+    Scrapes the dates concurrently through a pool of pool_size logged-in sessions
+     of the backend [Default: SERVER.SCRAPER_BACKEND].
+    Every date is retried up to retries times, with a growing delay.
+    Returns ({date: (names, hours, break_times, work_times)}, stats), failed dates are left out.
+    Raises LoginFailed when PMT rejects the login, no date is retried then.
+    """
+    stats = ScrapeStats()
+    start = time.perf_counter()
+    backend = backend or get_scraper_backend()
+    with SessionPool(site, min(pool_size, len(dates)), backend) as pool:
+        with ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="scraper") as executor:
+            futures = {
+                date: executor.submit(_scrape_date, pool, date, retries, retry_delay, stats)
+                for date in dates
+            }
+            results = {date: future.result() for date, future in futures.items()}
+    stats.elapsed = time.perf_counter() - start
+
+    summary = stats.to_dict()
+    logger.info(f"[ADD] SCRAPED {summary['dates'] - summary['failed']}/{summary['dates']} dates "
+                f"in {summary['elapsed']}s with {pool.size} {backend.name} sessions, "
+                f"{summary['retries']} retries")
+    return {date: result for date, result in results.items() if result is not None}, stats
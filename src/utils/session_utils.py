@@ -0,0 +1,79 @@
+import os
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import (
+    ORMExecuteState,
+    Session,
+    scoped_session,
+)
+
+
+# Session.info key, set when the transaction wrote anything
+_WRITES_KEY: str = "has_writes"
+
+
+class TeardownStats:
+    """
+    Per-worker counters of the request teardown.
+
+    - COMMITS (int): Teardowns that committed a write
+    - AVOIDED_COMMITS (int): Read-only teardowns that rolled back instead
+    - ROLLBACKS (int): Teardowns after an exception or a failed commit
+    """
+    def __init__(self):
+        self.commits: int = 0
+        self.avoided_commits: int = 0
+        self.rollbacks: int = 0
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "commits": self.commits,
+            "avoided_commits": self.avoided_commits,
+            "rollbacks": self.rollbacks,
+        }
+
+
+teardown_stats_ = TeardownStats()
+
+
+def _flag_writes(session: Session, *_) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+def _flag_dml(state: ORMExecuteState) -> None:
+    # text() and other non-SELECT statements count as writes
+    if not state.is_select:
+        _flag_writes(state.session)
+
+
+def _reset_writes(session: Session, *_) -> None:
+    session.info.pop(_WRITES_KEY, None)
+
+
+def track_session_writes(session: scoped_session) -> None:
+    """
+    Marks the session's transaction as writing on flush and on every
+     executed INSERT, UPDATE, DELETE or textual statement.
+    The mark is cleared when the transaction ends.
+    """
+    event.listen(session, "after_flush", _flag_writes)
+    event.listen(session, "do_orm_execute", _flag_dml)
+    event.listen(session, "after_commit", _reset_writes)
+    event.listen(session, "after_rollback", _reset_writes)
+
+
+def session_has_writes(session: scoped_session) -> bool:
+    """True when committing the session would write anything."""
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.info.get(_WRITES_KEY)
+    )
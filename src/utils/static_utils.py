@@ -0,0 +1,245 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+
+from typing import (
+    Iterator,
+    Optional,
+)
+
+import brotli
+import zstandard
+
+from flask import (
+    Response,
+    request,
+    send_from_directory,
+)
+from werkzeug.security import safe_join
+
+from config.settings import (
+    DIR,
+    SERVER,
+)
+
+
+class StaticManifest:
+    """
+    Content hashes of the files in src/static, used to fingerprint static URLs.
+
+    'dist/base_css.min.css' is served as 'dist/base_css.min.<hash>.css', so a
+     changed file always gets a new URL and the old one can be cached forever.
+    Entries are keyed on the file's mtime, files changed or added after
+     build() (image derivatives, webassets output) are hashed on first use.
+
+    - ENTRIES (dict[str, tuple[float, str]]): Filename -> (mtime, fingerprinted filename)
+    - ORIGINALS (dict[str, str]): Fingerprinted filename -> filename
+    """
+    HASH_LENGTH: int = 10
+    SKIP_DIRS: tuple[str, ...] = (".webassets-cache",)
+
+    _FINGERPRINT = re.compile(r"\.[0-9a-f]{10}(\.[^./]+)$")
+
+    def __init__(self, static_folder: str):
+        self.static_folder = static_folder
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._originals: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def build(self) -> int:
+        """Fingerprints every file in the static folder, returns the number of files."""
+        for folder, dirs, files in os.walk(self.static_folder):
+            dirs[:] = [dir_ for dir_ in dirs if dir_ not in self.SKIP_DIRS]
+            for file in files:
+                if file.endswith(PRECOMPRESSED_SUFFIXES):
+                    continue
+                path = os.path.join(folder, file)
+                self.fingerprint(os.path.relpath(path, self.static_folder).replace(os.sep, "/"))
+        return len(self._entries)
+
+    def fingerprint(self, filename: str) -> str:
+        """Returns the fingerprinted filename, or the filename itself if it doesn't exist."""
+        path = safe_join(self.static_folder, filename)
+        try:
+            mtime = os.stat(path).st_mtime if path else None
+        except OSError:
+            mtime = None
+        if mtime is None:
+            return filename
+
+        entry = self._entries.get(filename)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        root, ext = os.path.splitext(filename)
+        fingerprinted = f"{root}.{self._hash(path)}{ext}"
+        with self._lock:
+            if entry is not None:
+                self._originals.pop(entry[1], None)
+            self._entries[filename] = (mtime, fingerprinted)
+            self._originals[fingerprinted] = filename
+        return fingerprinted
+
+    def resolve(self, filename: str) -> tuple[str, bool]:
+        """
+        Returns the filename on disk for a requested filename,
+         and whether the request carried the current fingerprint.
+        Outdated fingerprints resolve to the current file.
+        """
+        original = self._originals.get(filename)
+        if original is None:
+            match = self._FINGERPRINT.search(filename)
+            if not match:
+                return filename, False
+            original = filename[:match.start()] + match.group(1)
+        return original, self.fingerprint(original) == filename
+
+    def _hash(self, path: str) -> str:
+        md5 = hashlib.md5(usedforsecurity=False)
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(64 * 1024), b""):
+                md5.update(chunk)
+        return md5.hexdigest()[:self.HASH_LENGTH]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+static_manifest_ = StaticManifest(DIR.STATIC)
+
+
+# Precompressed siblings, in order of preference
+PRECOMPRESSED: dict[str, str] = {
+    "br": ".br",
+    "zstd": ".zst",
+    "gzip": ".gz",
+}
+PRECOMPRESSED_SUFFIXES: tuple[str, ...] = tuple(PRECOMPRESSED.values())
+# Images and fonts are compressed formats already
+COMPRESSIBLE_EXTENSIONS: tuple[str, ...] = (".css", ".js", ".json", ".map", ".svg", ".txt", ".xml")
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _compressible_files(static_folder: str) -> Iterator[str]:
+    for folder, dirs, files in os.walk(static_folder):
+        dirs[:] = [dir_ for dir_ in dirs if dir_ not in StaticManifest.SKIP_DIRS]
+        for file in files:
+            if file.endswith(COMPRESSIBLE_EXTENSIONS):
+                yield os.path.join(folder, file)
+
+
+def _is_up_to_date(sibling: str, source_mtime: float) -> bool:
+    return os.path.exists(sibling) and os.stat(sibling).st_mtime >= source_mtime
+
+
+def build_precompressed(static_folder: str = DIR.STATIC, force: bool = False) -> dict:
+    """
+    Writes .br, .zst and .gz siblings next to every compressible static file,
+     including the webassets bundles in dist/.
+    Siblings newer than their source are skipped, writes are atomic so
+     running workers never serve a partial file.
+    Returns {"built": int, "skipped": int}.
+    """
+    built = skipped = 0
+    for path in _compressible_files(static_folder):
+        source_mtime = os.stat(path).st_mtime
+        data = None
+        for encoding, suffix in PRECOMPRESSED.items():
+            sibling = path + suffix
+            if not force and _is_up_to_date(sibling, source_mtime):
+                skipped += 1
+                continue
+            if data is None:
+                with open(path, "rb") as source:
+                    data = source.read()
+            temp_path = f"{sibling}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as target:
+                target.write(_compress(data, encoding))
+            os.replace(temp_path, sibling)
+            built += 1
+    return {"built": built, "skipped": skipped}
+
+
+def get_stale_precompressed(static_folder: str = DIR.STATIC) -> list[str]:
+    """Returns the compressible static files missing an up to date sibling, nothing is written."""
+    stale = []
+    for path in _compressible_files(static_folder):
+        source_mtime = os.stat(path).st_mtime
+        if not all(_is_up_to_date(path + suffix, source_mtime) for suffix in PRECOMPRESSED.values()):
+            stale.append(path)
+    return stale
+
+
+def _choose_precompressed(path: Optional[str]) -> Optional[str]:
+    """Returns the best encoding the client accepts with an up to date sibling of path."""
+    if not path or not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return None
+    accepted = request.accept_encodings
+    try:
+        source_mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    for encoding, suffix in PRECOMPRESSED.items():
+        if not accepted.quality(encoding):
+            continue
+        try:
+            if os.stat(path + suffix).st_mtime >= source_mtime:
+                return encoding
+        except OSError:
+            continue
+    return None
+
+
+# Endpoints serving (part of) the static folder, with their prefix in it
+STATIC_ENDPOINTS: dict[str, str] = {
+    "static": "",
+    "bakery_health_folder": "images/bakery/health/",
+}
+
+
+def fingerprint_static_urls(endpoint: Optional[str], values: dict) -> None:
+    """url_defaults callback: url_for("static", filename=...) returns the fingerprinted URL."""
+    prefix = STATIC_ENDPOINTS.get(endpoint)
+    if prefix is None or "filename" not in values:
+        return
+    values["filename"] = static_manifest_.fingerprint(prefix + values["filename"])[len(prefix):]
+
+
+def send_static_asset(directory: str, filename: str, prefix: str = "") -> Response:
+    """
+    Serves a static file by its plain or fingerprinted name, as the best
+     precompressed variant the client accepts.
+    Current fingerprints are cached for a year as immutable.
+    """
+    original, current = static_manifest_.resolve(prefix + filename)
+    name = original[len(prefix):]
+    path = safe_join(directory, name)
+
+    encoding = _choose_precompressed(path)
+    if encoding:
+        response = send_from_directory(directory, name + PRECOMPRESSED[encoding],
+                                       mimetype=mimetypes.guess_type(name)[0])
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = send_from_directory(directory, name)
+    if path and path.endswith(COMPRESSIBLE_EXTENSIONS):
+        response.vary.add("Accept-Encoding")
+
+    if current:
+        response.cache_control.no_cache = False
+        response.cache_control.public = True
+        response.cache_control.max_age = SERVER.STATIC_IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        response.expires = int(time.time() + SERVER.STATIC_IMMUTABLE_MAX_AGE)
+    return response
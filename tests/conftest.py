@@ -0,0 +1,123 @@
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+from cryptography.fernet import Fernet
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Environ.from_env and src.extensions need these before the first import of src
+_TMP = tempfile.mkdtemp(prefix="server-tests-")
+os.environ["FLASK_ENV"] = "debug"
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["ENCRYPTION_KEY"] = Fernet.generate_key().decode()
+for _name in ("FLASK_KEY", "CLIENT_SECRET", "GOOGLE_CLIENT_ID", "GMAIL_EMAIL", "GMAIL_PASS",
+              "HOTMAIL_EMAIL", "PWD_RESET_SALT", "EMAIL_VERIFICATION_SALT",
+              "PASSWORD_VERIFICATION_SALT", "EMPLOYEE_VERIFICATION_SALT", "S_USERNAME",
+              "S_PASSWORD", "S_LOGIN_URL", "S_SCHEDULE_URL", "ADMIN_UNAME", "ADMIN_PWD",
+              "ADMIN_F_NAME", "ADMIN_F_CODE", "ADMIN_DISPLAY_NAME", "ADMIN_EMPLOYEE_NAME",
+              "ADMIN_ROLES", "DELETED_USER_EMAIL", "DELETED_USER_UNAME", "DELETED_USER_PWD",
+              "DELETED_USER_DISPLAY_NAME"):
+    os.environ.setdefault(_name, f"test-{_name.lower()}")
+
+from config.settings import DIR, PATH  # noqa: E402
+
+# The real client secret is encrypted with the deploy key
+PATH.CLIENTS_SECRETS = os.path.join(_TMP, "client_secret.json")
+DIR.DB = os.path.join(_TMP, "db")
+DIR.LOGS = os.path.join(_TMP, "logs")
+PATH.LOGS = os.path.join(DIR.LOGS, "logs.ansi")
+DIR.SEARCH_CACHE = os.path.join(_TMP, "search_cache")
+DIR.SCHEDULE_WEEKS = os.path.join(_TMP, "weeks")
+PATH.EMPLOYEES = os.path.join(_TMP, "employees.json")
+os.makedirs(DIR.LOGS)
+with open(PATH.EMPLOYEES, "wb") as _file:
+    _file.write(Fernet(os.environ["ENCRYPTION_KEY"]).encrypt(b"{}"))
+with open(PATH.CLIENTS_SECRETS, "wb") as _file:
+    _file.write(Fernet(os.environ["ENCRYPTION_KEY"]).encrypt(json.dumps({"web": {
+        "client_id": "test",
+        "client_secret": "test",
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }}).encode()))
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The application on an in-memory SQLite database, without the startup data."""
+    from flask import Flask
+    from sqlalchemy.pool import StaticPool
+
+    import src
+    from src.extensions import server_db_
+    from config.app_config import DebugConfig
+
+    app_ = Flask(import_name="src", root_path=os.path.dirname(src.__file__),
+                 template_folder="templates", static_folder="static")
+    src._configure_dirs(app_)
+    src._configure_variables(app_)
+    app_.config.from_object(DebugConfig())
+    app_.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        # One connection, so the write-behind and the requests share the database
+        "SQLALCHEMY_ENGINE_OPTIONS": {"poolclass": StaticPool,
+                                      "connect_args": {"check_same_thread": False}},
+        "WTF_CSRF_ENABLED": False,
+        "RATELIMIT_ENABLED": False,
+    })
+    src._configure_extensions(app_)
+    src._configure_blueprints(app_)
+    src._configure_requests(app_)
+    src._configure_url_rules(app_)
+    src._configure_jinja(app_)
+
+    with app_.app_context():
+        server_db_.create_all()
+    yield app_
+
+
+@pytest.fixture
+def db(app):
+    """server_db_ inside an app context, emptied after the test."""
+    from src.extensions import (
+        cache_,
+        server_db_,
+    )
+
+    with app.app_context():
+        yield server_db_
+        server_db_.session.rollback()
+        for table in reversed(server_db_.metadata.sorted_tables):
+            server_db_.session.execute(table.delete())
+        server_db_.session.commit()
+        cache_.clear()
+
+
+@pytest.fixture
+def user(db):
+    from src.models.auth_model.auth_mod import User
+
+    user_ = User(email="tester@example.com", username="tester", password="Password1!",
+                 display_name="Tester")
+    db.session.add(user_)
+    db.session.commit()
+    return user_
+
+
+@pytest.fixture
+def client(app, user):
+    """
+    Test client logged in as user.
+    Requests remove the session at teardown, read ids before making them.
+    """
+    user_id = user.id
+    client_ = app.test_client()
+    with client_.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+    return client_
@@ -0,0 +1,33 @@
+import threading
+
+from src.utils.activity_utils import ActivityBuffer
+
+
+def test_full_buffer_flushes_on_the_timer_thread(app):
+    buffer = ActivityBuffer()
+    buffer.init_app(app)
+    buffer.max_entries = 2
+
+    flushed = threading.Event()
+    flush_threads = []
+
+    def flush():
+        flush_threads.append(threading.current_thread().name)
+        flushed.set()
+        return {"last_seen": 0, "reads": 0}
+
+    buffer.flush = flush
+    buffer.touch_user(1)
+    assert not flush_threads
+    buffer.touch_user(2)
+    # Well before ACTIVITY_FLUSH_INTERVAL
+    assert flushed.wait(timeout=2)
+    assert flush_threads == ["activity-flush"]
+
+
+def test_touch_user_is_throttled():
+    buffer = ActivityBuffer()
+    buffer.last_seen_granularity = 60
+    buffer.touch_user(1)
+    buffer.touch_user(1)
+    assert len(buffer) == 1
@@ -0,0 +1,123 @@
+from src.models.bakery_model.bakery_mod import BakeryItem
+from src.models.bakery_model.bakery_ranking import bakery_ranker_
+from src.models.bakery_model.bakery_search import bakery_search_index_
+
+
+def make_item(name: str, **kwargs) -> BakeryItem:
+    values = {
+        "name": name, "category": "brood", "program": 1, "nasa": 100, "price": 1.5,
+        "type": ["brood"], "tags": ["vers"], "package_type": None, "per_package": None,
+        "rack_type": None, "per_rack": None, "defrost_time": None, "cooldown_time": "10",
+        "make_halves": False, "vegan": False, "lactose_free": False, "nutri_score": "A",
+        "contains": ["tarwe"], "may_contain": ["noten"], "image": None,
+    }
+    values.update(kwargs)
+    return BakeryItem(**values)
+
+
+def test_index_follows_committed_changes(db):
+    item = make_item("Croissant")
+    db.session.add(item)
+    db.session.commit()
+    bakery_search_index_.build()
+    assert bakery_search_index_.search(["croissant"]) == {item.id}
+
+    item.name = "Appelflap"
+    db.session.commit()
+    assert bakery_search_index_.search(["appelflap"]) == {item.id}
+    assert bakery_search_index_.search(["croissant"]) == set()
+
+    id_ = item.id
+    db.session.delete(item)
+    db.session.commit()
+    assert id_ not in bakery_search_index_.search(["appelflap"])
+
+
+def test_index_ignores_rolled_back_changes(db):
+    item = make_item("Croissant")
+    db.session.add(item)
+    db.session.commit()
+    bakery_search_index_.build()
+
+    db.session.add(make_item("Saucijzenbroodje"))
+    item.name = "Appelflap"
+    db.session.flush()
+    db.session.rollback()
+    assert bakery_search_index_.search(["saucijzenbroodje"]) == set()
+    assert bakery_search_index_.search(["appelflap"]) == set()
+    assert bakery_search_index_.search(["croissant"]) == {item.id}
+
+    db.session.delete(item)
+    db.session.flush()
+    db.session.rollback()
+    assert bakery_search_index_.search(["croissant"]) == {item.id}
+
+
+def test_ranker_ignores_rolled_back_changes(db):
+    item = make_item("Croissant")
+    db.session.add(item)
+    db.session.commit()
+    bakery_ranker_.build()
+
+    db.session.add(make_item("Saucijzenbroodje"))
+    item.name = "Appelflap"
+    db.session.flush()
+    db.session.rollback()
+    assert bakery_ranker_.rank(["saucijzenbroodje"]) == {}
+    assert bakery_ranker_.rank(["appelflap"]) == {}
+    assert list(bakery_ranker_.rank(["croissant"])) == [item.id]
+
+    item.name = "Appelflap"
+    db.session.commit()
+    assert list(bakery_ranker_.rank(["appelflap"])) == [item.id]
+    assert bakery_ranker_.rank(["croissant"]) == {}
+
+
+def test_trigram_backend_matches_the_index_expression():
+    from sqlalchemy.dialects import postgresql
+
+    from src.models.bakery_model.bakery_search import PostgresTrigramBackend
+
+    clause = PostgresTrigramBackend().match(["Brood"])
+    compiled = clause.compile(dialect=postgresql.dialect())
+    assert str(compiled) == "bakery_items.search_field LIKE %(search_field_1)s"
+    assert compiled.params == {"search_field_1": "%brood%"}
+
+
+def test_search_page_shows_the_selected_item(db, client):
+    item = make_item("Croissant")
+    db.session.add(item)
+    db.session.commit()
+
+    id_ = item.id
+    response = client.get(f"/bakery/search/{id_}")
+    assert response.status_code == 200
+    assert b"Croissant" in response.data
+
+
+def test_catalog_version_is_bumped_once_per_flush(db):
+    from flask import g
+
+    from src.models.bakery_model.bakery_catalog import get_catalog_version
+
+    def version() -> int:
+        g.pop("bakery_catalog_version", None)
+        return get_catalog_version()
+
+    start = version()
+    items = [make_item(name) for name in ("Croissant", "Appelflap", "Saucijzenbroodje")]
+    db.session.add_all(items)
+    db.session.commit()
+    assert version() == start + 1
+
+    items[0].name = "Chocoladecroissant"
+    items[1].price = 2.0
+    db.session.commit()
+    assert version() == start + 2
+
+    db.session.commit()
+    assert version() == start + 2
+
+    db.session.delete(items[2])
+    db.session.commit()
+    assert version() == start + 3
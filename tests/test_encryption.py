@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+from src.utils.encryption_utils import (
+    EncryptedJsonCache,
+    decrypt_data,
+    encrypt_data,
+)
+
+
+def write_encrypted(path, document) -> None:
+    with open(path, "wb") as file:
+        file.write(encrypt_data(json.dumps(document).encode()))
+
+
+def test_cache_rereads_a_changed_file(tmp_path, monkeypatch):
+    decrypted = []
+    monkeypatch.setattr("src.utils.encryption_utils.decrypt_data",
+                        lambda data: decrypted.append(data) or decrypt_data(data))
+    path = str(tmp_path / "employees.json")
+    write_encrypted(path, {"Anna de Vries": {"email": ""}})
+    cache = EncryptedJsonCache()
+    assert cache.read(path) == {"Anna de Vries": {"email": ""}}
+    assert cache.read(path) == {"Anna de Vries": {"email": ""}}
+    assert len(decrypted) == 1
+
+    # Same size, only the mtime differs
+    stat = os.stat(path)
+    write_encrypted(path, {"Bram de Vries": {"email": ""}})
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert os.path.getsize(path) == stat.st_size
+    assert cache.read(path) == {"Bram de Vries": {"email": ""}}
+    assert len(decrypted) == 2
+
+
+def test_cache_returns_copies(tmp_path):
+    path = str(tmp_path / "employees.json")
+    cache = EncryptedJsonCache()
+    document = {"Anna de Vries": {"email": ""}}
+    cache.write(path, document)
+    document["Bram Jansen"] = {}
+
+    cache.read(path)["Chloe Bakker"] = {}
+    assert cache.read(path) == {"Anna de Vries": {"email": ""}}
+
+
+def test_write_replaces_the_file_atomically(tmp_path, monkeypatch):
+    path = str(tmp_path / "employees.json")
+    cache = EncryptedJsonCache()
+    cache.write(path, {"Anna de Vries": {}})
+    assert os.listdir(tmp_path) == ["employees.json"]
+    with open(path, "rb") as file:
+        assert json.loads(decrypt_data(file.read()).decode()) == {"Anna de Vries": {}}
+
+    # A failed write keeps the old file and removes the temporary one
+    def fail(*_):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", fail)
+    with pytest.raises(OSError):
+        cache.write(path, {"Bram Jansen": {}})
+    monkeypatch.undo()
+    assert os.listdir(tmp_path) == ["employees.json"]
+    assert EncryptedJsonCache().read(path) == {"Anna de Vries": {}}
@@ -0,0 +1,10 @@
+from src.utils import image_utils
+
+
+def test_startup_check_only_reports_stale_images(monkeypatch):
+    def build(*_, **__):
+        raise AssertionError("the startup check must not build")
+
+    monkeypatch.setattr(image_utils, "get_stale_images", lambda: ["static/images/bakery/brood.png"])
+    monkeypatch.setattr(image_utils, "build_bakery_images", build)
+    image_utils.check_bakery_images()
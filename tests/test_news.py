@@ -0,0 +1,196 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+from src.models.news_model.news_mod import News
+from src.models.news_model.news_mod_utils import (
+    decode_news_cursor,
+    encode_news_cursor,
+    get_news_page,
+)
+
+
+def make_news(db, user_id: int, title: str, created_at: datetime) -> News:
+    news = News(title=title, header="Header", code=100, important="", grid={},
+                info=[], author="Tester", user_id=user_id)
+    news.created_at = created_at
+    db.session.add(news)
+    return news
+
+
+def test_cursor_round_trip(db, user):
+    news = make_news(db, user.id, "First", datetime(2025, 3, 1, 12, 30, 15, 123456))
+    db.session.commit()
+
+    cursor = encode_news_cursor(news)
+    assert "=" not in cursor
+    assert decode_news_cursor(cursor) == (news.created_at, news.id)
+
+
+def test_malformed_cursor_is_ignored(db):
+    for cursor in (None, "", "not-a-cursor", "bm8gc2VwYXJhdG9y", "!!"):
+        assert decode_news_cursor(cursor) is None
+
+
+def test_pages_walk_every_item_once(db, user):
+    start = datetime(2025, 3, 1, 12, 0)
+    # Pairs share a created_at, the id breaks the tie
+    for i in range(7):
+        make_news(db, user.id, f"News {i}", start + timedelta(minutes=i // 2))
+    db.session.commit()
+    expected = [news.title for news in db.session.query(News)
+                .order_by(News.created_at.desc(), News.id.desc())]
+
+    titles, cursor, pages = [], None, 0
+    while True:
+        page, cursor = get_news_page(cursor=cursor, page_size=3)
+        titles.extend(news["title"] for news in page)
+        pages += 1
+        if cursor is None:
+            break
+    assert titles == expected
+    assert pages == 3
+
+
+def counts(db, model, id_: int) -> tuple[int, int]:
+    db.session.expire_all()
+    target = db.session.get(model, id_)
+    return target.like_count, target.dislike_count
+
+
+def test_news_reaction_toggles_counts(db, user):
+    from src.models.news_model.news_mod import (
+        DISLIKE,
+        LIKE,
+    )
+    from src.models.news_model.news_mod_utils import (
+        get_user_reactions,
+        set_news_reaction,
+    )
+
+    news = make_news(db, user.id, "Reactions", datetime(2025, 3, 1))
+    db.session.commit()
+    news_id, user_id = news.id, user.id
+
+    set_news_reaction(news_id, user_id, LIKE)
+    assert counts(db, News, news_id) == (1, 0)
+    # Repeating a reaction changes nothing
+    set_news_reaction(news_id, user_id, LIKE)
+    assert counts(db, News, news_id) == (1, 0)
+    set_news_reaction(news_id, user_id, DISLIKE)
+    assert counts(db, News, news_id) == (0, 1)
+    assert get_user_reactions(news_id, user_id)[0] == DISLIKE
+
+
+def test_comment_reactions_of_several_users(db, user):
+    from src.models.auth_model.auth_mod import User
+    from src.models.news_model.news_mod import (
+        DISLIKE,
+        LIKE,
+        Comment,
+    )
+    from src.models.news_model.news_mod_utils import set_comment_reaction
+
+    other = User(email="other@example.com", username="other", password="Password1!")
+    news = make_news(db, user.id, "Comments", datetime(2025, 3, 1))
+    db.session.add(other)
+    db.session.flush()
+    comment = Comment(news_id=news.id, user_id=user.id, content="First!")
+    db.session.add(comment)
+    db.session.commit()
+
+    set_comment_reaction(comment, user.id, LIKE)
+    set_comment_reaction(comment, other.id, LIKE)
+    assert counts(db, Comment, comment.id) == (2, 0)
+    set_comment_reaction(comment, other.id, DISLIKE)
+    assert counts(db, Comment, comment.id) == (1, 1)
+
+
+def render_feed_statements(client, db, user_id: int, n_news: int) -> int:
+    """
+    Statements executed while /news/all renders n_news items, each with comments
+     by two users, the comment authors are read by News.to_dict().
+    """
+    from sqlalchemy import event
+
+    from src.models.auth_model.auth_mod import User
+    from src.models.news_model.news_mod import Comment
+
+    start = datetime(2025, 3, 1)
+    for i in range(n_news):
+        author = User(email=f"author{n_news}.{i}@example.com", username=f"author{n_news}.{i}",
+                      password="Password1!")
+        db.session.add(author)
+        db.session.flush()
+        news = make_news(db, user_id, f"Feed {i}", start + timedelta(minutes=i))
+        db.session.flush()
+        db.session.add(Comment(news_id=news.id, user_id=author.id, content="Nice"))
+        db.session.add(Comment(news_id=news.id, user_id=user_id, content="Thanks"))
+    db.session.commit()
+    # The test's app context outlives the requests, flask-login keeps the
+    #  user loaded by the first one in g
+    client.get("/news/all")
+
+    statements = []
+
+    def count(conn, cursor, statement, *_):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.get("/news/all")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert response.status_code == 200
+    assert response.data.count(b'class="news-item-wrapper outline"') == n_news
+    return len(statements)
+
+
+def test_feed_statement_count_is_constant(client, db, user):
+    from src.models.news_model.news_mod import Comment
+
+    user_id = user.id
+    small = render_feed_statements(client, db, user_id, 3)
+
+    db.session.query(Comment).delete()
+    db.session.query(News).delete()
+    db.session.commit()
+    large = render_feed_statements(client, db, user_id, 6)
+    assert small == large
+
+
+def test_news_page_caches_comments_and_renders_reactions_live(db, user, client):
+    from src.extensions import cache_
+    from src.models.news_model.news_mod import LIKE
+    from src.models.news_model.news_mod_utils import (
+        _news_fragments_key,
+        add_new_comment,
+        get_comment_by_id,
+        set_comment_reaction,
+    )
+
+    user_id = user.id
+    news = make_news(db, user_id, "Commented", datetime(2025, 3, 1, 12, 0))
+    db.session.commit()
+    news_id = news.id
+    add_new_comment(news_id, user_id, "First <b>comment</b>")
+
+    response = client.get(f"/news/id/{news_id}")
+    assert b'<p class="comment-content">First <b>comment</b></p>' in response.data
+    assert b"/like_col_xs." not in response.data
+    news = db.session.get(News, news_id)
+    key = _news_fragments_key(news)
+    comment_id, = cache_.get(key)["comments"]
+
+    # Reactions bump the version, the cached fragments of the old version are left alone
+    set_comment_reaction(get_comment_by_id(comment_id), user_id, LIKE)
+    response = client.get(f"/news/id/{news_id}")
+    assert b"/like_col_xs." in response.data
+    assert cache_.get(key) is not None
+    assert cache_.get(_news_fragments_key(db.session.get(News, news_id))) is not None
+
+    add_new_comment(news_id, user_id, "Second")
+    response = client.get(f"/news/id/{news_id}")
+    assert response.data.count(b'class="comment-content"') == 2
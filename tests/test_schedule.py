@@ -0,0 +1,25 @@
+from datetime import date
+
+from src.models.schedule_model.schedule_mod_utils import (
+    get_schedule_bounds,
+    upsert_schedule_days,
+)
+
+
+def make_day(date_: date, names: list[str]) -> dict:
+    return {
+        "date": date_, "week_number": date_.isocalendar()[1], "day": date_.strftime("%A"),
+        "names": names, "hours": ["08:00 - 16:30"] * len(names),
+        "break_times": ["0:30"] * len(names), "work_times": ["8:00"] * len(names),
+    }
+
+
+def test_upsert_refreshes_the_schedule_bounds(db):
+    assert get_schedule_bounds() == (None, None)
+
+    assert upsert_schedule_days([make_day(date(2025, 4, 14), ["Anna de Vries", "Bram Jansen"])]) == 2
+    assert get_schedule_bounds() == (date(2025, 4, 14), date(2025, 4, 14))
+
+    upsert_schedule_days([make_day(date(2025, 4, 7), ["Anna de Vries"]),
+                          make_day(date(2025, 4, 21), ["Chloe Bakker"])])
+    assert get_schedule_bounds() == (date(2025, 4, 7), date(2025, 4, 21))
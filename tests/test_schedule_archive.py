@@ -0,0 +1,98 @@
+import json
+import os
+
+from datetime import date
+
+import pytest
+
+from src.utils.encryption_utils import encrypt_data
+from src.utils.schedule_archive import (
+    ScheduleArchive,
+    week_record_days,
+)
+
+
+def make_days(*names: str) -> dict:
+    return {
+        "Monday": {"names": list(names), "hours": ["08:00 - 16:30"] * len(names),
+                   "break_times": ["0:30"] * len(names), "work_times": ["8:00"] * len(names)},
+    }
+
+
+def write_year_file(folder, year: int, schedule_data: dict) -> str:
+    path = os.path.join(folder, f"schedule{year}.json")
+    with open(path, "wb") as file:
+        file.write(encrypt_data(json.dumps(schedule_data).encode()))
+    return path
+
+
+def test_write_and_read_week(tmp_path):
+    archive = ScheduleArchive(str(tmp_path / "weeks"))
+    assert archive.weeks() == []
+    assert archive.read_week(2025, 16) is None
+
+    path = archive.write_week(2025, 16, make_days("Anna de Vries"), {"Monday": "14-04-2025"})
+    assert path == archive.path(2025, "16")
+    assert os.listdir(archive.folder) == ["week-2025-16.enc"]
+    assert archive.read_week(2025, 16) == {
+        "year": 2025, "week": "16", "days": make_days("Anna de Vries"), "dates": {"Monday": "14-04-2025"},
+    }
+
+    # Rewriting replaces the week without leaving the temporary file behind
+    archive.write_week(2025, 16, make_days("Bram Jansen"))
+    assert os.listdir(archive.folder) == ["week-2025-16.enc"]
+    assert archive.read_week(2025, 16)["days"] == make_days("Bram Jansen")
+
+
+def test_weeks_are_listed_and_iterated_in_order(tmp_path):
+    archive = ScheduleArchive(str(tmp_path))
+    archive.write_week(2025, 2, make_days("Chloe Bakker"))
+    archive.write_week(2024, 52, make_days("Anna de Vries"))
+    archive.write_week(2025, 10, make_days("Bram Jansen"))
+    (tmp_path / "notes.txt").write_text("not a week")
+
+    assert archive.weeks() == [(2024, 52), (2025, 2), (2025, 10)]
+    # A new instance lists the folder instead of relying on the writes
+    assert ScheduleArchive(str(tmp_path)).weeks() == [(2024, 52), (2025, 2), (2025, 10)]
+    assert [(record["year"], record["week"]) for record in archive.iter_weeks()] == [
+        (2024, "52"), (2025, "2"), (2025, "10"),
+    ]
+
+
+def test_week_record_days_uses_stored_dates(tmp_path):
+    archive = ScheduleArchive(str(tmp_path))
+    archive.write_week(2024, 2, make_days("Anna de Vries"))
+    archive.write_week(2024, 3, make_days("Bram Jansen"), {"Monday": "15-01-2024"})
+
+    imported, scraped = archive.iter_weeks()
+    assert [(date_, day) for date_, day, _ in week_record_days(imported)] == [(date(2024, 1, 8), "Monday")]
+    assert [(date_, day) for date_, day, _ in week_record_days(scraped)] == [(date(2024, 1, 15), "Monday")]
+
+
+def test_import_year_file(tmp_path):
+    schedule_data = {"1": make_days("Anna de Vries"), "2": make_days("Bram Jansen", "Chloe Bakker")}
+    path = write_year_file(tmp_path, 2024, schedule_data)
+    archive = ScheduleArchive(str(tmp_path / "weeks"))
+
+    assert archive.import_year_file(path) == 2
+    assert archive.weeks() == [(2024, 1), (2024, 2)]
+    assert archive.export_year(2024) == schedule_data
+    assert archive.read_week(2024, 1)["dates"] == {}
+
+
+def test_import_keeps_scraped_weeks(tmp_path):
+    archive = ScheduleArchive(str(tmp_path / "weeks"))
+    archive.write_week(2024, 2, make_days("Daan Visser"), {"Monday": "08-01-2024"})
+    path = write_year_file(tmp_path, 2024, {"1": make_days("Anna de Vries"), "2": make_days("Bram Jansen")})
+
+    assert archive.import_year_file(path) == 2
+    assert archive.export_year(2024) == {"1": make_days("Anna de Vries"), "2": make_days("Daan Visser")}
+
+
+def test_import_fails_when_weeks_are_lost(tmp_path, monkeypatch):
+    archive = ScheduleArchive(str(tmp_path / "weeks"))
+    path = write_year_file(tmp_path, 2024, {"1": make_days("Anna de Vries")})
+    monkeypatch.setattr(archive, "write_week", lambda *args, **kwargs: None)
+
+    with pytest.raises(ValueError, match="lost weeks: 1"):
+        archive.import_year_file(path)
@@ -0,0 +1,70 @@
+from datetime import date
+
+import numpy as np
+
+from src.models.schedule_model.schedule_stats import (
+    ShiftArrays,
+    _loop_hours_per_week,
+    _synthetic_shifts,
+    coverage_by_slot,
+    day_coverage,
+    hours_by_period,
+    hours_in_ranges,
+    overtime_hours,
+    week_starts,
+)
+
+
+def test_week_starts_are_mondays():
+    dates = np.array(["2025-01-05", "2025-01-06", "2025-01-12", "2025-03-01"], dtype="datetime64[D]")
+    assert week_starts(dates).tolist() == [date(2024, 12, 30), date(2025, 1, 6),
+                                           date(2025, 1, 6), date(2025, 2, 24)]
+
+
+def test_weekly_hours_match_the_loop():
+    shifts = _synthetic_shifts(12, 60)
+    employee_ids, weeks, hours = hours_by_period(shifts, "week")
+
+    vectorized = {
+        (int(employee_id), week.item().isocalendar()[:2]): hours[i, j]
+        for i, employee_id in enumerate(employee_ids)
+        for j, week in enumerate(weeks)
+        if hours[i, j]
+    }
+    expected = _loop_hours_per_week(shifts)
+    assert vectorized.keys() == expected.keys()
+    assert all(np.isclose(vectorized[key], expected[key]) for key in expected)
+
+
+def test_monthly_hours_and_ranges():
+    shifts = ShiftArrays.from_rows([
+        (date(2025, 1, 31), 1, 0, 32, 30),   # 7.5
+        (date(2025, 2, 1), 1, 4, 20, 0),     # 4
+        (date(2025, 2, 3), 2, 8, 40, None),  # 8
+    ])
+    employee_ids, months, hours = hours_by_period(shifts, "month")
+    assert employee_ids.tolist() == [1, 2]
+    assert months.tolist() == [date(2025, 1, 1), date(2025, 2, 1)]
+    assert hours.tolist() == [[7.5, 4.0], [0.0, 8.0]]
+
+    starts = np.array(["2025-02-01", "2025-01-01"], dtype="datetime64[D]")
+    assert hours_in_ranges(shifts, starts).tolist() == [12.0, 7.5]
+
+
+def test_coverage_counts_employees_per_quarter():
+    shifts = ShiftArrays.from_rows([
+        (date(2025, 1, 6), 1, 0, 4, 0),
+        (date(2025, 1, 6), 2, 2, 6, 0),
+        (date(2025, 1, 7), 1, 58, 70, 0),
+    ])
+    dates, coverage = coverage_by_slot(shifts)
+    assert dates.tolist() == [date(2025, 1, 6), date(2025, 1, 7)]
+    assert coverage[0, :7].tolist() == [1, 1, 2, 2, 1, 1, 0]
+    # Clipped to the last slot
+    assert coverage[1, 57:].tolist() == [0, 1, 1]
+    assert day_coverage([0, 2], [4, 6]) == coverage[0].tolist()
+
+
+def test_overtime_above_contract_hours():
+    weekly = np.array([[40.0, 36.0], [38.0, 45.5]])
+    assert overtime_hours(weekly, contract_hours=38).tolist() == [2.0, 7.5]
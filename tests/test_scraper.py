@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from src.utils.scraper_utils import (
+    LoginRequired,
+    ScheduleSite,
+    ScraperBackend,
+    scrape_dates,
+)
+
+
+SITE = ScheduleSite(login_url="http://pmt.test/login", schedule_url="http://pmt.test/schedule/",
+                    username="user", password="pass", humanize=False)
+
+
+class ExpiringBackend(ScraperBackend):
+    """
+    Sessions are dicts, PMT only accepts the cookies of the latest login.
+    The first login expires after expire_after pages.
+    """
+    name = "expiring"
+
+    def __init__(self, expire_after: int):
+        self.expire_after = expire_after
+        self.logins = 0
+        self.pages = 0
+        self.valid_login = 1
+        self._lock = threading.Lock()
+
+    def new_session(self) -> dict:
+        return {}
+
+    def log_in(self, session: dict, site: ScheduleSite) -> list[dict]:
+        with self._lock:
+            self.logins += 1
+            session["login"] = self.logins
+        return [{"name": "pmt_session", "value": str(session["login"])}]
+
+    def add_cookies(self, session: dict, site: ScheduleSite, cookies: list[dict]) -> None:
+        session["login"] = int(cookies[0]["value"])
+
+    def scrape_date(self, session: dict, date: str, site: ScheduleSite):
+        with self._lock:
+            self.pages += 1
+            if self.pages == self.expire_after:
+                self.valid_login = 2
+            if session["login"] < self.valid_login:
+                raise LoginRequired("Got the login page, the PMT session expired")
+        return [f"Employee {date}"], ["08:00 - 16:00"], ["0:30"], ["7:30"]
+
+
+def test_expired_session_logs_in_again():
+    backend = ExpiringBackend(expire_after=3)
+    dates = [f"{day:02d}-01-2025" for day in range(1, 8)]
+    results, stats = scrape_dates(dates, SITE, pool_size=2, retries=2,
+                                  retry_delay=0, backend=backend)
+
+    assert sorted(results) == dates
+    assert stats.failed == []
+    # Both sessions of the first login fail once, only one of them logs in again
+    assert backend.logins == 2
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class NoScrapeBackend(ScraperBackend):
+        def new_session(self) -> dict:
+            return {}
+
+        def log_in(self, session: dict, site: ScheduleSite) -> list[dict]:
+            return []
+
+        def add_cookies(self, session: dict, site: ScheduleSite, cookies: list[dict]) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="scrape_date"):
+        NoScrapeBackend()
@@ -0,0 +1,78 @@
+import os
+
+from dataclasses import replace
+
+import pytest
+
+from src.utils.scraper_fixture import FixtureServer
+from src.utils.scraper_utils import (
+    HttpBackend,
+    LoginFailed,
+    LoginRequired,
+    parse_login_form,
+    parse_schedule_html,
+    scrape_dates,
+)
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as file:
+        return file.read()
+
+
+def test_parse_schedule_html():
+    names, hours, break_times, work_times = parse_schedule_html(read_fixture("pmt_day.html"))
+
+    assert names == ["Anna de Vries", "Bram Jansen", "Bram Jansen", "Chloe Bakker"]
+    assert hours == ["08:00 - 16:30", "07:00 - 11:00", "17:00 - 21:00", "12:15 - 18:00"]
+    assert break_times == ["0:30", "0:00", "0:15"]
+    assert work_times == ["8:00", "8:00", "5:30"]
+
+
+def test_parse_schedule_html_raises_on_the_login_page():
+    with pytest.raises(LoginRequired):
+        parse_schedule_html(read_fixture("pmt_login.html"))
+
+
+def test_parse_login_form():
+    action, fields = parse_login_form(read_fixture("pmt_login.html"), "https://pmt.test/account/login")
+
+    assert action == "https://pmt.test/account/login_check"
+    assert fields == {
+        "_csrf_token": "a1b2c3",
+        "_target_path": "/my-schedule",
+        "_username": "_username",
+        "_password": "_password",
+    }
+
+
+def test_parse_login_form_without_a_login_form():
+    url = "https://pmt.test/my-schedule"
+    assert parse_login_form(read_fixture("pmt_day.html"), url) == (url, {})
+
+
+def test_http_log_in():
+    backend = HttpBackend()
+    with FixtureServer() as server:
+        site = server.site()
+        session = backend.new_session()
+        cookies = backend.log_in(session, site)
+        assert [cookie["name"] for cookie in cookies] == ["pmt_session"]
+        assert backend.scrape_date(session, "14-04-2025", site)[0]
+
+        with pytest.raises(LoginFailed, match="login form"):
+            backend.log_in(backend.new_session(), replace(site, password="wrong"))
+
+
+def test_rejected_login_aborts_the_run():
+    dates = [f"{day:02d}-04-2025" for day in range(1, 29)]
+    with FixtureServer() as server:
+        site = replace(server.site(), password="wrong")
+        with pytest.raises(LoginFailed):
+            scrape_dates(dates, site, pool_size=3, retries=2, retry_delay=0, backend=HttpBackend())
+
+        assert server.logins == 1
+        assert server.requests == 0
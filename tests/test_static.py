@@ -0,0 +1,30 @@
+import os
+
+from src.utils.static_utils import (
+    build_precompressed,
+    get_stale_precompressed,
+)
+
+
+def test_stale_precompressed_follows_the_sources(tmp_path):
+    source = tmp_path / "base.css"
+    source.write_text("body { color: black; }\n" * 50)
+    (tmp_path / "logo.png").write_bytes(b"png")
+    assert get_stale_precompressed(str(tmp_path)) == [str(source)]
+
+    assert build_precompressed(str(tmp_path)) == {"built": 3, "skipped": 0}
+    assert get_stale_precompressed(str(tmp_path)) == []
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert get_stale_precompressed(str(tmp_path)) == [str(source)]
+
+
+def test_static_files_without_siblings_are_compressed_per_request(app):
+    path = os.path.join(app.static_folder, "css", "admin", "admin_base.css")
+    assert path in get_stale_precompressed(os.path.dirname(path))
+
+    response = app.test_client().get("/static/css/admin/admin_base.css",
+                                     headers={"Accept-Encoding": "br"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "br"